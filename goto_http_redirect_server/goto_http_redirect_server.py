@@ -10,24 +10,39 @@
 
 
 import argparse
-from collections import defaultdict
+import bisect
+from collections import defaultdict, OrderedDict
+import concurrent.futures
 import copy
 import csv
 import datetime
+import email.parser
 import enum
 import getpass
+import hashlib
 import html
 import http
 from http import server
+import io
+import ipaddress
 import json
 import logging
+import mimetypes
+import multiprocessing
 import os
+import pickle
 import pathlib
 import pprint
 import re
+import select
+import selectors
 import signal
 import socket
 import socketserver
+import ssl
+import stat
+import struct
+import subprocess
 import sys
 import threading
 import time
@@ -35,6 +50,7 @@ import typing
 from typing import cast, NamedTuple
 from urllib import parse
 import uuid
+import zlib
 
 
 # canonical module informations used by setup.py
@@ -147,11 +163,12 @@ class Re_EntryType(enum.IntEnum):
     @classmethod
     def getEntryType_From(cls, from_: Re_From):
         """the last matching Re_EntryType is the required matching"""
-        required = cls._
-        for typ in cls:
-            if from_.endswith(cls.Map[typ]):  # type: ignore
+        # XXX: iterating `cls.Map` is much faster than iterating `cls`
+        required = 0
+        for typ, suffix in cls.Map.items():  # type: ignore
+            if from_.endswith(suffix):
                 required = typ
-        return required
+        return cls(required)
 
     @classmethod
     def getEntryKeys(cls, from_: Re_From) -> typing.List[Re_EntryKey]:
@@ -235,6 +252,10 @@ __Re_EntryBase = NamedTuple(
         ('from_pr', ParseResult),  # ParseResult of from_
         ('to_pr', ParseResult),    # ParseResult if to
         ('etype', Re_EntryType),
+        # optional per-entry HTTP Status Code, overrides --redirect-code
+        ('code', typing.Optional[http.HTTPStatus]),
+        # optional per-entry Cache-Control max-age seconds
+        ('max_age', typing.Optional[int]),
     ]
 )
 
@@ -249,6 +270,8 @@ __Re_EntryBase.__new__.__defaults__ = (  # type: ignore
     None,  # from_pr
     None,  # to_pr
     None,  # etype
+    None,  # code
+    None,  # max_age
 )
 
 
@@ -418,6 +441,14 @@ htmls_str = typing.Union[htmls, str]
 PROGRAM_NAME = 'goto_http_redirect_server'
 LISTEN_IP = '0.0.0.0'
 LISTEN_PORT = 80
+# file permissions of a --unix-socket
+UNIX_SOCKET_MODE_DEFAULT = 0o660  # type: int
+# client address of requests from a --unix-socket
+UNIX_CLIENT = 'unix'  # type: str
+# --listen address prefix of a Unix domain socket
+UNIX_PREFIX = 'unix:'  # type: str
+# None where there are no Unix domain sockets
+AF_UNIX = getattr(socket, 'AF_UNIX', None)
 HOSTNAME = socket.gethostname()
 
 # default CSS for various <html>
@@ -490,21 +521,144 @@ var stIsIE=!1;if(sorttable={init:function(){arguments.callee.done||(arguments.ca
 # -- END CODE COPIED FROM www.kryogenix.org UNDER MIT LICENSE --
 
 
+# options of listening TCP sockets bound by this process, see
+# `socket_options_apply`
+Socket_Options = NamedTuple(
+    'Socket_Options',
+    [
+        ('backlog', int),
+        ('nodelay', bool),
+        ('defer_accept', int),  # seconds, 0 is off
+        ('fastopen', int),  # queue length, 0 is off
+        ('reuseport', bool),
+    ]
+)
+# socket option values read back, by Socket_Options field name
+Socket_Values = typing.Dict[str, typing.Optional[int]]
+
+# a static file served under the status path, encoded once
+# `hash_` is a hash of `body`, for the ETag and to version the asset URL
+Asset = NamedTuple(
+    'Asset',
+    [
+        ('name', str),
+        ('body', bytes),
+        ('content_type', str),
+        ('hash_', str),
+    ]
+)
+
+
+def asset(name: str, text: str, content_type: str) -> Asset:
+    body = bytes(text, encoding='utf-8')
+    return Asset(name, body, content_type,
+                 hashlib.sha256(body).hexdigest()[:16])
+
+
+STATUS_ASSETS = (
+    asset('status.css', CSS, 'text/css; charset=utf-8'),
+    asset('sorttable.js', JAVASCRIPT_SORTABLE_JS,
+          'application/javascript; charset=utf-8'),
+)  # type: typing.Tuple[Asset, ...]
+# asset URLs are versioned by Asset.hash_ so they may be cached "forever"
+STATUS_ASSET_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
 #
 # RedirectServer class things
 #
 
-# SOCKET_LISTEN_BACKLOG is eventually passed to socket.listen
-SOCKET_LISTEN_BACKLOG = 31  # type: int
+# SOCKET_LISTEN_BACKLOG is eventually passed to socket.listen. The system
+# may cap it, on Linux to net.core.somaxconn
+SOCKET_LISTEN_BACKLOG = 1024  # type: int
+# seconds the system waits for request data before a connection is accepted,
+# Linux TCP_DEFER_ACCEPT
+TCP_DEFER_ACCEPT_DEFAULT = 1  # type: int
+# queue length of connections with data in the SYN, TCP_FASTOPEN
+TCP_FASTOPEN_DEFAULT = 256  # type: int
+# system cap of the listen backlog, Linux only
+SOMAXCONN_PATH = '/proc/sys/net/core/somaxconn'  # type: str
+SOCKET_OPTIONS_DEFAULT = Socket_Options(
+    backlog=SOCKET_LISTEN_BACKLOG,
+    nodelay=True,
+    defer_accept=TCP_DEFER_ACCEPT_DEFAULT,
+    fastopen=TCP_FASTOPEN_DEFAULT,
+    reuseport=False,
+)  # type: Socket_Options
+# seconds between wakeups of an idle serve_forever loop. Reload requests and
+# shutdown wake the loop at once
+POLL_INTERVAL = 60.0  # type: float
 STATUS_PAGE_PATH_DEFAULT = '/status'  # type: str
+# redirect entries per status page, may be changed by request query 'size='
+STATUS_PAGE_SIZE_DEFAULT = 1000  # type: int
+# most redirect entries per cached status page. A larger page, request query
+# 'size=0' of a larger table, is rendered per request and not cached
+STATUS_PAGE_SIZE_MAX = 10000  # type: int
+# cached encoded status page parts, the cache is emptied when exceeded
+STATUS_PAGE_CACHE_MAX = 64  # type: int
+# JSON status documents, appended to the status path
+STATUS_JSON_REDIRECTS = 'redirects.json'  # type: str
+STATUS_JSON_STATUS = 'status.json'  # type: str
+# longest request path (characters) spliced into a 404 or error page
+ERROR_PAGE_PATH_MAX = 1024  # type: int
+# gzip bodies created per request when at least this many bytes
+GZIP_SIZE_MIN = 1024  # type: int
+# gzip compression level of bodies created per request
+GZIP_LEVEL = 6  # type: int
+# gzip compression level of cached bodies, compressed once
+GZIP_LEVEL_CACHED = 9  # type: int
+# per-client rate limit burst, requests
+RATE_BURST_DEFAULT = 20  # type: int
+# per-client rate limit buckets kept, least recently seen are dropped
+RATE_CLIENTS_DEFAULT = 65536  # type: int
+# "Retry-After" seconds of a 503 Service Unavailable for a shed request
+SHED_RETRY_AFTER_DEFAULT = 1  # type: int
+# bytes peeked of a shed request to find the request path
+SHED_PEEK_SIZE = 1024  # type: int
+# seconds to wait for the request line of a maybe exempt shed request
+SHED_PEEK_TIMEOUT = 1.0  # type: float
+# threads waiting for the request line of maybe exempt shed requests
+SHED_TRIAGE_MAX = 4  # type: int
+# seconds a request socket read or write may block
+REQUEST_TIMEOUT_DEFAULT = 30.0  # type: float
+# seconds to read the entire request line and headers
+HEAD_TIMEOUT_DEFAULT = 10.0  # type: float
+# request line bytes, longer gets 414 URI Too Long
+MAX_REQUEST_LINE_DEFAULT = 8192  # type: int
+# request header bytes, more gets 431 Request Header Fields Too Large
+MAX_HEADER_BYTES_DEFAULT = 32768  # type: int
+# request header lines, more gets 431 Request Header Fields Too Large
+MAX_HEADERS_DEFAULT = 100  # type: int
+# seconds to wait for in-flight requests at shutdown
+DRAIN_TIMEOUT_DEFAULT = 10.0  # type: float
+# least seconds between the starts of two reloads
+RELOAD_INTERVAL_DEFAULT = 5.0  # type: float
 PATH_FAVICON = '/favicon.ico'  # type: str
-REDIRECT_PATHS_NOT_ALLOWED = (PATH_FAVICON,)  # type: typing.Tuple[str]
+PATH_ROBOTS = '/robots.txt'  # type: str
+# a redirect entry from PATH_ROBOTS is allowed, it replaces the built-in
+# response
+REDIRECT_PATHS_NOT_ALLOWED = (PATH_FAVICON,)  # type: typing.Tuple[str, ...]
+# Cache-Control of the built-in favicon and robots.txt responses
+MICRO_CACHE_CONTROL = 'public, max-age=604800'  # type: str
+# characters left as is when a WSGI PATH_INFO is quoted back into a request
+# path, see RedirectApplication
+WSGI_PATH_SAFE = "/;=,:@!$&'()*+~"  # type: str
 # HTTP Status Code used for redirects (among several possible redirect codes)
 REDIRECT_CODE_DEFAULT = http.HTTPStatus.PERMANENT_REDIRECT  # type: http.HTTPStatus
 REDIRECT_CODE = REDIRECT_CODE_DEFAULT  # type: http.HTTPStatus
+# HTTP Status Codes allowed in the code field of a redirect entry
+REDIRECT_CODES_ENTRY = frozenset((
+    http.HTTPStatus.MOVED_PERMANENTLY,
+    http.HTTPStatus.FOUND,
+    http.HTTPStatus.SEE_OTHER,
+    http.HTTPStatus.TEMPORARY_REDIRECT,
+    http.HTTPStatus.PERMANENT_REDIRECT,
+))  # type: typing.FrozenSet[http.HTTPStatus]
 # urlparse-related things
 RE_URI_KEYWORDS = re.compile(r'\${(path|params|query|fragment)}')
 URI_KEYWORDS_REPL = ('path', 'params', 'query', 'fragment')  # type: Iter_str
+# characters that urlparse treats specially within a plain path like '/hr'
+RE_URI_NOT_PATH = re.compile(r'[:;?#\t\r\n]')
 
 # signals
 SIGNAL_RELOAD_UNIX = 'SIGUSR1'  # type: str
@@ -516,6 +670,22 @@ try:
 except AttributeError:
     # Windows (not defined on some Unix)
     SIGNAL_RELOAD = signal.SIGBREAK  # type: ignore # in Unix, mypy attempts import and fails
+SIGNAL_RESTART_UNIX = 'SIGUSR2'  # type: str
+# signal to cause a hot restart, not available on Windows
+SIGNAL_RESTART = getattr(signal, SIGNAL_RESTART_UNIX, None)
+# environment variables passed to the new process of a hot restart, the file
+# descriptors of the listening sockets, comma separated, and of the pipe to
+# write when ready
+ENV_LISTEN_FD = 'GOTO_HTTP_REDIRECT_SERVER_LISTEN_FD'  # type: str
+ENV_READY_FD = 'GOTO_HTTP_REDIRECT_SERVER_READY_FD'  # type: str
+# seconds to wait for the new process of a hot restart to be ready
+RESTART_TIMEOUT = 300.0  # type: float
+# first file descriptor passed by systemd socket activation
+SD_LISTEN_FDS_START = 3  # type: int
+# server_counter keys of TLS handshakes
+TLS_HANDSHAKE = 'TLS handshake'  # type: str
+TLS_RESUMED = 'TLS handshake resumed'  # type: str
+TLS_FAILED = 'TLS handshake failed'  # type: str
 
 # redirect file things
 FIELD_DELIMITER_DEFAULT = Re_Field_Delimiter('\t')  # type: Re_Field_Delimiter
@@ -523,6 +693,19 @@ FIELD_DELIMITER_DEFAULT_NAME = 'tab'  # type: str
 FIELD_DELIMITER_DEFAULT_ESCAPED = FIELD_DELIMITER_DEFAULT.\
     encode('unicode_escape').decode('utf-8')  # type: str
 REDIRECT_FILE_IGNORE_LINE = '#'  # type: str
+# characters read per block by the default field delimiter loader
+LOAD_BLOCK_SIZE = 1048576  # type: int
+# --load-workers things
+# files smaller than this are always loaded in the main process
+LOAD_WORKERS_FILE_SIZE_MIN = 4194304  # type: int
+# smallest byte range of a redirects file passed to one worker process
+LOAD_WORKERS_CHUNK_SIZE_MIN = 1048576  # type: int
+# byte ranges per worker process, more ranges balances uneven workers
+LOAD_WORKERS_CHUNKS_PER_WORKER = 2  # type: int
+# seconds to wait for the --reload-subprocess child to send the redirects,
+# and then to exit, before it is terminated
+RELOAD_SUBPROCESS_TIMEOUT = 300.0  # type: float
+RELOAD_SUBPROCESS_EXIT_TIMEOUT = 5.0  # type: float
 
 # logging module initializations (call logging_init to complete)
 LOGGING_FORMAT_DATETIME = '%Y-%m-%d %H:%M:%S'  # type: str
@@ -542,9 +725,15 @@ sys_args = []  # type: typing.List[str]
 Redirect_FromTo_List = []  # type: FromTo_List
 # global list of --redirects files
 Redirect_Files_List = []  # type: Path_List
-reload_do = False  # type: bool
 reload_datetime = None  # type: typing.Optional[datetime.datetime]
 redirect_counter = defaultdict(int)  # type: typing.DefaultDict[str, int]
+# incremented for each change of redirect_counter
+redirect_counter_epoch = 0  # type: int
+# ready to serve redirects, not before the first load nor while a reload
+# swaps in new redirects
+server_ready = False  # type: bool
+# counting of requests rejected or shed by the server, e.g. rate limited
+server_counter = defaultdict(int)  # type: typing.DefaultDict[str, int]
 STATUS_PATH = None  # type: str_None
 RELOAD_PATH = None  # type: str_None
 NOTE_ADMIN = htmls('')  # type: htmls
@@ -597,6 +786,33 @@ def html_a(href: str, text: str_None = None) -> htmls:
     return htmls('<a href="' + href + '">' + html_escape(text) + '</a>')
 
 
+# gzip member header; deflate, no mtime, no flags, unknown OS
+GZIP_HEADER = b'\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff'
+# a final empty deflate block
+GZIP_DEFLATE_END = b'\x03\x00'
+
+
+def deflate_raw(data: bytes, level: int) -> bytes:
+    """
+    Compress `data` to raw deflate blocks ending with a sync flush.
+    Results of separate calls may be concatenated then ended with
+    GZIP_DEFLATE_END to form one deflate stream.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+def gzip_trailer(crc: int, size: int) -> bytes:
+    """gzip member trailer for uncompressed data `crc` and `size`"""
+    return struct.pack('<II', crc & 0xFFFFFFFF, size & 0xFFFFFFFF)
+
+
+def gzip_bytes(data: bytes, level: int) -> bytes:
+    """gzip compress `data`, like gzip.compress but without a mtime"""
+    return b''.join((GZIP_HEADER, deflate_raw(data, level), GZIP_DEFLATE_END,
+                     gzip_trailer(zlib.crc32(data), len(data))))
+
+
 def datetime_now() -> datetime.datetime:
     """
     Wrap datetime.now so pytests can override it.
@@ -675,6 +891,427 @@ def fromisoformat(dts: str) -> datetime.datetime:
     return dt
 
 
+class DeadlineSocketIO(socket.SocketIO):
+    """
+    socket.SocketIO where every read fails with socket.timeout once
+    `deadline` (a time.monotonic value) has passed, so a client trickling
+    bytes can not hold a read open indefinitely.
+    """
+    deadline = None  # type: typing.Optional[float]
+    # socket timeout when no deadline is pending
+    timeout = None  # type: typing.Optional[float]
+
+    def readinto(self, b) -> typing.Optional[int]:
+        if self.deadline is not None:
+            remaining = self.deadline - time.monotonic()
+            if remaining <= 0:
+                raise socket.timeout('request head deadline passed')
+            if self.timeout is not None:
+                remaining = min(remaining, self.timeout)
+            self._sock.settimeout(remaining)  # type: ignore
+        return super().readinto(b)
+
+    def set_deadline(self, deadline: typing.Optional[float]) -> None:
+        """set the read deadline, None restores the socket `timeout`"""
+        self.deadline = deadline
+        if deadline is None:
+            self._sock.settimeout(self.timeout)  # type: ignore
+
+
+class RateLimiter(object):
+    """
+    Per-client token buckets. A client may make `burst` requests at once,
+    the bucket is refilled at `rate` requests per second.
+    Buckets are kept in a bounded LRU of `clients` entries so memory stays
+    capped; a dropped client starts again with a full bucket.
+    """
+
+    def __init__(self, rate: float, burst: int, clients: int):
+        self.rate = rate
+        self.burst = burst
+        self.clients = clients
+        # client: (tokens, time of last take)
+        self._buckets = OrderedDict()  \
+            # type: typing.MutableMapping[str, typing.Tuple[float, float]]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def take(self, client: str, now: typing.Optional[float] = None) \
+            -> float:
+        """
+        Take one token from the bucket of `client`.
+
+        :return: 0 if allowed, otherwise seconds until a token is available
+        """
+        if now is None:
+            now = time.monotonic()
+        buckets = self._buckets
+        with self._lock:
+            try:
+                tokens, last = buckets[client]
+                buckets.move_to_end(client)  # type: ignore
+                tokens = min(self.burst, tokens + (now - last) * self.rate)
+            except KeyError:
+                tokens = self.burst
+                if len(buckets) >= self.clients:
+                    buckets.popitem(last=False)  # type: ignore
+            if tokens >= 1:
+                buckets[client] = (tokens - 1, now)
+                return 0.0
+            buckets[client] = (tokens, now)
+        return (1 - tokens) / self.rate
+
+
+IP_Network = typing.Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+def ip_in_networks(address: str,
+                   networks: typing.Sequence[IP_Network]) -> bool:
+    """is IP `address` within one of `networks`?"""
+    if not networks:
+        return False
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+class ReloadControl(object):
+    """
+    Coalesce reload requests. At most one reload is loading and at most one
+    is pending; a request made while a reload is pending is merged into it.
+    Reloads start at least `interval` seconds apart.
+    The lock is reentrant because `request` is also called by the signal
+    handler, which may interrupt the main thread holding the lock.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        # redirects generation that will cover the pending reload
+        self.pending = None  # type: typing.Optional[int]
+        # redirects generation being loaded
+        self.loading = None  # type: typing.Optional[int]
+        # time.monotonic of the last reload start
+        self.last = None  # type: typing.Optional[float]
+        # called for each request to wake the serve_forever loop
+        self.wakeup = None  # type: typing.Optional[typing.Callable[[], None]]
+        self._lock = threading.RLock()
+
+    def request(self) -> int:
+        """
+        Request a reload.
+
+        :return: the redirects generation that will cover this request
+        """
+        with self._lock:
+            server_counter['reload requested'] += 1
+            if self.pending is not None:
+                server_counter['reload merged'] += 1
+                return self.pending
+            # a reload already loading may have read the files, so this
+            # request is covered by the next one
+            if self.loading is not None:
+                self.pending = self.loading + 1
+            else:
+                self.pending = RedirectHandler.generation + 1
+            if self.wakeup is not None:
+                self.wakeup()
+            return self.pending
+
+    def due_in(self, now: typing.Optional[float] = None) \
+            -> typing.Optional[float]:
+        """seconds until the pending reload may start, None if none pending"""
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            if self.pending is None or self.loading is not None:
+                return None
+            if self.last is None:
+                return 0.0
+            return max(0.0, self.last + self.interval - now)
+
+    def start(self, now: typing.Optional[float] = None) -> bool:
+        """
+        Start the pending reload if none is loading and the interval since
+        the last has passed.
+
+        :return: True if the caller should reload now
+        """
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            if self.pending is None or self.loading is not None:
+                return False
+            if self.last is not None and now - self.last < self.interval:
+                return False
+            self.loading = self.pending
+            self.pending = None
+            self.last = now
+            return True
+
+    def done(self) -> None:
+        """the started reload has swapped in the new redirects, or failed"""
+        with self._lock:
+            self.loading = None
+            if self.pending is not None and self.wakeup is not None:
+                self.wakeup()
+
+
+# global reload requests, checked by RedirectServer.service_actions
+reload_control = ReloadControl(RELOAD_INTERVAL_DEFAULT)
+
+
+def sd_notify(state: str) -> bool:
+    """
+    Send `state` to the systemd service manager, e.g. "READY=1".
+    Does nothing unless started by systemd with NOTIFY_SOCKET.
+    See https://www.freedesktop.org/software/systemd/man/sd_notify.html
+
+    :return: True if sent
+    """
+    address = os.environ.get('NOTIFY_SOCKET')
+    if not address or not hasattr(socket, 'AF_UNIX'):
+        return False
+    if address[0] == '@':
+        # abstract namespace socket
+        address = '\0' + address[1:]
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.connect(address)
+            sock.sendall(bytes(state, 'utf-8'))
+    except OSError as err:
+        log.debug('sd_notify %r failed: %s', state, err)
+        return False
+    return True
+
+
+def sd_listen_fds() -> typing.List[int]:
+    """
+    File descriptors passed by systemd socket activation. The
+    environment variables are removed so child processes do not use them.
+    LISTEN_PID may be the parent process; the service wrapper script runs
+    this process as a child of sudo.
+    See https://www.freedesktop.org/software/systemd/man/sd_listen_fds.html
+    """
+    pid = os.environ.pop('LISTEN_PID', None)
+    count = os.environ.pop('LISTEN_FDS', None)
+    os.environ.pop('LISTEN_FDNAMES', None)
+    try:
+        if pid is None or count is None \
+                or int(pid) not in (os.getpid(), os.getppid()):
+            return []
+        return list(range(SD_LISTEN_FDS_START,
+                          SD_LISTEN_FDS_START + int(count)))
+    except ValueError:
+        return []
+
+
+def sd_watchdog_interval(any_pid: bool = False) -> typing.Optional[float]:
+    """
+    Seconds between WATCHDOG=1 pings, half of the systemd WatchdogSec, or
+    None if the watchdog is not enabled for this process.
+
+    :param any_pid: ignore WATCHDOG_PID, e.g. after a hot restart
+    """
+    usec = os.environ.get('WATCHDOG_USEC')
+    pid = os.environ.get('WATCHDOG_PID')
+    try:
+        if not usec or (pid and not any_pid and int(pid) != os.getpid()):
+            return None
+        return int(usec) / 2000000
+    except ValueError:
+        return None
+
+
+def parse_listen(address: str) -> typing.Tuple[int, typing.Any]:
+    """
+    Socket family and bind address of --listen `address`, one of
+    "HOST:PORT" for IPv4, "[HOST]:PORT" for IPv6, or "unix:PATH".
+
+    :raises ValueError: for a malformed `address`
+    """
+    if address.startswith(UNIX_PREFIX):
+        path = address[len(UNIX_PREFIX):]
+        if AF_UNIX is None:
+            raise ValueError('Unix domain sockets are not available on this'
+                             ' system')
+        if not path:
+            raise ValueError('no path in %r' % address)
+        return AF_UNIX, path
+    host, _, port = address.rpartition(':')
+    if host.startswith('[') and host.endswith(']'):
+        family = socket.AF_INET6
+        host = host[1:-1]
+        ipaddress.IPv6Address(host)
+    else:
+        family = socket.AF_INET
+        ipaddress.IPv4Address(host)
+    port_ = int(port)
+    if not 0 <= port_ <= 65535:
+        raise ValueError('port %r is out of range' % port)
+    return family, (host, port_)
+
+
+def listen_socket(address: str,
+                  unix_mode: int = UNIX_SOCKET_MODE_DEFAULT,
+                  options: Socket_Options = SOCKET_OPTIONS_DEFAULT,
+                  v6only: bool = False) -> socket.socket:
+    """
+    Listening socket bound to --listen `address`, see `parse_listen`.
+    An IPv6 socket of "[::]" also accepts IPv4 clients (dual-stack) unless
+    `v6only`, which an IPv4 socket on the same port requires. A Unix
+    domain socket file gets permissions `unix_mode`; a stale socket file is
+    replaced. TCP sockets get `options`.
+    """
+    family, bind_address = parse_listen(address)
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    try:
+        if family == AF_UNIX:
+            try:
+                if stat.S_ISSOCK(os.stat(bind_address).st_mode):
+                    os.unlink(bind_address)
+            except FileNotFoundError:
+                pass
+            sock.bind(bind_address)
+            os.chmod(bind_address, unix_mode)
+        else:
+            if family == socket.AF_INET6:
+                sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY,
+                                int(v6only))
+            socket_options_apply(sock, options)
+            sock.bind(bind_address)
+        sock.listen(options.backlog)
+    except Exception:
+        sock.close()
+        raise
+    return sock
+
+
+def _socket_option_names(options: Socket_Options) \
+        -> typing.List[typing.Tuple[str, int, str, int]]:
+    """
+    (field, level, option name, value) of each of `options` set by
+    setsockopt
+    """
+    return [
+        ('nodelay', socket.IPPROTO_TCP, 'TCP_NODELAY', int(options.nodelay)),
+        ('defer_accept', socket.IPPROTO_TCP, 'TCP_DEFER_ACCEPT',
+         options.defer_accept),
+        ('fastopen', socket.IPPROTO_TCP, 'TCP_FASTOPEN', options.fastopen),
+        ('reuseport', socket.SOL_SOCKET, 'SO_REUSEPORT',
+         int(options.reuseport)),
+    ]
+
+
+def socket_options_apply(sock: socket.socket, options: Socket_Options) \
+        -> None:
+    """
+    Set `options` on TCP socket `sock`, call before bind. Accepted
+    connections inherit TCP_NODELAY. An option this system does not have or
+    refuses is logged and skipped, it only tunes performance.
+    """
+    for field, level, name, value in _socket_option_names(options):
+        option = getattr(socket, name, None)
+        if option is None:
+            if value:
+                log.warning('Socket option %s is not available on this'
+                            ' system', name)
+            continue
+        try:
+            sock.setsockopt(level, option, value)
+        except OSError as err:
+            log.warning('Socket option %s=%s failed: %s', name, value, err)
+
+
+def somaxconn() -> typing.Optional[int]:
+    """system cap of the listen backlog, None if unknown"""
+    try:
+        with open(SOMAXCONN_PATH) as file_:
+            return int(file_.read())
+    except (OSError, ValueError):
+        return None
+
+
+def socket_options_read(sock: socket.socket) -> Socket_Values:
+    """
+    Effective options of listening socket `sock` read back from the socket.
+    None for options this system does not have. Empty for a Unix domain
+    socket. The backlog cannot be read back, see `somaxconn`.
+    """
+    if sock.family == AF_UNIX:
+        return OrderedDict()
+    values = OrderedDict()  # type: Socket_Values
+    for field, level, name, _ in \
+            _socket_option_names(SOCKET_OPTIONS_DEFAULT):
+        option = getattr(socket, name, None)
+        try:
+            values[field] = None if option is None \
+                else sock.getsockopt(level, option)
+        except OSError:
+            values[field] = None
+    return values
+
+
+def listen_address_text(sock: socket.socket) -> str:
+    """listening address of `sock` for people, in --listen form"""
+    name = sock.getsockname()
+    if sock.family == AF_UNIX:
+        return UNIX_PREFIX + str(name)
+    if sock.family == socket.AF_INET6:
+        return '[%s]:%s' % name[:2]
+    return '%s:%s' % name[:2]
+
+
+def tls_context(cert: str, key: typing.Optional[str]) -> ssl.SSLContext:
+    """
+    Server SSLContext of certificate chain file `cert` and private key file
+    `key` (None if the key is in `cert`). Repeat clients resume their
+    session by session ticket or from the server session cache, skipping the
+    full handshake. Tickets and cached sessions belong to the context so a
+    certificate reload costs each client one full handshake.
+
+    :raises OSError: for a missing or bad file, ssl.SSLError is an OSError
+    """
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert, key)
+    context.options &= ~ssl.OP_NO_TICKET
+    return context
+
+
+def socket_from_fd(fd: int) -> socket.socket:
+    """listening socket of inherited file descriptor `fd`"""
+    if sys.version_info >= (3, 7):
+        # family and type are detected
+        return socket.socket(fileno=fd)
+    return socket.socket(socket.AF_INET, socket.SOCK_STREAM, fileno=fd)
+
+
+def socket_drain(sock: socket.socket, size: int) -> None:
+    """
+    Read and discard up to `size` bytes that have arrived on `sock`, without
+    waiting. Closing a socket with unread bytes resets the connection, the
+    client may then lose a response written before the request was read.
+    """
+    timeout = sock.gettimeout()
+    try:
+        sock.settimeout(0)
+        while size > 0:
+            data = sock.recv(min(size, 65536))
+            if not data:
+                break
+            size -= len(data)
+    except OSError:
+        pass
+    finally:
+        try:
+            sock.settimeout(timeout)
+        except OSError:
+            pass
+
+
 class RedirectHandler(server.SimpleHTTPRequestHandler):
     """
     XXX: This class is passed to RedirectServer which creates instances of
@@ -694,16 +1331,43 @@ class RedirectHandler(server.SimpleHTTPRequestHandler):
     Header_Server_Version = ('Redirect-Server-Version', __version__)
     # see https://tools.ietf.org/html/rfc2616#page-124
     Header_ContentType_html = ('Content-Type', 'text/html; charset=utf-8')
+    Header_ContentType_json = ('Content-Type', 'application/json; charset=utf-8')
     # see https://tools.ietf.org/html/rfc2616#section-14.10
     Header_Connection_close = ('Connection', 'close')
     __count = 0
 
     redirects = None  # type: Re_Entry_Dict
+    # incremented for each new `redirects`, identifies a loaded snapshot
+    generation = 0  # type: int
+    status_cache = dict()  # type: typing.Dict[typing.Tuple, typing.Any]
     status_code = None  # type: http.HTTPStatus
     status_path = None  # type: str
     reload_path = None  # type: str_None
     status_path_pr = None  # type: ParseResult
     reload_path_pr = None  # type: ParseResult
+    # minimal 404 body instead of the HTML page, set once
+    not_found_minimal = False
+    # Cache-Control max-age of 404 responses, set once
+    not_found_max_age = None  # type: typing.Optional[int]
+    # health check paths, set once
+    health_path = None  # type: str_None
+    ready_path = None  # type: str_None
+    # files served at PATH_FAVICON and PATH_ROBOTS, set once
+    favicon_file = None  # type: str_None
+    robots_file = None  # type: str_None
+    # paths of the built-in favicon and robots.txt responses, see set_c
+    micro_paths = frozenset((PATH_FAVICON, PATH_ROBOTS))  \
+        # type: typing.FrozenSet[str]
+    # request limits, set once
+    timeout = REQUEST_TIMEOUT_DEFAULT  # type: typing.Optional[float]
+    head_timeout = HEAD_TIMEOUT_DEFAULT  # type: typing.Optional[float]
+    max_request_line = MAX_REQUEST_LINE_DEFAULT
+    max_header_bytes = MAX_HEADER_BYTES_DEFAULT
+    max_headers = MAX_HEADERS_DEFAULT
+    # other paths under status_path mapped to a handler method name
+    status_subpaths = dict()  # type: typing.Dict[str, str]
+    # STATUS_ASSETS by path
+    status_assets = dict()  # type: typing.Dict[str, Asset]
     note_admin = None  # type: htmls
 
     @classmethod
@@ -714,13 +1378,31 @@ class RedirectHandler(server.SimpleHTTPRequestHandler):
               reload_path: str_None,
               note_admin: htmls):
         """set class-wide attributes to new values"""
+        cls.status_cache = dict()
+        cls.generation += 1
         cls.redirects = redirects
         cls.status_code = status_code
         cls.status_path = status_path
         cls.reload_path = reload_path
         cls.status_path_pr = parse.urlparse(cls.status_path)
         cls.reload_path_pr = parse.urlparse(str(cls.reload_path))
+        status_dir = cls.status_path_pr.path.rstrip('/') + '/'
+        cls.status_subpaths = {
+            status_dir + STATUS_JSON_REDIRECTS: 'do_GET_status_redirects_json',
+            status_dir + STATUS_JSON_STATUS: 'do_GET_status_json',
+        }
+        cls.status_assets = dict()
+        for asset_ in STATUS_ASSETS:
+            cls.status_assets[status_dir + asset_.name] = asset_
+            cls.status_subpaths[status_dir + asset_.name] = \
+                'do_GET_status_asset'
         cls.note_admin = note_admin
+        # a redirect entry from PATH_ROBOTS takes precedence over the
+        # built-in response
+        if Re_EntryKey(PATH_ROBOTS) in redirects:
+            cls.micro_paths = frozenset((PATH_FAVICON,))
+        else:
+            cls.micro_paths = frozenset((PATH_FAVICON, PATH_ROBOTS))
 
     def __init__(self, *args, **kwargs):
         RedirectHandler.__count += 1
@@ -744,26 +1426,159 @@ class RedirectHandler(server.SimpleHTTPRequestHandler):
         except Exception as ex:
             print('Error during log_message\n%s' % str(ex), file=sys.stderr)
 
-    def _write_html_doc(self, html_doc: htmls) -> None:
+    Header_Vary = ('Vary', 'Accept-Encoding')
+    Header_ContentEncoding_gzip = ('Content-Encoding', 'gzip')
+
+    @staticmethod
+    def compressible(content_type: str) -> bool:
+        """is a body of `content_type` worth compressing?"""
+        return content_type.startswith(('text/',
+                                        'application/json',
+                                        'application/javascript'))
+
+    def accepts_gzip(self) -> bool:
+        """does the request "Accept-Encoding" header allow gzip?"""
+        headers = getattr(self, 'headers', None)
+        if headers is None:
+            return False  # the request failed before the headers were read
+        ae = headers.get('Accept-Encoding')
+        if not ae:
+            return False
+        qvalues = dict()  # type: typing.Dict[str, float]
+        for coding in ae.split(','):
+            name, _, params = coding.partition(';')
+            q = 1.0
+            for param in params.split(';'):
+                key, _, value = param.partition('=')
+                if key.strip().lower() == 'q':
+                    try:
+                        q = float(value)
+                    except ValueError:
+                        q = 0.0
+            qvalues[name.strip().lower()] = q
+        for name in ('gzip', 'x-gzip', '*'):
+            if name in qvalues:
+                return qvalues[name] > 0
+        return False
+
+    @staticmethod
+    def etag_gzip(etag: str) -> str:
+        """the ETag of the gzip encoded representation"""
+        return etag[:-1] + '-gzip"'
+
+    def _write_body(self,
+                    body: bytes,
+                    content_type: typing.Tuple[str, str],
+                    headers: typing.Iterable[typing.Tuple[str, str]] = (),
+                    gzip_key: typing.Optional[typing.Tuple] = None) \
+            -> None:
         """
-        Write out the HTML document and required headers.
+        Write out the encoded body and required headers.
+        The body is gzip compressed if the client accepts it. If `gzip_key`
+        is passed then the compressed body is cached by `gzip_key`,
+        otherwise only bodies of GZIP_SIZE_MIN bytes or more are compressed.
         This calls end_headers!
         """
+        headers = list(headers)
+        if self.compressible(content_type[1]):
+            headers.append(self.Header_Vary)
+            if (gzip_key is not None or len(body) >= GZIP_SIZE_MIN) \
+                    and self.accepts_gzip():
+                if gzip_key is None:
+                    bodyz = gzip_bytes(body, GZIP_LEVEL)
+                else:
+                    bodyz = self.status_cached(
+                        ('gzip',) + gzip_key,
+                        lambda: gzip_bytes(body, GZIP_LEVEL_CACHED)
+                    )  # type: bytes
+                if len(bodyz) < len(body):
+                    body = bodyz
+                    headers = [
+                        ('ETag', self.etag_gzip(header[1]))
+                        if header[0] == 'ETag' else header
+                        for header in headers
+                    ]
+                    headers.append(self.Header_ContentEncoding_gzip)
         # From https://tools.ietf.org/html/rfc2616#section-14.13
         #      The Content-Length entity-header field indicates the size of
         #      the entity-body, in decimal number of OCTETs
         # XXX: does this follow *all* Message Length rules?
         #      https://tools.ietf.org/html/rfc2616#section-4.4
-        html_docb = bytes(html_doc,
-                          encoding='utf-8',
-                          errors='xmlcharrefreplace')
         self.send_header(*self.Header_Server_Host)
         self.send_header(*self.Header_Server_Version)
-        self.send_header('Content-Length', str(len(html_docb)))
-        self.send_header(*self.Header_ContentType_html)
+        for header in headers:
+            self.send_header(*header)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header(*content_type)
         self.send_header(*self.Header_Connection_close)
         self.end_headers()
-        self.wfile.write(html_docb)
+        self.wfile.write(body)
+        return
+
+    def _write_html_doc(self, html_doc: htmls) -> None:
+        """
+        Write out the HTML document and required headers.
+        This calls end_headers!
+        """
+        html_docb = bytes(html_doc,
+                          encoding='utf-8',
+                          errors='xmlcharrefreplace')
+        self._write_body(html_docb, self.Header_ContentType_html)
+        return
+
+    def _response_head(self,
+                       code: http.HTTPStatus,
+                       headers: typing.Iterable[typing.Tuple[str, str]]) \
+            -> bytes:
+        """
+        Encode the constant parts of a response head; the status line and
+        `headers`. Does not end the head.
+        """
+        lines = ['%s %d %s' % (self.protocol_version, code, code.phrase),
+                 'Server: %s' % self.version_string()]
+        for header in (self.Header_Server_Host, self.Header_Server_Version) \
+                + tuple(headers) + (self.Header_Connection_close,):
+            lines.append('%s: %s' % header)
+        return bytes('\r\n'.join(lines) + '\r\n', 'latin-1', 'strict')
+
+    def _write_vectored(self,
+                        code: http.HTTPStatus,
+                        head: bytes,
+                        body_parts: typing.Sequence[bytes],
+                        content_length: bool = True,
+                        compressible: bool = False) -> None:
+        """
+        Write a response from a pre-encoded `head` (see `_response_head`)
+        and `body_parts`. The Date and Content-Length headers are the only
+        parts encoded per request. All parts are written with one vectored
+        send.
+        If `compressible` then bodies of GZIP_SIZE_MIN bytes or more are gzip
+        compressed when the client accepts it.
+        """
+        self.log_request(int(code))
+        self.close_connection = True
+        dynamic = 'Date: %s\r\n' % self.date_time_string()
+        if compressible:
+            dynamic += '%s: %s\r\n' % self.Header_Vary
+            if sum(len(part) for part in body_parts) >= GZIP_SIZE_MIN \
+                    and self.accepts_gzip():
+                body_parts = (gzip_bytes(b''.join(body_parts), GZIP_LEVEL),)
+                dynamic += '%s: %s\r\n' % self.Header_ContentEncoding_gzip
+        if content_length:
+            dynamic += 'Content-Length: %d\r\n' % \
+                sum(len(part) for part in body_parts)
+        buffers = [head, bytes(dynamic + '\r\n', 'latin-1', 'strict')]
+        if self.request_version == 'HTTP/0.9':
+            buffers = []  # HTTP/0.9 responses have no head
+        buffers.extend(body_parts)
+        try:
+            sent = self.connection.sendmsg(buffers)
+        except (AttributeError, NotImplementedError):
+            # no sendmsg on Windows nor for ssl sockets
+            self.wfile.write(b''.join(buffers))
+            return
+        if sent < sum(len(buffer) for buffer in buffers):
+            self.wfile.write(b''.join(buffers)[sent:])
         return
 
     @staticmethod
@@ -920,7 +1735,127 @@ class RedirectHandler(server.SimpleHTTPRequestHandler):
         log.error('Expected to find fallback type for type %s', ppqt)
         return None
 
-    def do_GET_status(self, note_admin: htmls) -> None:
+    @classmethod
+    def status_cached(cls,
+                      key: typing.Tuple,
+                      render: typing.Callable[[], typing.Any]) -> typing.Any:
+        """
+        Return the cached encoded status page part for `key`, call `render`
+        if it is not cached.
+        The cache is emptied by each new redirects generation (`set_c`).
+        """
+        cache = cls.status_cache
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+        value = render()
+        if len(cache) >= STATUS_PAGE_CACHE_MAX:
+            cache.clear()
+        cache[key] = value
+        return value
+
+    @classmethod
+    def status_part(cls,
+                    key: typing.Tuple,
+                    render: typing.Callable[[], bytes]) \
+            -> typing.Tuple[typing.Tuple, bytes]:
+        """`status_cached` paired with `key`, see `status_page_chunks`"""
+        return key, cls.status_cached(key, render)
+
+    @staticmethod
+    def status_page_params(query: str, count: int) \
+            -> typing.Tuple[int, int, int]:
+        """
+        Get status page pagination from the request query, e.g.
+        'page=2&size=100'. A size of 0 is all entries on one page. Other
+        sizes are clamped to STATUS_PAGE_SIZE_MAX and to `count`, so the
+        client controlled size makes few distinct cache keys.
+
+        :param query: request query
+        :param count: count of redirect entries
+        :return: page number (from 1), page size, count of pages
+        """
+        qs = parse.parse_qs(query)
+
+        def int_arg(name: str, default: int) -> int:
+            try:
+                return int(qs[name][0])
+            except (KeyError, IndexError, ValueError):
+                return default
+
+        size = int_arg('size', STATUS_PAGE_SIZE_DEFAULT)
+        if size < 1:
+            size = max(count, 1)
+        else:
+            size = min(size, STATUS_PAGE_SIZE_MAX, max(count, 1))
+        pages = max(1, (count + size - 1) // size)
+        page = min(max(1, int_arg('page', 1)), pages)
+        return page, size, pages
+
+    def _gzip_chunks(self,
+                     chunks: typing.Iterable[
+                         typing.Tuple[typing.Optional[typing.Tuple], bytes]]) \
+            -> typing.Iterator[bytes]:
+        """
+        gzip compress the parts from `status_page_chunks` as one gzip stream.
+        Parts with a cache key are compressed once and cached.
+        """
+        yield GZIP_HEADER
+        crc = 0
+        size = 0
+        for key, chunk in chunks:
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            if key is None:
+                yield deflate_raw(chunk, GZIP_LEVEL)
+            else:
+                yield self.status_cached(
+                    ('deflate',) + key,
+                    lambda: deflate_raw(chunk, GZIP_LEVEL_CACHED)
+                )
+        yield GZIP_DEFLATE_END + gzip_trailer(crc, size)
+
+    def _write_html_chunks(self,
+                           chunks: typing.Iterable[
+                               typing.Tuple[typing.Optional[typing.Tuple],
+                                            bytes]]) -> None:
+        """
+        Write out encoded HTML document parts (see `status_page_chunks`) and
+        required headers as they are created.
+        HTTP/1.1 clients get "Transfer-Encoding: chunked", HTTP/1.0 clients
+        get the joined parts with "Content-Length".
+        The parts are gzip compressed if the client accepts it.
+        This calls end_headers!
+        """
+        self.send_header(*self.Header_Server_Host)
+        self.send_header(*self.Header_Server_Version)
+        self.send_header(*self.Header_ContentType_html)
+        self.send_header(*self.Header_Vary)
+        self.send_header(*self.Header_Connection_close)
+        if self.accepts_gzip():
+            self.send_header(*self.Header_ContentEncoding_gzip)
+            chunks_ = self._gzip_chunks(chunks)  # type: typing.Iterable[bytes]
+        else:
+            chunks_ = (chunk for _, chunk in chunks)
+        if self.request_version != 'HTTP/1.1':
+            html_docb = b''.join(chunks_)
+            self.send_header('Content-Length', str(len(html_docb)))
+            self.end_headers()
+            self.wfile.write(html_docb)
+            return
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for chunk in chunks_:
+            if not chunk:
+                continue  # an empty chunk is the last chunk
+            self.wfile.write(b''.join(
+                (('%X\r\n' % len(chunk)).encode('ascii'), chunk, b'\r\n')
+            ))
+        self.wfile.write(b'0\r\n\r\n')
+        return
+
+    def do_GET_status(self, note_admin: htmls, ppqpr: ParseResult) -> None:
         """dump status information about this server instance"""
 
         http_sc = http.HTTPStatus.OK  # HTTP Status Code
@@ -928,28 +1863,26 @@ class RedirectHandler(server.SimpleHTTPRequestHandler):
                          int(http_sc), http_sc.phrase,
                          loglevel=logging.INFO)
         self.send_response(http_sc)
+        self._write_html_chunks(self.status_page_chunks(note_admin, ppqpr))
+        return
+
+    def status_page_chunks(self, note_admin: htmls, ppqpr: ParseResult) \
+            -> typing.Iterator[typing.Tuple[typing.Optional[typing.Tuple],
+                                            bytes]]:
+        """
+        Create the status page as encoded parts.
+        Parts that only change with a new redirects generation or a new
+        redirect_counter_epoch are cached, those are yielded with their cache
+        key. Other parts are yielded with key None.
+        """
         he = html_escape  # abbreviate
+        # read the class-wide values once, a reload may replace them
+        redirects = self.redirects
+        generation = self.generation
+        counter_epoch = redirect_counter_epoch
 
-        # create the html body
-        esc_title = he(
-            '%s status' % PROGRAM_NAME)
-        start_datetime = datetime.datetime.\
-            fromtimestamp(TIME_START).replace(microsecond=0)
-        uptime = time.time() - TIME_START
-        esc_overall = \
-            'Program {}'.format(
-                html_a(__url_github__, PROGRAM_NAME)
-            )
-        esc_overall += he(' version {}.\n'.format(__version__))
-        esc_overall += he(
-            'Process ID %s listening on %s:%s on host %s\n'
-            'Process start datetime %s (up time %s)\n'
-            'Successful Redirect Status Code is %s (%s)'
-            % (os.getpid(), self.server.server_address[0],
-               self.server.server_address[1], HOSTNAME,
-               start_datetime, datetime.timedelta(seconds=uptime),
-               int(self.status_code), self.status_code.phrase,)
-        )
+        def enc(s_: str) -> bytes:
+            return bytes(s_, encoding='utf-8', errors='xmlcharrefreplace')
 
         def obj_to_html(obj, sort_keys=False) -> htmls:
             """Convert an object to html"""
@@ -958,67 +1891,108 @@ class RedirectHandler(server.SimpleHTTPRequestHandler):
                            sort_keys=sort_keys, default=str)
             )
 
-        def redirects_to_html_table(rd: Re_Entry_Dict, reload_datetime_) \
-                -> htmls:
-            """Convert Re_Entry_Dict into linkable html table"""
-            esc_reload_datetime = he(cast(datetime.datetime, reload_datetime_)
-                                     .isoformat())
-            s_ = """\
+        def asset_url(name: str) -> str:
+            for path, asset_ in self.status_assets.items():
+                if asset_.name == name:
+                    return '%s?v=%s' % (path, asset_.hash_)
+            raise KeyError(name)
+
+        def render_head() -> bytes:
+            esc_title = he('%s status' % PROGRAM_NAME)
+            return enc(
+                r"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="utf-8" />
+    <title>{esc_title}</title>
+    <link rel="stylesheet" type="text/css" href="{esc_css}"/>
+    <script src="{esc_javascript}"></script>
+</head>
+<body>
+"""
+                .format(esc_title=esc_title,
+                        esc_css=he(asset_url('status.css')),
+                        esc_javascript=he(asset_url('sorttable.js')))
+            )
+
+        yield self.status_part(('head',), render_head)
+
+        if note_admin:
+            note_admin = htmls('\n    <div>\n') + note_admin + htmls('\n    </div>\n')  # type: ignore
+        yield None, enc('<!-- begin status-page-file note -->{note}'
+                        '<!-- end status-page-file note -->\n'
+                        .format(note=note_admin))
+
+        keys = self.status_cached(
+            ('keys', generation),
+            lambda: list(redirects.keys())  # type: ignore
+        )  # type: typing.List[Re_EntryKey]
+        count = len(keys)
+        page, size, pages = self.status_page_params(ppqpr.query, count)
+        first = (page - 1) * size
+
+        def page_a(page_: int, text: str) -> htmls:
+            """link to another page of the status page"""
+            return html_a(
+                '%s?%s' % (self.status_path,
+                           parse.urlencode({'page': page_, 'size': size})),
+                text
+            )
+
+        def render_table() -> bytes:
+            """Convert one page of Re_Entry_Dict into linkable html table"""
+            esc_reload_datetime = he(reload_datetime.isoformat()
+                                     if reload_datetime else 'never')
+            nav = []  # type: typing.List[str]
+            if page > 1:
+                nav.append(page_a(1, 'first'))
+                nav.append(page_a(page - 1, 'previous'))
+            if page < pages:
+                nav.append(page_a(page + 1, 'next'))
+                nav.append(page_a(pages, 'last'))
+            parts = ["""\
 <table class="sortable">
-    <caption>Currently Loaded Redirects (last reload {esc_reload_datetime})</caption>
+    <caption>Currently Loaded Redirects (last reload {esc_reload_datetime})<br />
+    entries {first} to {last} of {count}, page {page} of {pages} {nav}</caption>
     <thead>
         <tr>
             <th scope="col">From</th><th scope="col">To</th><th scope="col" class="ar">Entry User</th><th scope="col">Entry datetime</th>
         </tr>
     </thead>
     <tbody>
-""".format(esc_reload_datetime=esc_reload_datetime)
-            for key in rd.keys():
-                val = rd[key]
-                s_ += """\
+""".format(esc_reload_datetime=esc_reload_datetime,
+           first=min(first + 1, count), last=min(first + size, count),
+           count=count, page=page, pages=pages, nav=' '.join(nav))]
+            row = """\
         <tr>
             <td>{from_}</td><td>{to_}</td><td class="ar">{user}</td><td>{date}</td>
         </tr>
-"""\
-                    .format(from_=html_a(val.from_),
-                            to_=he(val.to),
-                            user=he(val.user),
-                            date=he(str(val.date)),
-                            )
-            s_ += """\
+"""
+            for key in keys[first:first + size]:
+                val = redirects[key]
+                parts.append(row.format(from_=html_a(val.from_),
+                                        to_=he(val.to),
+                                        user=he(val.user),
+                                        date=he(str(val.date)),
+                                        ))
+            parts.append("""\
     </tbody>
-</table>"""
-            return htmls(s_)
-
-        esc_reload_info = he(
-            ' (process signal %d (%s))' % (SIGNAL_RELOAD, SIGNAL_RELOAD)
-        )
-        esc_redirects_counter = obj_to_html(redirect_counter)
-        esc_redirects = redirects_to_html_table(self.redirects, reload_datetime)
-        esc_files = obj_to_html(Redirect_Files_List)
-        if note_admin:
-            note_admin = htmls('\n    <div>\n') + note_admin + htmls('\n    </div>\n')  # type: ignore
-        html_doc = htmls(
-            r"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="utf-8" />
-    <title>{esc_title}</title>
-    <style type="text/css">
-        /* <!-- */
-{css}
-        /* --> */
-    </style>
-    <script>
-        // <!--
-{javascript}
-        // -->
-    </script>
-</head>
-<body>
-<!-- begin status-page-file note -->{note}<!-- end status-page-file note -->
-<div>
-{esc_redirects}
+</table>""")
+            return enc(''.join(parts))
+
+        yield None, b'<div>\n'
+        if size > STATUS_PAGE_SIZE_MAX:
+            # the whole of a large table, too large to keep
+            yield None, render_table()
+        else:
+            yield self.status_part(('table', generation, page, size),
+                                   render_table)
+
+        def render_files() -> bytes:
+            esc_reload_info = he(
+                ' (process signal %d (%s))' % (SIGNAL_RELOAD, SIGNAL_RELOAD)
+            )
+            return enc("""
 </div>
 <div>
     <h3>Redirect Files Searched During an Reload{esc_reload_info}:</h3>
@@ -1026,36 +2000,253 @@ class RedirectHandler(server.SimpleHTTPRequestHandler):
 {esc_files}
     </pre>
 </div>
+"""
+                       .format(esc_reload_info=esc_reload_info,
+                               esc_files=obj_to_html(Redirect_Files_List)))
+
+        yield self.status_part(('files', generation), render_files)
+
+        def render_counter() -> bytes:
+            # copy, redirect_counter may change during json.dumps
+            return enc("""\
 <div>
     <h3>Redirects Counter:</h3>
     Counting of successful redirect responses:
     <pre>
 {esc_redirects_counter}
     </pre>
+""".format(esc_redirects_counter=obj_to_html(dict(redirect_counter))))
+
+        yield self.status_part(('counter', counter_epoch),
+                               render_counter)
+
+        start_datetime = datetime.datetime.\
+            fromtimestamp(TIME_START).replace(microsecond=0)
+        uptime = time.time() - TIME_START
+        esc_overall = \
+            'Program {}'.format(
+                html_a(__url_github__, PROGRAM_NAME)
+            )
+        esc_overall += he(' version {}.\n'.format(__version__))
+        socket_options = '\n'.join(
+            '    %s %s' % (address, ' '.join('%s=%s' % kv
+                                           for kv in values.items()))
+            for address, values
+            in self.server.socket_options_effective().items()
+        )
+        tls_text = self.server.tls_text()
+        esc_overall += he(
+            'Process ID %s listening on %s on host %s\n'
+            'Process start datetime %s (up time %s)\n'
+            'Successful Redirect Status Code is %s (%s)\n'
+            'Requests in flight %s (limit %s)\n'
+            'Reload least interval %ss, pending reload generation %s\n'
+            'Listen socket options:\n%s%s'
+            % (os.getpid(), self.server.address_text(), HOSTNAME,
+               start_datetime, datetime.timedelta(seconds=uptime),
+               int(self.status_code), self.status_code.phrase,
+               getattr(self.server, 'in_flight', None),
+               getattr(self.server, 'max_in_flight', 0) or 'none',
+               reload_control.interval, reload_control.pending,
+               socket_options, '\n' + tls_text if tls_text else '')
+        )
+        yield None, enc("""\
+    <h3>Server Counter:</h3>
+    Counting of requests rejected or shed by the server, of reload
+    requests, and of TLS handshakes:
+    <pre>
+{esc_server_counter}
+    </pre>
     <h3>Process Information:</h3>
     <pre>
 {esc_overall}
     </pre>
 </div>
 </body>
-</html>"""
-            .format(esc_title=esc_title,
-                    css=CSS,
-                    javascript=JAVASCRIPT_SORTABLE_JS,
-                    note=note_admin,
-                    esc_redirects=esc_redirects,
-                    esc_reload_info=esc_reload_info,
-                    esc_files=esc_files,
-                    esc_redirects_counter=esc_redirects_counter,
-                    esc_overall=esc_overall)
+</html>""".format(esc_server_counter=obj_to_html(dict(server_counter), True),
+                  esc_overall=esc_overall))
+
+    @staticmethod
+    def etag(*parts: typing.Any) -> str:
+        """
+        Create an HTTP ETag from `parts`. Includes the process start time so
+        tags from a previous process do not match.
+        """
+        return '"%x-%s"' % (int(TIME_START * 1000),
+                            '-'.join(str(part) for part in parts))
+
+    def etag_match(self, etag: str) -> bool:
+        """does the request "If-None-Match" header match `etag`?"""
+        inm = self.headers.get('If-None-Match')
+        if not inm:
+            return False
+        etag_gzip = self.etag_gzip(etag)
+        for tag in inm.split(','):
+            tag = tag.strip()
+            if tag.startswith('W/'):
+                tag = tag[2:]
+            if tag == '*' or tag == etag or tag == etag_gzip:
+                return True
+        return False
+
+    def _write_not_modified(self,
+                            headers: typing.Iterable[typing.Tuple[str, str]]) \
+            -> None:
+        """write a 304 Not Modified response, there is no body"""
+        http_sc = http.HTTPStatus.NOT_MODIFIED
+        self.log_message('returning %s (%s)', int(http_sc), http_sc.phrase)
+        self.send_response(http_sc)
+        self.send_header(*self.Header_Server_Host)
+        self.send_header(*self.Header_Server_Version)
+        for header in headers:
+            self.send_header(*header)
+        self.send_header(*self.Header_Vary)
+        self.send_header(*self.Header_Connection_close)
+        self.end_headers()
+        return
+
+    def do_GET_status_asset(self, ppqpr: ParseResult) -> None:
+        """a static asset of the status page, see STATUS_ASSETS"""
+        asset_ = self.status_assets[ppqpr.path]
+        etag = '"%s"' % asset_.hash_
+        headers = (
+            ('ETag', etag),
+            ('Cache-Control', STATUS_ASSET_CACHE_CONTROL),
         )
-        self._write_html_doc(html_doc)
+        if self.etag_match(etag):
+            self._write_not_modified(headers)
+            return
+        self.log_message('returning status asset %s', asset_.name)
+        self.send_response(http.HTTPStatus.OK)
+        self._write_body(asset_.body, ('Content-Type', asset_.content_type),
+                         headers, ('asset', asset_.name))
         return
 
-    def do_GET_reload(self) -> None:
-        http_sc = http.HTTPStatus.ACCEPTED  # HTTP Status Code
-        self.log_message('reload requested, returning %s (%s)',
-                         int(http_sc), http_sc.phrase,
+    def _write_json_doc(self,
+                        render: typing.Callable[[], bytes],
+                        etag: str,
+                        cache_key: typing.Optional[typing.Tuple]) -> None:
+        """
+        Respond 304 Not Modified if the client has `etag`, otherwise
+        write the JSON document from `render` (cached by `cache_key`).
+        This calls send_response and end_headers!
+        """
+        headers = (
+            ('ETag', etag),
+            ('Cache-Control', 'no-cache'),
+        )
+        if self.etag_match(etag):
+            self._write_not_modified(headers)
+            return
+        if cache_key is None:
+            body = render()
+        else:
+            body = self.status_cached(cache_key, render)
+        self.send_response(http.HTTPStatus.OK)
+        self._write_body(body, self.Header_ContentType_json, headers,
+                         cache_key)
+        return
+
+    @staticmethod
+    def json_bytes(obj: typing.Any) -> bytes:
+        return bytes(json.dumps(obj, ensure_ascii=False, default=str),
+                     encoding='utf-8', errors='xmlcharrefreplace')
+
+    def do_GET_status_redirects_json(self, ppqpr: ParseResult) -> None:
+        """
+        JSON document of loaded redirect entries, sorted by "from path".
+        Request query 'prefix=' filters to "from paths" starting with the
+        prefix. Request query 'page=' 'size=' is the same as the status page.
+        """
+        self.log_message('status redirects JSON requested',
+                         loglevel=logging.INFO)
+        # read the class-wide values once, a reload may replace them
+        redirects = self.redirects
+        generation = self.generation
+        prefix = parse.parse_qs(ppqpr.query).get('prefix', [''])[0]
+        keys = self.status_cached(
+            ('keys_sorted', generation),
+            lambda: sorted(redirects.keys())
+        )  # type: typing.List[Re_EntryKey]
+        # keys starting with prefix are one sorted range
+        lo = bisect.bisect_left(keys, prefix)
+        hi = bisect.bisect_left(keys, prefix + '\U0010FFFF', lo) \
+            if prefix else len(keys)
+        page, size, pages = self.status_page_params(ppqpr.query, hi - lo)
+        first = lo + (page - 1) * size
+
+        def render() -> bytes:
+            return self.json_bytes({
+                'generation': generation,
+                'reload_datetime': reload_datetime,
+                'prefix': prefix,
+                'count': hi - lo,
+                'page': page,
+                'size': size,
+                'pages': pages,
+                'redirects': [
+                    {
+                        'from': redirects[key].from_,
+                        'to': redirects[key].to,
+                        'user': redirects[key].user,
+                        'date': redirects[key].date,
+                        'code': redirects[key].code,
+                        'max_age': redirects[key].max_age,
+                    }
+                    for key in keys[first:min(first + size, hi)]
+                ],
+            })
+
+        self._write_json_doc(render,
+                             self.etag('g%d' % generation),
+                             ('json', generation, prefix, page, size)
+                             if size <= STATUS_PAGE_SIZE_MAX else None)
+        return
+
+    def do_GET_status_json(self, _: ParseResult) -> None:
+        """JSON document of redirect counters and process information"""
+        self.log_message('status JSON requested', loglevel=logging.INFO)
+        generation = self.generation
+        counter_epoch = redirect_counter_epoch
+        server_counter_ = dict(server_counter)
+
+        def render() -> bytes:
+            return self.json_bytes({
+                'program': PROGRAM_NAME,
+                'version': __version__,
+                'pid': os.getpid(),
+                'host': HOSTNAME,
+                'listen': self.server.server_address,
+                'listeners': self.server.listen_addresses(),
+                'socket_options': self.server.socket_options_effective(),
+                'tls': self.server.tls_stats(),
+                'start_datetime': DATETIME_START,
+                'redirect_code': int(self.status_code),
+                'generation': generation,
+                'reload_datetime': reload_datetime,
+                'entries': len(self.redirects),
+                'files': [str(file_) for file_ in Redirect_Files_List],
+                'counter_epoch': counter_epoch,
+                # copy, redirect_counter may change during json.dumps
+                'counters': dict(redirect_counter),
+                'server_counters': server_counter_,
+                'in_flight': getattr(self.server, 'in_flight', None),
+                'max_in_flight': getattr(self.server, 'max_in_flight', 0),
+            })
+
+        self._write_json_doc(render,
+                             self.etag('g%d' % generation,
+                                       'c%d' % counter_epoch,
+                                       's%d' % sum(server_counter_.values())),
+                             None)
+        return
+
+    def do_GET_reload(self) -> None:
+        generation = reload_control.request()
+        http_sc = http.HTTPStatus.ACCEPTED  # HTTP Status Code
+        self.log_message('reload requested, covered by generation %d,'
+                         ' returning %s (%s)',
+                         generation, int(http_sc), http_sc.phrase,
                          loglevel=logging.INFO)
         esc_datetime = html_escape(datetime_now().isoformat())
         self.send_response(http_sc)
@@ -1074,54 +2265,146 @@ class RedirectHandler(server.SimpleHTTPRequestHandler):
 </head>
 <body>
 Reload request accepted at {esc_datetime}.
+Redirects generation {generation} will include it (current generation {current}).
 </body>
 </html>\
 """
             .format(esc_title=esc_title,
                     css=CSS,
-                    esc_datetime=esc_datetime
+                    esc_datetime=esc_datetime,
+                    generation=generation,
+                    current=self.generation
                     )
         )
+        self.send_header('Redirect-Server-Reload-Generation', str(generation))
         self._write_html_doc(html_doc)
-        global reload_do
-        reload_do = True
         return
 
     def do_GET_redirect_NOT_FOUND(self,
                                   ppq: str,
                                   ppqpr: ParseResult) -> None:
-        """a Redirect request was not found, return some HTML to the user"""
+        """
+        a Redirect request was not found, return some HTML to the user.
+        The constant parts of the page are encoded once per generation, only
+        the escaped request path is encoded per request.
+        """
+        code = http.HTTPStatus.NOT_FOUND
+        if self.not_found_minimal:
+            head, body = self.status_cached(('404', 'minimal'), lambda: (
+                self._response_head(code, (
+                    ('Content-Type', 'text/plain; charset=utf-8'),
+                ) + self.not_found_headers()),
+                bytes('%d %s\n' % (code, code.phrase), encoding='utf-8'),
+            ))
+            self._write_vectored(code, head, (body,))
+            return
 
-        self.send_response(http.HTTPStatus.NOT_FOUND)
-        esc_title = html_escape("Not Found - '%s'" % ppqpr.path[:64])
-        esc_ppq = html_escape(ppq)
-        html_doc = htmls("""\
+        def render() -> typing.Tuple[bytes, bytes, bytes, bytes]:
+            # split the page around the two parts taken from the request
+            html_doc = htmls("""\
 <!DOCTYPE html>
 <html lang="en">
 <head>
 <meta charset="utf-8"/>
-<title>{esc_title}</title>
+<title>Not Found - '\0'</title>
 <style type="text/css">
 {css}
 </style>
 </head>
 <body>
-Redirect Path not found: <code>{esc_ppq}</code>
+Redirect Path not found: <code>\0</code>
 </body>
 </html>\
 """
-        .format(esc_title=esc_title,
-                css=CSS,
-                esc_ppq=esc_ppq)
-        )
-        self._write_html_doc(html_doc)
+            .format(css=CSS)
+            )
+            prefix, middle, suffix = (
+                bytes(part, encoding='utf-8', errors='xmlcharrefreplace')
+                for part in html_doc.split('\0')
+            )
+            head = self._response_head(
+                code, (self.Header_ContentType_html,) + self.not_found_headers())
+            return head, prefix, middle, suffix
+
+        head, prefix, middle, suffix = self.status_cached(('404',), render)
+        esc_title = html_escape(ppqpr.path[:64])
+        esc_ppq = html_escape(ppq[:ERROR_PAGE_PATH_MAX])
+        self._write_vectored(code, head, (
+            prefix,
+            bytes(esc_title, encoding='utf-8', errors='xmlcharrefreplace'),
+            middle,
+            bytes(esc_ppq, encoding='utf-8', errors='xmlcharrefreplace'),
+            suffix,
+        ), compressible=True)
+        return
+
+    def send_error(self,
+                   code: int,
+                   message: str_None = None,
+                   explain: str_None = None) -> None:
+        """
+        override the baseclass send_error so error pages are encoded once
+        per generation, only `message` and `explain` are encoded per request
+        """
+        try:
+            code_ = http.HTTPStatus(code)
+        except ValueError:
+            code_ = None
+        # HTTP/0.9 responses have no head
+        if code_ is None or self.request_version == 'HTTP/0.9':
+            return super().send_error(code, message, explain)
+        self.log_error('code %d, message %s', code, message)
+        # same as the baseclass, the error page body is only sent when allowed
+        has_body = code >= 200 and self.command != 'HEAD' and \
+            code_ not in (http.HTTPStatus.NO_CONTENT,
+                          http.HTTPStatus.RESET_CONTENT,
+                          http.HTTPStatus.NOT_MODIFIED)
+
+        def render() -> typing.Tuple[bytes, typing.List[typing.Any]]:
+            if not has_body:
+                return self._response_head(code_, ()), []
+            # split the page around the parts passed by the caller, the list
+            # alternates constant bytes and the names of the parts
+            page = self.error_message_format % {
+                'code': code,
+                'message': '\0message\0',
+                'explain': '\0explain\0',
+            }
+            parts = page.split('\0')  # type: typing.List[typing.Any]
+            parts[::2] = [bytes(part, 'UTF-8', 'replace')
+                          for part in parts[::2]]
+            head = self._response_head(
+                code_, (('Content-Type', self.error_content_type),))
+            return head, parts
+
+        head, parts = self.status_cached(('error', code, has_body), render)
+        values = {
+            'message': message or code_.phrase,
+            'explain': explain or code_.description,
+        }
+        body_parts = [
+            part if isinstance(part, bytes) else
+            bytes(html.escape(values[part][:ERROR_PAGE_PATH_MAX],
+                              quote=False), 'UTF-8', 'replace')
+            for part in parts
+        ]
+        self._write_vectored(code_, head, body_parts, has_body,
+                             compressible=has_body)
         return
 
+    def not_found_headers(self) -> typing.Tuple[typing.Tuple[str, str], ...]:
+        """extra headers of 404 Not Found responses"""
+        if self.not_found_max_age is None:
+            return ()
+        return (('Cache-Control', 'max-age=%d' % self.not_found_max_age),)
+
     def do_HEAD_redirect_NOT_FOUND(self) -> None:
         self.send_response(http.HTTPStatus.NOT_FOUND)
         self.send_header(*self.Header_Server_Host)
         self.send_header(*self.Header_Server_Version)
         self.send_header(*self.Header_ContentType_html)  # https://tools.ietf.org/html/rfc2616#page-124
+        for header in self.not_found_headers():
+            self.send_header(*header)
         self.send_header(*self.Header_Connection_close)
         self.end_headers()
         return
@@ -1166,15 +2449,18 @@ Redirect Path not found: <code>{esc_ppq}</code>
         to = self.combine_parseresult(entry.to_pr, ppqpr)
         user = entry.user
         dt = entry.date
+        status_code = entry.code or self.status_code
 
         self.log_message('redirect found (%s) → (%s), returning %s (%s)',
                          ppqpr.path, to,
-                         int(self.status_code), self.status_code.phrase,
+                         int(status_code), status_code.phrase,
                          loglevel=logging.INFO)
 
-        self.send_response(self.status_code)
+        self.send_response(status_code)
         self.send_header(*self.Header_Server_Host)
         self.send_header(*self.Header_Server_Version)
+        if entry.max_age is not None:
+            self.send_header('Cache-Control', 'max-age=%d' % entry.max_age)
         # The 'Location' Header is used by browsers for HTTP 30X Redirects
         # https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Location
         # The most important statement in this program.
@@ -1193,6 +2479,8 @@ Redirect Path not found: <code>{esc_ppq}</code>
         # Do Not Write HTTP Content
         count_key = '(%s) → (%s)' % (ppqpr.path, to)
         redirect_counter[count_key] += 1
+        global redirect_counter_epoch
+        redirect_counter_epoch += 1
         return
 
     def _do_VERB_log(self):
@@ -1210,6 +2498,291 @@ Redirect Path not found: <code>{esc_ppq}</code>
         except Exception:
             log.exception('Failed to log request')
 
+    def rate_limited(self, client: str) -> bool:
+        """
+        Is `client` over the rate limit? If so then write a 429 Too Many
+        Requests response with "Retry-After". Nothing is logged or counted
+        per client, a flood of requests must not become a flood of logging.
+        """
+        limiter = getattr(self.server, 'rate_limiter', None)
+        if limiter is None:
+            return False
+        wait = limiter.take(client)
+        if not wait:
+            return False
+        server_counter['rate limited (429)'] += 1
+        self.close_connection = True
+        if self.rfile_raw is not None:
+            self.rfile_raw.set_deadline(None)  # restore the write timeout
+        self.wfile.write(
+            self.status_cached(('429',), lambda: bytes(
+                '%s %d %s\r\n'
+                'Content-Length: 0\r\n'
+                'Connection: close\r\n'
+                'Retry-After: ' % (self.protocol_version,
+                                   http.HTTPStatus.TOO_MANY_REQUESTS,
+                                   http.HTTPStatus.TOO_MANY_REQUESTS.phrase),
+                'latin-1'))
+            + b'%d\r\n\r\n' % max(1, int(wait + 0.999))
+        )
+        # the request head is not read, read what has arrived so closing
+        # does not reset the connection before the client reads the 429
+        socket_drain(self.connection, self.max_header_bytes)
+        return True
+
+    def forwarded_client(self, proxies: typing.Sequence[IP_Network]) -> str:
+        """
+        The client address from the request "X-Forwarded-For" header of a
+        trusted proxy. That is the right-most address that is not one of the
+        trusted `proxies`.
+        """
+        client = self.client_address[0]  # type: str
+        forwarded = self.headers.get_all('X-Forwarded-For') or []
+        for address in reversed(','.join(forwarded).split(',')):
+            address = address.strip()
+            if not address:
+                continue
+            client = address
+            if not ip_in_networks(address, proxies):
+                break
+        return client
+
+    def setup(self) -> None:
+        """
+        Override the baseclass setup so reading the request head has a
+        deadline, see `handle_one_request`.
+        """
+        super().setup()
+        self.rfile_raw = None  # type: typing.Optional[DeadlineSocketIO]
+        if self.head_timeout:
+            self.rfile.close()
+            self.rfile_raw = DeadlineSocketIO(self.connection, 'rb')
+            self.rfile_raw.timeout = self.timeout
+            self.rfile = io.BufferedReader(self.rfile_raw)
+
+    def _send_error_early(self, code: http.HTTPStatus, counter: str) -> None:
+        """send_error before the request line was parsed"""
+        if self.rfile_raw is not None:
+            self.rfile_raw.set_deadline(None)  # restore the write timeout
+        server_counter[counter] += 1
+        self.requestline = str(self.raw_requestline,
+                               'iso-8859-1').rstrip('\r\n')
+        self.request_version = 'HTTP/1.0'
+        self.command = ''
+        self.send_error(code)
+
+    def read_head(self) -> typing.Optional[bytes]:
+        """
+        Read the request header lines, up to and including the empty line.
+        Responds 431 Request Header Fields Too Large and returns None
+        if there are more than `max_headers` or `max_header_bytes`.
+        """
+        lines = []  # type: typing.List[bytes]
+        size = 0
+        while True:
+            line = self.rfile.readline(self.max_header_bytes + 1)
+            size += len(line)
+            end = line in (b'\r\n', b'\n', b'')
+            # the empty line is not a header
+            if size > self.max_header_bytes \
+                    or (not end and len(lines) >= self.max_headers):
+                self._send_error_early(
+                    http.HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                    'request header too large (431)')
+                return None
+            lines.append(line)
+            if end:
+                return b''.join(lines)
+
+    def parse_head(self, head: bytes) -> bool:
+        """
+        Parse the request headers of `head`, read by `read_head`, as the
+        baseclass parse_request does. Return False if a response was sent.
+        """
+        self.headers = email.parser.Parser(_class=self.MessageClass).parsestr(
+            head.decode('iso-8859-1'))
+        conntype = self.headers.get('Connection', '').lower()
+        if conntype == 'close':
+            self.close_connection = True
+        elif conntype == 'keep-alive' and self.protocol_version >= 'HTTP/1.1':
+            self.close_connection = False
+        if self.headers.get('Expect', '').lower() == '100-continue' \
+                and self.protocol_version >= 'HTTP/1.1' \
+                and self.request_version >= 'HTTP/1.1':
+            return self.handle_expect_100()
+        return True
+
+    def handle_one_request(self) -> None:
+        """
+        Override the baseclass handle_one_request to protect from
+        misbehaving clients:
+
+        - the request line and headers must be read within `head_timeout`
+          seconds, else respond 408 Request Timeout
+        - the request line is at most `max_request_line` bytes, the headers
+          at most `max_headers` lines and `max_header_bytes` bytes
+        - the per-client rate limit is enforced right after reading the
+          request line. Requests from trusted proxies are limited per
+          "X-Forwarded-For" client, which requires parsing the request
+          headers first.
+
+        The connection is in the server `busy` set from reading the request
+        line until the response is written, see RedirectServer.drain.
+        """
+        busy = getattr(self.server, 'busy', None) \
+            # type: typing.Optional[typing.Set[socket.socket]]
+        try:
+            raw = self.rfile_raw
+            if raw is not None:
+                raw.set_deadline(time.monotonic() + self.head_timeout)
+            self.raw_requestline = b''
+            try:
+                self.raw_requestline = \
+                    self.rfile.readline(self.max_request_line + 1)
+                if len(self.raw_requestline) > self.max_request_line:
+                    self.raw_requestline = \
+                        self.raw_requestline[:ERROR_PAGE_PATH_MAX]
+                    self._send_error_early(http.HTTPStatus.REQUEST_URI_TOO_LONG,
+                                           'request line too long (414)')
+                    return
+                if not self.raw_requestline:
+                    self.close_connection = True
+                    return
+                if busy is not None:
+                    busy.add(self.connection)
+                proxies = getattr(self.server, 'trusted_proxies', ())
+                from_proxy = ip_in_networks(self.client_address[0], proxies) \
+                    or (self.client_address[0] == UNIX_CLIENT
+                        and getattr(self.server, 'unix_trust', False))
+                if not from_proxy and \
+                        self.rate_limited(self.client_address[0]):
+                    return
+                head = b''
+                # HTTP/0.9 requests have no headers
+                if len(self.raw_requestline.split()) > 2:
+                    head_ = self.read_head()
+                    if head_ is None:
+                        return
+                    head = head_
+            except socket.timeout:
+                self._send_error_early(http.HTTPStatus.REQUEST_TIMEOUT,
+                                       'request head timeout (408)')
+                self.close_connection = True
+                return
+            finally:
+                if raw is not None:
+                    raw.set_deadline(None)
+            # parse the request line, then the headers already read. The
+            # baseclass parses headers within the http.client limit of 100
+            # headers, not `max_headers`
+            rfile = self.rfile
+            self.rfile = io.BytesIO(b'\r\n')  # type: ignore
+            try:
+                parsed = self.parse_request()
+            finally:
+                self.rfile = rfile
+            if not parsed or (head and not self.parse_head(head)):
+                # An error code has been sent, just exit
+                return
+            if from_proxy:
+                client_ = self.forwarded_client(proxies)
+                if self.client_address[0] == UNIX_CLIENT:
+                    # the Unix socket peer has no address, log the client
+                    self.client_address = (client_, 0)
+                if self.rate_limited(client_):
+                    return
+            mname = 'do_' + self.command
+            if not hasattr(self, mname):
+                self.send_error(
+                    http.HTTPStatus.NOT_IMPLEMENTED,
+                    'Unsupported method (%r)' % self.command)
+                return
+            method = getattr(self, mname)
+            method()
+            # actually send the response if not already done
+            self.wfile.flush()
+        except socket.timeout as ex:
+            # a read or a write timed out. Discard this connection
+            self.log_error('Request timed out: %r', ex)
+            self.close_connection = True
+            return
+        finally:
+            if busy is not None:
+                busy.discard(self.connection)
+
+    def do_VERB_health(self) -> None:
+        """
+        Health check of `health_path` is always 200 OK.
+        Readiness check of `ready_path` is 200 OK if `server_ready`,
+        otherwise 503 Service Unavailable.
+        Write pre-encoded bytes; no logging, no counting, no rendering.
+        """
+        if self.path == self.health_path or server_ready:
+            code = http.HTTPStatus.OK
+        else:
+            code = http.HTTPStatus.SERVICE_UNAVAILABLE
+
+        def render() -> typing.Tuple[bytes, bytes]:
+            body = bytes('%s\n' % code.phrase, 'latin-1')
+            head = '%s %d %s\r\n' \
+                'Content-Type: text/plain; charset=utf-8\r\n' \
+                'Content-Length: %d\r\n' \
+                'Cache-Control: no-store\r\n' \
+                'Connection: close\r\n' \
+                % (self.protocol_version, code, code.phrase, len(body))
+            if code == http.HTTPStatus.SERVICE_UNAVAILABLE:
+                head += 'Retry-After: 1\r\n'
+            return bytes(head + '\r\n', 'latin-1'), body
+
+        head, body = self.status_cached(('health', code), render)
+        self.close_connection = True
+        self.wfile.write(head + body if self.command == 'GET' else head)
+        return
+
+    def do_VERB_micro(self) -> None:
+        """
+        Built-in response for PATH_FAVICON and PATH_ROBOTS; the configured
+        file or an empty 204 No Content. Both with a long Cache-Control so
+        browsers stop asking.
+        Write pre-encoded bytes; no logging, no counting, no rendering.
+        The file is read once per redirects generation.
+        """
+        path = self.path
+        if path == PATH_FAVICON:
+            file_, type_default = self.favicon_file, 'image/x-icon'
+        else:
+            file_, type_default = self.robots_file, 'text/plain'
+
+        def render() -> typing.Tuple[bytes, bytes]:
+            body = b''
+            if file_:
+                try:
+                    with open(file_, 'rb') as fo:
+                        body = fo.read()
+                except OSError as err:
+                    log.error('Failed to read file for %s: %s', path, err)
+            if body:
+                code = http.HTTPStatus.OK
+                type_ = mimetypes.guess_type(file_)[0] or type_default
+                head = '%s %d %s\r\n' \
+                    'Content-Type: %s\r\n' \
+                    'Content-Length: %d\r\n' \
+                    % (self.protocol_version, code, code.phrase, type_,
+                       len(body))
+            else:
+                code = http.HTTPStatus.NO_CONTENT
+                head = '%s %d %s\r\n' \
+                    % (self.protocol_version, code, code.phrase)
+            head += 'Cache-Control: %s\r\n' \
+                'Connection: close\r\n' \
+                '\r\n' % MICRO_CACHE_CONTROL
+            return bytes(head, 'latin-1'), body
+
+        head, body = self.status_cached(('micro', path), render)
+        self.close_connection = True
+        self.wfile.write(head + body if self.command == 'GET' else head)
+        return
+
     def do_GET(self) -> None:
         """
         baseclass invokes per HTTP GET Request (request entrypoint)
@@ -1218,16 +2791,25 @@ Redirect Path not found: <code>{esc_ppq}</code>
              query, and parameters.
         NOTE: Fragments are often dropped by clients.
         """
+        if self.path == self.health_path or self.path == self.ready_path:
+            self.do_VERB_health()
+            return
+        elif self.path in self.micro_paths:
+            self.do_VERB_micro()
+            return
         self._do_VERB_log()
 
         ppq = self.path
         ppqpr = to_ParseResult(ppq)
         if self.query_match(self.status_path_pr, ppqpr):
-            self.do_GET_status(self.note_admin)
+            self.do_GET_status(self.note_admin, ppqpr)
             return
         elif self.query_match(self.reload_path_pr, ppqpr):
             self.do_GET_reload()
             return
+        elif ppqpr.path in self.status_subpaths:
+            getattr(self, self.status_subpaths[ppqpr.path])(ppqpr)
+            return
 
         self._do_VERB_redirect(ppq, ppqpr, self.redirects)
         return
@@ -1240,6 +2822,12 @@ Redirect Path not found: <code>{esc_ppq}</code>
              query, and parameters.
         NOTE: Fragments are often dropped by clients.
         """
+        if self.path == self.health_path or self.path == self.ready_path:
+            self.do_VERB_health()
+            return
+        elif self.path in self.micro_paths:
+            self.do_VERB_micro()
+            return
         self._do_VERB_log()
 
         ppq = self.path
@@ -1279,6 +2867,18 @@ def redirect_handler_factory(redirects: Re_Entry_Dict,
     return rh
 
 
+def process_context() -> typing.Any:
+    """
+    multiprocessing context of the processes started while the server runs.
+    A forked child of the multi-threaded server may block on a lock another
+    thread held, and it inherits every socket. "forkserver" and "spawn"
+    children start from a fresh process.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
 class RedirectsLoader(object):
     """a namespace for functions that load and initialize Redirect Entries"""
 
@@ -1307,54 +2907,362 @@ class RedirectsLoader(object):
             entrys[key] = val
         return entrys
 
+    @staticmethod
+    def row_to_entry(row: typing.List[str]) -> Re_Entry:
+        """
+        convert one row of a redirects file, already split into fields, to
+        a Re_Entry. Raises if the row is missing fields.
+        """
+        from_ = Re_From(row[0])
+        to_ = Re_To(row[1])
+        user = Re_User(row[2])
+        date = row[3]
+        # optional fifth and sixth fields, may be empty
+        code = None  # type: typing.Optional[http.HTTPStatus]
+        max_age = None  # type: typing.Optional[int]
+        if len(row) > 4 and row[4]:
+            code = http.HTTPStatus(int(row[4]))
+            if code not in REDIRECT_CODES_ENTRY:
+                raise ValueError('code is not a redirect: %s' % row[4])
+        if len(row) > 5 and row[5]:
+            max_age = int(row[5])
+            if max_age < 0:
+                raise ValueError('max-age must not be negative: %s' % row[5])
+        # ignore any remaining fields in row
+        dt = fromisoformat(date)
+        # shortcut urlparse for the common plain "from path", e.g. '/hr'
+        if from_[:1] == '/' and from_[1:2] != '/' \
+                and not RE_URI_NOT_PATH.search(from_):
+            from_pr = ParseResult('', '', from_, '', '', '')
+        else:
+            from_pr = parse.urlparse(from_)
+        # pass all fields so Re_Entry.__new__ skips deriving them
+        return Re_Entry(
+            from_,
+            to_,
+            user,
+            Re_Date(dt),
+            from_pr,
+            parse.urlparse(to_),
+            Re_EntryType.getEntryType_From(from_),
+            code,
+            max_age,
+        )
+
+    @staticmethod
+    def tsv_lines_to_entrys(lines: Iter_str,
+                            line_num: int,
+                            entrys: typing.List[Re_Entry],
+                            errors: typing.List[typing.Tuple[int, str]]) \
+            -> int:
+        """
+        Convert lines of a redirects file using the default field delimiter
+        and without quoting. Append each Re_Entry to `entrys` and each
+        (line number, error message) to `errors`.
+
+        :param lines: lines without line endings
+        :param line_num: line number of the line before the first of `lines`
+        :return: line number of the last of `lines`
+        """
+        row_to_entry = RedirectsLoader.row_to_entry  # abbreviate
+        append = entrys.append  # abbreviate
+        debug = log.isEnabledFor(logging.DEBUG)
+        for line in lines:
+            line_num += 1
+            if not line or line.startswith(REDIRECT_FILE_IGNORE_LINE):
+                continue
+            row = line.split(FIELD_DELIMITER_DEFAULT)
+            if debug:
+                log.debug('File Line (%s):%s', line_num, row)
+            try:
+                append(row_to_entry(row))
+            except Exception as ex:
+                errors.append((line_num, repr(ex)))
+        return line_num
+
+    @staticmethod
+    def log_row_errors(rfilen: typing.Union[pathlib.Path, str],
+                       errors: typing.List[typing.Tuple[int, str]]) -> None:
+        """log all row errors of one file as one message"""
+        if not errors:
+            return
+        log.error(
+            'Error processing %d rows of file %s:\n%s',
+            len(errors), rfilen,
+            StrDelay('\n'.join,
+                     ('  row %d: %s' % error for error in errors))
+        )
+
+    @staticmethod
+    def load_redirects_file_csv(rfilen: pathlib.Path,
+                                field_delimiter: Re_Field_Delimiter) \
+            -> Re_Entry_Dict:
+        """
+        :param rfilen: file path to process for Re_Entry
+        :param field_delimiter: passed to csv.reader keyword delimiter
+        :return: Re_Entry_Dict of file line items converted to Re_Entry
+        """
+
+        entrys = Re_Entry_Dict_new()
+        with open(str(rfilen), 'r', encoding='utf-8') as rfile:
+            csvr = csv.reader(rfile, delimiter=field_delimiter)
+            for row in csvr:
+                try:
+                    log.debug('File Line (%s:%s):%s',
+                              rfilen, csvr.line_num, row)
+                    if not row:  # skip empty row
+                        continue
+                    if row[0].startswith(REDIRECT_FILE_IGNORE_LINE):
+                        # skip rows starting with such
+                        continue
+                    val = RedirectsLoader.row_to_entry(row)
+                    entrys[Re_From_to_Re_EntryKey(val.from_)] = val
+                except Exception:
+                    log.exception('Error processing row %d of file %s',
+                                  csvr.line_num, rfilen)
+        return entrys
+
+    @staticmethod
+    def load_redirects_file_tsv(rfilen: pathlib.Path) \
+            -> typing.Optional[Re_Entry_Dict]:
+        """
+        Streaming loader for files using the default field delimiter.
+        Reads LOAD_BLOCK_SIZE characters at a time and splits lines and fields
+        with str.split.
+
+        :param rfilen: file path to process for Re_Entry
+        :return: Re_Entry_Dict of file line items converted to Re_Entry,
+                 or None if the file has quoted fields which only csv.reader
+                 can parse
+        """
+
+        entrys = Re_Entry_Dict_new()
+        errors = []  # type: typing.List[typing.Tuple[int, str]]
+        vals = []  # type: typing.List[Re_Entry]
+        line_num = 0
+        rest = ''
+        # universal newlines, same as the csv.reader path
+        with open(str(rfilen), 'r', encoding='utf-8') as rfile:
+            while True:
+                block = rfile.read(LOAD_BLOCK_SIZE)
+                if '"' in block:
+                    return None
+                if not block:
+                    break
+                lines = (rest + block).split('\n')
+                rest = lines.pop()  # partial last line of this block
+                line_num = RedirectsLoader.tsv_lines_to_entrys(
+                    lines, line_num, vals, errors)
+                for val in vals:
+                    entrys[Re_From_to_Re_EntryKey(val.from_)] = val
+                vals.clear()
+        if rest:
+            RedirectsLoader.tsv_lines_to_entrys([rest], line_num, vals, errors)
+            for val in vals:
+                entrys[Re_From_to_Re_EntryKey(val.from_)] = val
+        RedirectsLoader.log_row_errors(rfilen, errors)
+        return entrys
+
+    @staticmethod
+    def load_redirects_file(rfilen: pathlib.Path,
+                            field_delimiter: Re_Field_Delimiter) \
+            -> Re_Entry_Dict:
+        """
+        :param rfilen: file path to process for Re_Entry
+        :param field_delimiter: field delimiter within rfilen
+        :return: Re_Entry_Dict of file line items converted to Re_Entry
+        """
+        if field_delimiter == FIELD_DELIMITER_DEFAULT:
+            entrys = RedirectsLoader.load_redirects_file_tsv(rfilen)
+            if entrys is not None:
+                return entrys
+            log.debug('File %s has quoted fields, using csv.reader', rfilen)
+        return RedirectsLoader.load_redirects_file_csv(rfilen, field_delimiter)
+
+    @staticmethod
+    def file_chunks(rfilen: pathlib.Path, chunks: int) \
+            -> typing.List[typing.Tuple[int, int]]:
+        """
+        Split a redirects file into about `chunks` byte ranges that start and
+        end at line boundaries.
+
+        :return: list of (start, end) byte offsets, empty list if the file is
+                 too small to be worth splitting
+        """
+        size = rfilen.stat().st_size
+        if size < LOAD_WORKERS_FILE_SIZE_MIN or chunks < 2:
+            return []
+        chunk_size = max(size // chunks, LOAD_WORKERS_CHUNK_SIZE_MIN)
+        offsets = [0]
+        with open(str(rfilen), 'rb') as rfile:
+            pos = chunk_size
+            while pos < size:
+                rfile.seek(pos)
+                # move forward to the start of the next line
+                rfile.readline()
+                pos = rfile.tell()
+                if pos >= size:
+                    break
+                offsets.append(pos)
+                pos += chunk_size
+        offsets.append(size)
+        return list(zip(offsets[:-1], offsets[1:]))
+
+    @staticmethod
+    def load_redirects_file_chunk(rfilen: str,
+                                  start: int,
+                                  end: int,
+                                  field_delimiter: Re_Field_Delimiter) \
+            -> typing.Tuple[typing.List[Re_Entry],
+                            typing.List[typing.Tuple[int, str]],
+                            int,
+                            bool]:
+        """
+        Worker process entry point for --load-workers.
+        Parse byte range `start` to `end` of a redirects file.
+
+        Returns a tuple of
+            list of Re_Entry in line order,
+            list of (line number, error message) for bad rows,
+            count of lines in this chunk,
+            True if a quote character was found (quoted fields may span lines
+            so the chunk boundaries may be wrong and the caller must use
+            `load_redirects_file` instead)
+
+        Line numbers are relative to the start of the chunk.
+        """
+        with open(rfilen, 'rb') as rfile:
+            rfile.seek(start)
+            data = rfile.read(end - start)
+        # XXX: chunks start and end on b'\n' which is never part of a
+        #      multi-byte UTF-8 sequence
+        text = data.decode('utf-8')
+        del data
+        if '"' in text:
+            return [], [], 0, True
+        entrys = []  # type: typing.List[Re_Entry]
+        errors = []  # type: typing.List[typing.Tuple[int, str]]
+        if field_delimiter == FIELD_DELIMITER_DEFAULT:
+            # universal newlines, like `open` in load_redirects_file
+            if '\r' in text:
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            lines = text.split('\n')
+            if not lines[-1]:
+                lines.pop()
+            line_count = RedirectsLoader.tsv_lines_to_entrys(
+                lines, 0, entrys, errors)
+            return entrys, errors, line_count, False
+        csvr = csv.reader(io.StringIO(text, newline=None),
+                          delimiter=field_delimiter)
+        for row in csvr:
+            try:
+                if not row:  # skip empty row
+                    continue
+                if row[0].startswith(REDIRECT_FILE_IGNORE_LINE):
+                    continue
+                entrys.append(RedirectsLoader.row_to_entry(row))
+            except Exception as ex:
+                errors.append((csvr.line_num, repr(ex)))
+        return entrys, errors, csvr.line_num, False
+
     @staticmethod
     def load_redirects_files(redirects_files: Path_List,
-                             field_delimiter: Re_Field_Delimiter) \
+                             field_delimiter: Re_Field_Delimiter,
+                             load_workers: int = 0) \
             -> Re_Entry_Dict:
         """
         :param redirects_files: list of file paths to process for Re_Entry
         :param field_delimiter: passed to csv.reader keyword delimiter
+        :param load_workers: count of worker processes that parse large files
+                             in chunks. 0 parses all files in this process.
         :return: Re_Entry_Dict of file line items converted to Re_Entry
         """
 
         entrys = Re_Entry_Dict_new()
 
-        # create Entry for each line in passed redirects_files
-        for rfilen in redirects_files:
-            try:
+        if load_workers < 1:
+            # create Entry for each line in passed redirects_files
+            for rfilen in redirects_files:
+                try:
+                    log.info('Process File (%s)', rfilen)
+                    entrys.update(
+                        RedirectsLoader.load_redirects_file(rfilen,
+                                                            field_delimiter)
+                    )
+                except Exception:
+                    log.exception('Error processing file %s', rfilen)
+            return entrys
+
+        kwargs = dict()  # type: typing.Dict[str, typing.Any]
+        if sys.version_info >= (3, 7):
+            kwargs['mp_context'] = process_context()
+        elif threading.active_count() > 1:
+            # without mp_context the workers are forked, not safe while
+            # server threads run
+            log.info('Loading files in this process, load workers need'
+                     ' Python 3.7 while the server runs')
+            return RedirectsLoader.load_redirects_files(redirects_files,
+                                                        field_delimiter)
+        try:
+            executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=load_workers, **kwargs
+            )
+        except Exception:
+            log.exception('Failed to start %d load workers, loading files in'
+                          ' this process', load_workers)
+            return RedirectsLoader.load_redirects_files(redirects_files,
+                                                        field_delimiter)
+
+        with executor:
+            # submit the chunks of all files before collecting any results so
+            # all files are parsed concurrently
+            submitted = []  # type: typing.List[typing.Tuple[pathlib.Path, typing.List[concurrent.futures.Future]]]
+            for rfilen in redirects_files:
+                futures_ = []  # type: typing.List[concurrent.futures.Future]
+                try:
+                    for start, end in RedirectsLoader.file_chunks(
+                            rfilen, load_workers * LOAD_WORKERS_CHUNKS_PER_WORKER):
+                        futures_.append(executor.submit(
+                            RedirectsLoader.load_redirects_file_chunk,
+                            str(rfilen), start, end, field_delimiter
+                        ))
+                except Exception:
+                    log.exception('Error splitting file %s', rfilen)
+                submitted.append((rfilen, futures_))
+
+            # merge in file order then line order so the last entry wins
+            # just as it would in the serial load
+            for rfilen, futures_ in submitted:
                 log.info('Process File (%s)', rfilen)
-                with open(str(rfilen), 'r', encoding='utf-8') as rfile:
-                    csvr = csv.reader(rfile, delimiter=field_delimiter)
-                    for row in csvr:
-                        try:
-                            log.debug('File Line (%s:%s):%s',
-                                      rfilen, csvr.line_num, row)
-                            if not row:  # skip empty row
-                                continue
-                            if row[0].startswith(REDIRECT_FILE_IGNORE_LINE):
-                                # skip rows starting with such
-                                continue
-                            from_ = Re_From(row[0])
-                            to_ = Re_To(row[1])
-                            user = Re_User(row[2])
-                            date = row[3]
-                            # ignore any remaining fields in row
-                            dt = fromisoformat(date)
-                            key = Re_From_to_Re_EntryKey(from_)
-                            typ = Re_EntryType.getEntryType_From(from_)
-                            val = Re_Entry(
-                                from_,
-                                to_,
-                                user,
-                                Re_Date(dt),
-                                etype=typ,
-                            )
-                            entrys[key] = val
-                        except Exception:
-                            log.exception('Error processing row %d of file %s',
-                                          csvr.line_num, rfilen)
-            except Exception:
-                log.exception('Error processing file %s', rfilen)
+                try:
+                    results = [future.result() for future in futures_]
+                except Exception:
+                    log.exception('Error in load worker for file %s, loading'
+                                  ' file in this process', rfilen)
+                    results = []
+                try:
+                    if not results or any(result[3] for result in results):
+                        if results:
+                            log.debug('File %s has quoted fields, loading'
+                                      ' file in this process', rfilen)
+                        entrys.update(
+                            RedirectsLoader.load_redirects_file(
+                                rfilen, field_delimiter)
+                        )
+                        continue
+                    line_offset = 0
+                    errors_file = []  # type: typing.List[typing.Tuple[int, str]]
+                    for entrys_chunk, errors, line_count, _ in results:
+                        for line_num, error in errors:
+                            errors_file.append((line_offset + line_num, error))
+                        for val in entrys_chunk:
+                            entrys[Re_From_to_Re_EntryKey(val.from_)] = val
+                        line_offset += line_count
+                    RedirectsLoader.log_row_errors(rfilen, errors_file)
+                    log.debug('File %s loaded in %d chunks',
+                              rfilen, len(results))
+                except Exception:
+                    log.exception('Error processing file %s', rfilen)
 
         return entrys
 
@@ -1362,11 +3270,7 @@ class RedirectsLoader(object):
     def clean_redirects(entrys: Re_Entry_Dict) -> Re_Entry_Dict:
         """remove entries with To paths that are reserved or cannot encode"""
 
-        # TODO: process re_entry for circular loops of redirects, either
-        #       break those loops or log.warning
-        #       e.g. given redirects '/a' → '/b' and '/b' → '/a',
-        #       the browser will (in theory) redirect forever.
-        #       (browsers tested force stopped the redirect loop; Edge, Chrome).
+        # XXX: circular loops of redirects are logged by `flatten_redirects`
 
         for path in REDIRECT_PATHS_NOT_ALLOWED:
             key = Re_From_to_Re_EntryKey(Re_From(path))
@@ -1400,44 +3304,587 @@ class RedirectsLoader(object):
 
         return entrys
 
+    @staticmethod
+    def is_self_target(to_pr: ParseResult, self_hosts: Iter_str) -> bool:
+        """
+        Does the redirect "to URL" point back at this server?
+        A relative "to URL" like '/b' always does. Otherwise the host must be
+        one of `self_hosts`, either as "host" (any default port) or as
+        "host:port".
+        """
+        netloc = to_pr.netloc.lower()
+        if not netloc:
+            return not to_pr.scheme and to_pr.path.startswith('/')
+        if to_pr.scheme not in ('', 'http', 'https'):
+            return False
+        if netloc in self_hosts:
+            return True
+        try:
+            port = to_pr.port
+        except ValueError:
+            return False
+        return port in (None, 80, 443) and to_pr.hostname in self_hosts
+
+    @staticmethod
+    def flatten_redirects(entrys: Re_Entry_Dict,
+                          self_hosts: Iter_str,
+                          flatten: bool) -> Re_Entry_Dict:
+        """
+        Find redirect entries that redirect back to this server, i.e. chains
+        like '/a' → 'http://goto/b' → 'http://goto/c' → external URL.
+        Log redirect loops like '/a' → '/b' → '/a'.
+
+        If `flatten` then rewrite chained entries to the final "to URL" so the
+        client gets the final Location in one hop. An entry is only
+        rewritten when the result is the same for every request:
+        - the entry "to URL" has no params, query, fragment or Template
+          syntax (the client request parts pass through unchanged)
+        - the target path has exactly one entry, without a Required Request
+          Modifier (it matches every request for that path)
+        - the target entry "to URL" does not use ${path} (which would be
+          the target path rather than the client request path)
+        - the target entry has the same status code and max-age (a
+          permanent, long cached hop must not cache a target that is meant
+          to stay changeable)
+        Template syntax and Required Request Modifiers of the entries are
+        kept.
+
+        :param entrys: cleaned redirect entries
+        :param self_hosts: lowercase host names of this server
+        :param flatten: rewrite chains
+        :return: Re_Entry_Dict with chains rewritten
+        """
+        self_hosts = frozenset(self_hosts)
+        # the redirect graph, an edge for each entry key reachable from
+        # an entry "to URL"
+        graph = dict()  # type: typing.Dict[Re_EntryKey, typing.List[Re_EntryKey]]
+        for key, entry in entrys.items():
+            if not RedirectsLoader.is_self_target(entry.to_pr, self_hosts):
+                continue
+            path = entry.to_pr.path
+            if RE_URI_KEYWORDS.search(path):
+                continue  # target is unknown until a request is made
+            targets = [
+                key_ for key_ in
+                Re_EntryType.getEntryKeys(typing.cast(Re_From, path))
+                if key_ in entrys
+            ]
+            if targets:
+                graph[key] = targets
+
+        # detect loops with an iterative depth-first search, each entry and
+        # each edge is visited once
+        WHITE, GRAY, BLACK = 0, 1, 2
+        color = dict.fromkeys(graph.keys(), WHITE)
+        loops = set()  # type: typing.Set[Re_EntryKey]
+        for root in graph.keys():
+            if color[root] != WHITE:
+                continue
+            color[root] = GRAY
+            stack = [(root, iter(graph[root]))]
+            while stack:
+                node, edges = stack[-1]
+                for next_ in edges:
+                    next_color = color.get(next_, BLACK)
+                    if next_color == WHITE:
+                        color[next_] = GRAY
+                        stack.append((next_, iter(graph[next_])))
+                        break
+                    elif next_color == GRAY:
+                        # back edge, the loop is on the stack
+                        loop = [node_ for node_, _ in stack]
+                        loop = loop[loop.index(next_):] + [next_]
+                        loops.update(loop)
+                        log.warning('Redirect loop: %s',
+                                    ' → '.join(str(k) for k in loop))
+                else:
+                    color[node] = BLACK
+                    stack.pop()
+
+        if not flatten:
+            return entrys
+
+        def next_hop(key_: Re_EntryKey) -> typing.Optional[Re_EntryKey]:
+            """the target entry key if entry `key_` can be composed with it"""
+            entry_ = entrys[key_]
+            targets_ = graph.get(key_)
+            if key_ in loops or not targets_ or len(targets_) != 1 \
+                    or targets_[0] in loops:
+                return None
+            to_pr = entry_.to_pr
+            if to_pr.params or to_pr.query or to_pr.fragment \
+                    or RE_URI_KEYWORDS.search(entry_.to):
+                return None
+            target = entrys[targets_[0]]
+            if target.etype != Re_EntryType._ \
+                    or '${path}' in target.to \
+                    or target.code != entry_.code \
+                    or target.max_age != entry_.max_age:
+                return None
+            return targets_[0]
+
+        final = dict()  # type: typing.Dict[Re_EntryKey, Re_Entry]
+        for key in graph.keys():
+            # follow the chain to the last entry, remember the chain
+            chain = []  # type: typing.List[Re_EntryKey]
+            node = key  # type: typing.Optional[Re_EntryKey]
+            last = key
+            while node is not None and node not in final and node not in chain:
+                chain.append(node)
+                last = node
+                node = next_hop(node)
+            last_entry = final[node] if node in final else entrys[last]
+            for key_ in chain:
+                final[key_] = last_entry
+
+        flattened = 0
+        for key, last_entry in final.items():
+            entry = entrys[key]
+            if last_entry.from_ == entry.from_:
+                continue
+            log.debug('Flatten redirect chain (%s) → (%s) to (%s) → (%s)',
+                      entry.from_, entry.to, entry.from_, last_entry.to)
+            entrys[key] = entry._replace(to=last_entry.to,
+                                         to_pr=last_entry.to_pr)
+            flattened += 1
+        if flattened:
+            log.info('Flattened %d redirect chains', flattened)
+
+        return entrys
+
     @staticmethod
     def load_redirects(from_to: FromTo_List,
                        redirects_files: Path_List,
-                       field_delimiter: Re_Field_Delimiter) \
+                       field_delimiter: Re_Field_Delimiter,
+                       load_workers: int = 0,
+                       self_hosts: Iter_str = (),
+                       flatten_chains: bool = False) \
             -> Re_Entry_Dict:
         """
         load (or reload) all redirect information, process into Re_EntryList
-        Remove bad entries.
+        Remove bad entries. Log redirect loops.
 
         :param from_to: list --from-to passed redirects for Re_Entry
         :param redirects_files: list of files to process for Re_Entry
         :param field_delimiter: field delimiter within passed redirects_files
+        :param load_workers: count of worker processes for large files
+        :param self_hosts: host names of this server, in addition to HOSTNAME
+        :param flatten_chains: rewrite chains of redirects through this server
         :return: Re_Entry_Dict: all processed information
         """
         entrys_fromto = RedirectsLoader.load_redirects_fromto(from_to)
         entrys_files = RedirectsLoader.load_redirects_files(redirects_files,
-                                                            field_delimiter)
+                                                            field_delimiter,
+                                                            load_workers)
         # --from-to passed entries override same entries from files
         entrys_files.update(entrys_fromto)
 
         entrys_files = RedirectsLoader.clean_redirects(entrys_files)
+        entrys_files = RedirectsLoader.flatten_redirects(
+            entrys_files,
+            [HOSTNAME.lower()] + [host.lower() for host in self_hosts],
+            flatten_chains
+        )
 
         return entrys_files
 
+    @staticmethod
+    def entrys_to_blob(entrys: Re_Entry_Dict) -> bytes:
+        """
+        Serialise `entrys` compactly for `entrys_from_blob`. Each entry is a
+        tuple of plain values; pickling the Re_Entry, ParseResult and enum
+        instances directly is several times larger and slower to load.
+        """
+        rows = [
+            (key, entry.from_, entry.to, entry.user, entry.date,
+             tuple(entry.from_pr), tuple(entry.to_pr), entry.etype.value,
+             None if entry.code is None else int(entry.code), entry.max_age)
+            for key, entry in entrys.items()
+        ]
+        return pickle.dumps(rows, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def entrys_from_blob(blob: bytes) -> Re_Entry_Dict:
+        """
+        Inverse of `entrys_to_blob`. The entries were checked when first
+        created so Re_Entry.__new__ is bypassed.
+        """
+        etypes = {etype.value: etype for etype in Re_EntryType}
+        new = tuple.__new__
+        entrys = Re_Entry_Dict_new()
+        for key, from_, to, user, date, from_pr, to_pr, etype, code, max_age \
+                in pickle.loads(blob):
+            entrys[key] = new(Re_Entry, (
+                from_, to, user, date,
+                new(ParseResult, from_pr), new(ParseResult, to_pr),
+                etypes[etype],
+                None if code is None else http.HTTPStatus(code),
+                max_age
+            ))
+        return entrys
+
+    @staticmethod
+    def load_redirects_child(conn,
+                             from_to: FromTo_List,
+                             redirects_files: Path_List,
+                             field_delimiter: Re_Field_Delimiter,
+                             load_workers: int,
+                             self_hosts: Iter_str,
+                             flatten_chains: bool) -> None:
+        """
+        child process entry point of `load_redirects_subprocess`.
+        Send the Re_Entry_Dict as `entrys_to_blob` through pipe connection
+        `conn`.
+        """
+        try:
+            entrys = RedirectsLoader.load_redirects(
+                from_to, redirects_files, field_delimiter, load_workers,
+                self_hosts, flatten_chains
+            )
+            conn.send_bytes(RedirectsLoader.entrys_to_blob(entrys))
+        finally:
+            conn.close()
+
+    @staticmethod
+    def load_redirects_subprocess(from_to: FromTo_List,
+                                  redirects_files: Path_List,
+                                  field_delimiter: Re_Field_Delimiter,
+                                  load_workers: int = 0,
+                                  self_hosts: Iter_str = (),
+                                  flatten_chains: bool = False) \
+            -> Re_Entry_Dict:
+        """
+        `load_redirects` in a child process. The child sends back the
+        processed Re_Entry_Dict as one compact blob through a pipe. This
+        process only waits on the pipe then rebuilds the entries, so threads
+        handling requests are not stalled by parsing holding the GIL.
+        Falls back to `load_redirects` in this process if the child fails or
+        sends nothing within RELOAD_SUBPROCESS_TIMEOUT seconds.
+
+        Parameters are those of `load_redirects`.
+        """
+        try:
+            # not forked from the multi-threaded server, see process_context
+            context = process_context()
+            recv_conn, send_conn = context.Pipe(duplex=False)
+            process = context.Process(
+                target=RedirectsLoader.load_redirects_child,
+                args=(send_conn, from_to, redirects_files, field_delimiter,
+                      load_workers, list(self_hosts), flatten_chains),
+                name='%s-reload' % PROGRAM_NAME
+            )
+            process.start()
+            send_conn.close()
+            try:
+                if not recv_conn.poll(RELOAD_SUBPROCESS_TIMEOUT):
+                    raise TimeoutError(
+                        'reload process %s sent nothing within %s seconds'
+                        % (process.pid, RELOAD_SUBPROCESS_TIMEOUT))
+                blob = recv_conn.recv_bytes()
+            finally:
+                recv_conn.close()
+                process.join(RELOAD_SUBPROCESS_EXIT_TIMEOUT)
+                if process.is_alive():
+                    log.warning('Terminating reload process %s', process.pid)
+                    process.terminate()
+                    process.join(RELOAD_SUBPROCESS_EXIT_TIMEOUT)
+            entrys = RedirectsLoader.entrys_from_blob(blob)
+            log.debug('Reload process %s sent %d entries in %d bytes',
+                      process.pid, len(entrys), len(blob))
+            return entrys
+        except Exception:
+            log.exception('Failed to load redirects in a child process,'
+                          ' loading in this process')
+        return RedirectsLoader.load_redirects(
+            from_to, redirects_files, field_delimiter, load_workers,
+            self_hosts, flatten_chains
+        )
+
 
 class RedirectServer(socketserver.ThreadingTCPServer):
     """
     Custom Server to allow reloading redirects while serve_forever.
     """
     field_delimiter = FIELD_DELIMITER_DEFAULT
+    load_workers = 0
+    self_hosts = []  # type: typing.List[str]
+    flatten_chains = False
+    # reload in a child process, see RedirectsLoader.load_redirects_subprocess
+    reload_subprocess = False
+    # seconds between systemd WATCHDOG=1 pings, None is no pings
+    watchdog_interval = None  # type: typing.Optional[float]
+    # trust the "X-Forwarded-For" header of Unix socket requests
+    unix_trust = False
+    # options of listening sockets bound by this process
+    socket_options = SOCKET_OPTIONS_DEFAULT  # type: Socket_Options
+    # TLS certificate chain and private key files, None is no TLS
+    tls_cert = None  # type: str_None
+    tls_key = None  # type: str_None
+    # per-client rate limiter, None is no limit
+    rate_limiter = None  # type: typing.Optional[RateLimiter]
+    # proxies trusted to pass the client address in "X-Forwarded-For"
+    trusted_proxies = []  # type: typing.List[IP_Network]
+    # requests handled at once, more are shed. 0 is no limit
+    max_in_flight = 0
+    # shed requests are closed without a response instead of a 503
+    shed_drop = False
+    shed_retry_after = SHED_RETRY_AFTER_DEFAULT
+    # request paths (and paths under them) never shed
+    shed_exempt_paths = []  # type: typing.List[str]
 
     def __init__(self, *args):
         """adjust parameters of the Parent class"""
         # self.allow_reuse_address = True
+        # writing to _wakeup_w wakes serve_forever. Created first as a failed
+        # bind calls server_close
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+        self._shutdown = False
+        self._is_shut_down = threading.Event()
+        # stopped by a hot restart
+        self.restarted = False
+        # time.monotonic of the next WATCHDOG=1 ping
+        self._watchdog_next = 0.0
+        # listening sockets besides `socket`, see `add_listener`
+        self.listeners = []  # type: typing.List[socket.socket]
+        # Unix domain socket files bound by this process, removed at close
+        self._unlink = []  # type: typing.List[str]
+        # TLS of TCP connections, see `tls_load`
+        self.tls_context = None  # type: typing.Optional[ssl.SSLContext]
+        # read by server_activate within super().__init__
+        self.request_queue_size = self.socket_options.backlog
         super().__init__(*args)
         self.block_on_close = False
-        self.request_queue_size = SOCKET_LISTEN_BACKLOG
         self.timeout = 5
+        # count of requests being handled
+        self.in_flight = 0
+        # count of shed_triage threads
+        self._triage = 0
+        self._in_flight_lock = threading.Lock()
+        # notified at the end of each request, see `drain`
+        self._in_flight_done = threading.Condition(self._in_flight_lock)
+        # connections of requests being handled
+        self._connections = set()  # type: typing.Set[socket.socket]
+        # connections with a request read and not yet responded, a subset of
+        # _connections. Set by RedirectHandler.handle_one_request
+        self.busy = set()  # type: typing.Set[socket.socket]
+        self._shed_response = bytes(
+            'HTTP/1.0 %d %s\r\n'
+            'Retry-After: %d\r\n'
+            'Content-Length: 0\r\n'
+            'Connection: close\r\n'
+            '\r\n' % (http.HTTPStatus.SERVICE_UNAVAILABLE,
+                       http.HTTPStatus.SERVICE_UNAVAILABLE.phrase,
+                       self.shed_retry_after),
+            'latin-1'
+        )
+
+    @classmethod
+    def from_socket(cls, sock: socket.socket, RequestHandlerClass):
+        """RedirectServer using listening socket `sock`, e.g. inherited"""
+        server_ = cls(sock.getsockname(), RequestHandlerClass, False)
+        server_.socket.close()
+        server_.socket = sock
+        server_.server_address = sock.getsockname()
+        return server_
+
+    @classmethod
+    def unix(cls, path: str, RequestHandlerClass,
+             mode: int = UNIX_SOCKET_MODE_DEFAULT):
+        """
+        RedirectServer listening on Unix domain socket `path` with file
+        permissions `mode`. A stale socket file at `path` is replaced.
+        """
+        server_ = cls.from_socket(
+            listen_socket(UNIX_PREFIX + path, mode, cls.socket_options),
+            RequestHandlerClass
+        )
+        server_._unlink.append(path)
+        return server_
+
+    @classmethod
+    def listen(cls, addresses: typing.Sequence[str], RequestHandlerClass,
+               unix_mode: int = UNIX_SOCKET_MODE_DEFAULT):
+        """
+        RedirectServer listening on each of `addresses`, see `parse_listen`.
+        An IPv6 address is dual-stack only if no IPv4 address has its port.
+        """
+        families = [parse_listen(address) for address in addresses]
+        ports_ipv4 = set(
+            bind_address[1] for family, bind_address in families
+            if family == socket.AF_INET and bind_address[1]
+        )
+        sockets = []  # type: typing.List[socket.socket]
+        try:
+            for address, (family, bind_address) in zip(addresses, families):
+                v6only = (family == socket.AF_INET6
+                          and bind_address[1] in ports_ipv4)
+                sockets.append(listen_socket(address, unix_mode,
+                                             cls.socket_options, v6only))
+        except Exception:
+            for sock in sockets:
+                sock.close()
+            raise
+        server_ = cls.from_socket(sockets[0], RequestHandlerClass)
+        for address, sock in zip(addresses, sockets):
+            if sock is not sockets[0]:
+                server_.add_listener(sock)
+            if address.startswith(UNIX_PREFIX):
+                server_._unlink.append(address[len(UNIX_PREFIX):])
+        return server_
+
+    def server_bind(self):
+        """Override function. Set `socket_options` before binding."""
+        socket_options_apply(self.socket, self.socket_options)
+        super().server_bind()
+
+    def socket_options_effective(self) -> typing.Dict[str, Socket_Values]:
+        """
+        options of each open listening socket, read back from the socket. The
+        backlog is the lesser of `socket_options.backlog` and the system cap.
+        """
+        effective = OrderedDict()  # type: typing.Dict[str, Socket_Values]
+        backlog = self.socket_options.backlog
+        cap = somaxconn()
+        if cap is not None:
+            backlog = min(backlog, cap)
+        for sock in self.listen_sockets():
+            if sock.fileno() == -1:
+                continue
+            values = OrderedDict()  # type: Socket_Values
+            values['backlog'] = backlog
+            values.update(socket_options_read(sock))
+            effective[listen_address_text(sock)] = values
+        return effective
+
+    def tls_load(self) -> None:
+        """
+        Load `tls_cert` and `tls_key` into a new `tls_context`. Connections
+        accepted afterwards use it, those being handled keep the previous.
+
+        :raises OSError: see `tls_context`
+        """
+        self.tls_context = tls_context(self.tls_cert, self.tls_key)
+        log.info('Loaded TLS certificate "%s"', self.tls_cert)
+
+    def tls_stats(self) -> typing.Optional[typing.Dict[str, typing.Any]]:
+        """TLS handshake counts and resumption rate, None without TLS"""
+        if self.tls_context is None:
+            return None
+        handshakes = server_counter[TLS_HANDSHAKE]
+        resumed = server_counter[TLS_RESUMED]
+        return OrderedDict((
+            ('certificate', self.tls_cert),
+            ('handshakes', handshakes),
+            ('resumed', resumed),
+            ('failed', server_counter[TLS_FAILED]),
+            ('resumption_rate', resumed / handshakes if handshakes else 0.0),
+        ))
+
+    def tls_text(self) -> str:
+        """`tls_stats` for people, empty without TLS"""
+        stats = self.tls_stats()
+        if stats is None:
+            return ''
+        return 'TLS certificate "%s", handshakes %d, resumed %d (%.1f%%),' \
+            ' failed %d' % (stats['certificate'], stats['handshakes'],
+                            stats['resumed'], stats['resumption_rate'] * 100,
+                            stats['failed'])
+
+    def finish_request(self, request: socket.socket, client_address) \
+            -> None:
+        """
+        Override function. Over TCP with a `tls_context`, the TLS handshake
+        is done here, in the request thread, so a slow client does not hold
+        up the serve_forever loop.
+        The TLS socket wraps a duplicate of `request` so `request` stays
+        usable by `drain` and `shutdown_request`.
+        """
+        context = self.tls_context
+        if context is None or request.family == AF_UNIX:
+            super().finish_request(request, client_address)
+            return
+        tls = context.wrap_socket(request.dup(), server_side=True,
+                                  do_handshake_on_connect=False)
+        try:
+            handler = self.RequestHandlerClass
+            tls.settimeout(handler.head_timeout or handler.timeout)
+            try:
+                tls.do_handshake()
+            except OSError as err:
+                server_counter[TLS_FAILED] += 1
+                log.debug('%s:%s TLS handshake failed: %s',
+                          client_address[0], client_address[1], err)
+                return
+            server_counter[TLS_HANDSHAKE] += 1
+            if tls.session_reused:
+                server_counter[TLS_RESUMED] += 1
+            tls.settimeout(None)
+            super().finish_request(tls, client_address)
+        finally:
+            tls.close()
+
+    def add_listener(self, sock: socket.socket) -> None:
+        """
+        Also accept connections from listening socket `sock`. Call before
+        serve_forever. All listeners share the one redirects table and
+        counters.
+        """
+        self.listeners.append(sock)
+
+    def listen_sockets(self) -> typing.List[socket.socket]:
+        """all listening sockets, `socket` first"""
+        return [self.socket] + self.listeners
+
+    def listen_addresses(self) -> typing.List[str]:
+        """--listen form of the open listening sockets"""
+        return [listen_address_text(sock) for sock in self.listen_sockets()
+                if sock.fileno() != -1]
+
+    def address_text(self) -> str:
+        """listening addresses for people"""
+        return ', '.join(self.listen_addresses())
+
+    def get_request(self):
+        """
+        Override function. Unix domain socket clients have no address, they
+        are all UNIX_CLIENT.
+        """
+        return self._accept(self.socket)
+
+    @staticmethod
+    def _accept(sock: socket.socket):
+        """accept a connection from listening socket `sock`"""
+        request, client_address = sock.accept()
+        if sock.family == AF_UNIX:
+            client_address = (UNIX_CLIENT, 0)
+        elif client_address[0].startswith('::ffff:') \
+                and '.' in client_address[0]:
+            # IPv4 client of a dual-stack IPv6 listener
+            client_address = (client_address[0][7:],) + client_address[1:]
+        return request, client_address
+
+    def _handle_listener(self, sock: socket.socket) -> None:
+        """
+        Like socketserver.BaseServer._handle_request_noblock for any of the
+        listening sockets.
+        """
+        try:
+            request, client_address = self._accept(sock)
+        except OSError:
+            return
+        if self.verify_request(request, client_address):
+            try:
+                self.process_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+                self.shutdown_request(request)
+            except:  # NOQA
+                self.shutdown_request(request)
+                raise
+        else:
+            self.shutdown_request(request)
 
     def __enter__(self):
         """Python version <= 3.5 does not implement BaseServer.__enter__"""
@@ -1453,92 +3900,656 @@ class RedirectServer(socketserver.ThreadingTCPServer):
         """copy+paste from Python 3.7 socketserver.py class BaseServer"""
         self.server_close()
 
-    def shutdown(self):
-        """helper to allow others to know when shutdown was called"""
+    def shed_exempt(self, request: socket.socket) -> bool:
+        """
+        Is the request for a path in `shed_exempt_paths`?
+        Peeks at the request line, waiting at most SHED_PEEK_TIMEOUT seconds
+        for it to arrive.
+        """
+        timeout = request.gettimeout()
+        deadline = time.monotonic() + SHED_PEEK_TIMEOUT
+        data = b''
+        try:
+            while time.monotonic() < deadline:
+                request.settimeout(max(0.001, deadline - time.monotonic()))
+                data = request.recv(SHED_PEEK_SIZE, socket.MSG_PEEK)
+                if not data or b'\n' in data or data.count(b' ') >= 2 \
+                        or len(data) >= SHED_PEEK_SIZE:
+                    break
+                time.sleep(0.005)  # wait for more of the request line
+        except OSError:
+            return False
+        finally:
+            try:
+                request.settimeout(timeout)
+            except OSError:
+                pass
+        parts = data.split(b' ', 2)
+        if len(parts) < 3:
+            return False
+        path = parts[1].split(b'?', 1)[0].decode('latin-1')
+        for path_ in self.shed_exempt_paths:
+            if path == path_ or path.startswith(path_.rstrip('/') + '/'):
+                return True
+        return False
+
+    def shed_triage(self, request: socket.socket, client_address) -> None:
+        """
+        Thread entry point. Handle a request over the `max_in_flight` limit
+        if it is exempt, otherwise shed it.
+        """
+        try:
+            exempt = self.shed_exempt(request)
+        finally:
+            with self._in_flight_lock:
+                self._triage -= 1
+        if not exempt:
+            self.shed_request(request)
+            return
+        with self._in_flight_lock:
+            self.in_flight += 1
+        self.process_request_thread(request, client_address)
+
+    def shed_request(self, request: socket.socket) -> None:
+        """
+        Respond 503 Service Unavailable from pre-encoded bytes (or respond
+        nothing if `shed_drop`) and close. Nothing is logged per request,
+        shedding must stay cheap.
+        """
+        try:
+            # a TLS client can not read a plain response
+            if self.shed_drop or (self.tls_context is not None
+                                  and request.family != AF_UNIX):
+                server_counter['shed (dropped)'] += 1
+            else:
+                server_counter['shed (503)'] += 1
+                request.send(self._shed_response)
+                # read what has arrived so closing does not reset the
+                # connection before the client reads the response
+                socket_drain(request, SHED_PEEK_SIZE * 64)
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+    def process_request(self, request: socket.socket, client_address) \
+            -> None:
+        """
+        Override function.
+
+        Start a thread for the request, or shed the request when
+        `max_in_flight` requests are already being handled.
+        """
+        with self._in_flight_lock:
+            admit = not self.max_in_flight \
+                or self.in_flight < self.max_in_flight
+            if admit:
+                self.in_flight += 1
+        if not admit:
+            # exempt requests are found by a few triage threads, when those
+            # are busy the request is shed
+            if self.shed_exempt_paths:
+                with self._in_flight_lock:
+                    triage = self._triage < SHED_TRIAGE_MAX
+                    if triage:
+                        self._triage += 1
+                if triage:
+                    try:
+                        threading.Thread(target=self.shed_triage,
+                                         args=(request, client_address),
+                                         daemon=self.daemon_threads).start()
+                        return
+                    except Exception:
+                        with self._in_flight_lock:
+                            self._triage -= 1
+            self.shed_request(request)
+            return
+        try:
+            super().process_request(request, client_address)
+        except Exception:
+            with self._in_flight_lock:
+                self.in_flight -= 1
+            raise
+
+    def process_request_thread(self, request: socket.socket, client_address) \
+            -> None:
+        """Override function. Track the connection, count its end."""
+        with self._in_flight_lock:
+            self._connections.add(request)
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            with self._in_flight_lock:
+                self.in_flight -= 1
+                self._connections.discard(request)
+                self._in_flight_done.notify_all()
+
+    def drain(self, timeout: float) -> typing.Tuple[int, int]:
+        """
+        Call after serve_forever returns. Stop accepting by closing the
+        listening sockets. Wait up to `timeout` seconds for in-flight requests
+        to finish, then abort those remaining. Every response closes its
+        connection so there are no idle keep-alive connections to end.
+
+        :return: count of requests drained, count of requests aborted
+        """
+        start = time.monotonic()
+        for sock in self.listen_sockets():
+            sock.close()
+        with self._in_flight_lock:
+            requests = set(self.busy)
+        deadline = start + timeout
+        with self._in_flight_done:
+            while self.in_flight > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._in_flight_done.wait(remaining)
+            aborted = len(requests & self.busy)
+            connections = list(self._connections)
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        drained = len(requests) - aborted
+        log.info('Drained %d requests, aborted %d requests, in %.3f seconds',
+                 drained, aborted, time.monotonic() - start)
+        return drained, aborted
+
+    def wakeup(self) -> None:
+        """
+        Wake serve_forever at once. Safe to call from a signal handler or
+        another thread.
+        """
+        try:
+            self._wakeup_w.send(b'\0')
+        except OSError:
+            # buffer is full so a wakeup is already pending, or closed
+            pass
+
+    def serve_forever(self, poll_interval: float = POLL_INTERVAL) -> None:
+        """
+        Override function. Like socketserver.BaseServer.serve_forever but
+        the loop also wakes when `wakeup` is called, so `poll_interval` may be
+        long. The wait is shortened for a pending reload held back by the
+        reload interval.
+
+        XXX: BaseServer keeps its shutdown flags in name-mangled private
+             attributes, so this class keeps its own and overrides shutdown.
+        """
+        self._is_shut_down.clear()
+        try:
+            if hasattr(selectors, 'PollSelector'):
+                selector = selectors.PollSelector()  # type: selectors.BaseSelector
+            else:
+                selector = selectors.SelectSelector()
+            with selector:
+                for sock in self.listen_sockets():
+                    selector.register(sock, selectors.EVENT_READ)
+                selector.register(self._wakeup_r, selectors.EVENT_READ)
+                while not self._shutdown:
+                    timeout = reload_control.due_in()
+                    if timeout is None or timeout > poll_interval:
+                        timeout = poll_interval
+                    if self.watchdog_interval:
+                        timeout = max(0.0, min(
+                            timeout, self._watchdog_next - time.monotonic()))
+                    for key, _ in selector.select(timeout):
+                        if key.fileobj is self._wakeup_r:
+                            self._wakeup_drain()
+                        elif not self._shutdown:
+                            self._handle_listener(key.fileobj)
+                    if self._shutdown:
+                        break
+                    self.service_actions()
+        finally:
+            self._shutdown = False
+            self._is_shut_down.set()
+
+    def _wakeup_drain(self) -> None:
+        """read all pending wakeup bytes"""
+        try:
+            while self._wakeup_r.recv(4096):
+                pass
+        except OSError:
+            pass
+
+    def hot_restart(self, timeout: float = RESTART_TIMEOUT) -> bool:
+        """
+        Start a new process of this program with the same options, passed
+        the listening sockets. Once the new process writes that it is ready,
+        stop serving; `main` then drains. Both processes accept from the same
+        listening sockets in the meantime so no connection is refused.
+
+        :return: True if the new process became ready
+        """
+        fds = [sock.fileno() for sock in self.listen_sockets()]
+        ready_r, ready_w = os.pipe()
+        env = dict(os.environ)
+        env[ENV_LISTEN_FD] = ','.join(str(fd) for fd in fds)
+        env[ENV_READY_FD] = str(ready_w)
+        try:
+            try:
+                process = subprocess.Popen([sys.executable] + sys_args,
+                                           env=env,
+                                           pass_fds=fds + [ready_w])
+            finally:
+                os.close(ready_w)
+            log.info('Hot restart: started process %d', process.pid)
+            ready = b''
+            # the pipe closes without data if the new process exits
+            if select.select([ready_r], [], [], timeout)[0]:
+                ready = os.read(ready_r, 1)
+        except Exception:
+            log.exception('Hot restart failed')
+            return False
+        finally:
+            os.close(ready_r)
+        if not ready:
+            log.error('Hot restart: process %d did not become ready within'
+                      ' %s seconds, continue serving', process.pid, timeout)
+            if process.poll() is None:
+                process.terminate()
+            return False
+        log.info('Hot restart: process %d is ready, stop serving',
+                 process.pid)
+        self.restarted = True
+        self.stop()
+        return True
+
+    def stop(self) -> None:
+        """
+        Stop the serve_forever loop without waiting. Safe to call from a
+        signal handler.
+        """
         self._shutdown = True
-        return super(socketserver.ThreadingTCPServer, self).shutdown()
+        self.wakeup()
+
+    def shutdown(self):
+        """
+        Override function. Stop the serve_forever loop and wait until it has
+        stopped. Must be called from another thread.
+        """
+        self.stop()
+        self._is_shut_down.wait()
+
+    def server_close(self):
+        """
+        Override function. Also close the other listening sockets and the
+        wakeup sockets. Remove Unix socket files bound by this process, unless
+        a hot restart passed them on.
+        """
+        super().server_close()
+        for sock in self.listeners:
+            sock.close()
+        self._wakeup_r.close()
+        self._wakeup_w.close()
+        if self.restarted:
+            self._unlink.clear()
+        while self._unlink:
+            try:
+                os.unlink(self._unlink.pop())
+            except OSError:
+                pass
 
     def service_actions(self):
         """
         Override function.
 
         Polled during socketserver.TCPServer.serve_forever.
-        Checks global reload and create new handler (which will re-read
-        the Redirect_Files_List)
-
-        TODO: avoid use of globals, somehow pass instance variables to this
-              function or class instance
+        Checks global reload and starts a thread for `reload` so the
+        serve_forever loop keeps accepting requests during the reload.
         """
 
         super(RedirectServer, self).service_actions()
 
-        global reload_do
-        if not reload_do:
+        if self.watchdog_interval:
+            now = time.monotonic()
+            if now >= self._watchdog_next:
+                sd_notify('WATCHDOG=1')
+                self._watchdog_next = now + self.watchdog_interval
+
+        if not reload_control.start():
             return
-        reload_do = False
+        threading.Thread(name='reload', target=self.reload,
+                         daemon=True).start()
+
+    def reload(self) -> None:
+        """
+        Create new handler (which will re-read the Redirect_Files_List) and
+        swap it in.
+
+        TODO: avoid use of globals, somehow pass instance variables to this
+              function or class instance
+        """
+        sd_notify('RELOADING=1')
+        if self.tls_cert:
+            try:
+                self.tls_load()
+            except OSError as err:
+                log.error('TLS certificate reload failed, keeping the current'
+                          ' certificate: %s', err)
+        try:
+            self._reload()
+        except Exception:
+            log.exception('Reload failed, keeping the current redirects')
+        finally:
+            reload_control.done()
+            sd_notify('READY=1\nSTATUS=%s' % self.status_text())
+
+    def status_text(self) -> str:
+        """one line of status for systemd STATUS="""
+        handler = self.RequestHandlerClass
+        return 'Serving %d redirects, generation %d' % (
+            len(handler.redirects), handler.generation)
+
+    def _reload(self) -> None:
+        """see `reload`"""
         global Redirect_FromTo_List
         global Redirect_Files_List
-        entrys = RedirectsLoader.load_redirects(
+        if self.reload_subprocess:
+            load_redirects = RedirectsLoader.load_redirects_subprocess
+        else:
+            load_redirects = RedirectsLoader.load_redirects
+        entrys = load_redirects(
             Redirect_FromTo_List,
             Redirect_Files_List,
-            self.field_delimiter
+            self.field_delimiter,
+            self.load_workers,
+            self.self_hosts,
+            self.flatten_chains
         )
         global STATUS_PATH
         global reload_datetime
         global RELOAD_PATH
         global NOTE_ADMIN
+        global server_ready
         reload_datetime = datetime_now()
-        redirect_handler = redirect_handler_factory(entrys,
-                                                    REDIRECT_CODE,
-                                                    STATUS_PATH,
-                                                    RELOAD_PATH,
-                                                    NOTE_ADMIN)
-        pid = os.getpid()
-        log.debug(
-            "reload %s (0x%08x)\n"
-            "new RequestHandlerClass (0x%08x) to replace old (0x%08x)\n"
-            "PID %d",
-            reload_do, id(reload_do),
-            id(redirect_handler), id(self.RequestHandlerClass),
-            pid
-        )
+        # not ready only while the handler and its redirects are swapped,
+        # the old redirects are served while the new ones load
+        server_ready = False
+        try:
+            redirect_handler = redirect_handler_factory(entrys,
+                                                        REDIRECT_CODE,
+                                                        STATUS_PATH,
+                                                        RELOAD_PATH,
+                                                        NOTE_ADMIN)
+            pid = os.getpid()
+            log.debug(
+                "reload generation %d\n"
+                "new RequestHandlerClass (0x%08x) to replace old (0x%08x)\n"
+                "PID %d",
+                redirect_handler.generation,
+                id(redirect_handler), id(self.RequestHandlerClass),
+                pid
+            )
 
-        self.RequestHandlerClass = redirect_handler
+            self.RequestHandlerClass = redirect_handler
+        finally:
+            server_ready = True
 
 
 def reload_signal_handler(signum, _) -> None:
     """
-    Catch signal and set global reload (which is checked elsewhere)
+    Catch signal and request a reload (which is checked elsewhere)
 
     :param signum: signal number (int)
     :param _: Python frame (unused)
     :return: None
     """
-    global reload_do
+    generation = reload_control.request()
     log.debug(
-        'reload_signal_handler: Signal Number %s, reload_do %s (0x%08x)',
-        signum, reload_do, id(reload_do))
-    reload_do = True
-
-
-def process_options() -> typing.Tuple[str,
-                                      int,
-                                      bool,
-                                      Path_None,
-                                      str,
-                                      str,
-                                      Redirect_Code_Value,
-                                      int,
-                                      Re_Field_Delimiter,
-                                      Path_None,
-                                      FromTo_List,
-                                      typing.List[str]]:
-    """Process script command-line options."""
+        'reload_signal_handler: Signal Number %s, covered by generation %d',
+        signum, generation)
 
-    rcd = REDIRECT_CODE_DEFAULT  # abbreviate
-    global sys_args
-    sys_args = copy.copy(sys.argv)  # set once
 
+WSGI_Environ = typing.Dict[str, typing.Any]
+WSGI_Headers = typing.List[typing.Tuple[str, str]]
+
+
+class RedirectApplication(object):
+    """
+    WSGI application of the redirects, for WSGI servers that run several
+    worker processes, e.g. a file "goto_wsgi.py"
+
+        from goto_http_redirect_server.goto_http_redirect_server import \\
+            RedirectApplication
+        application = RedirectApplication.from_args(
+            ['--redirects', '/etc/goto/redirects.csv',
+             '--reload-path', '/reload'])
+
+    served by
+
+        gunicorn --workers 4 goto_wsgi:application
+
+    Redirects are found by RedirectHandler.query_match_finder and the
+    "Location" is made by RedirectHandler.combine_parseresult, the same as
+    RedirectServer. Each worker process loads and reloads its own redirects.
+    The status path responds the JSON document of "STATUS_PATH/status.json".
+    """
+
+    def __init__(self,
+                 from_to: FromTo_List,
+                 redirects_files: Path_List,
+                 status_code: http.HTTPStatus = REDIRECT_CODE_DEFAULT,
+                 status_path: str = STATUS_PAGE_PATH_DEFAULT,
+                 reload_path: str_None = None,
+                 health_path: str_None = None,
+                 ready_path: str_None = None,
+                 field_delimiter: Re_Field_Delimiter = FIELD_DELIMITER_DEFAULT,
+                 load_workers: int = 0,
+                 self_hosts: Iter_str = (),
+                 flatten_chains: bool = False,
+                 not_found_max_age: typing.Optional[int] = None):
+        self.from_to = from_to
+        self.redirects_files = redirects_files
+        self.status_code = status_code
+        self.status_path_pr = to_ParseResult(status_path)
+        self.status_json_path = status_path.rstrip('/') + '/status.json'
+        self.reload_path_pr = to_ParseResult(reload_path) \
+            if reload_path else None
+        self.health_path = health_path
+        self.ready_path = ready_path
+        self.field_delimiter = field_delimiter
+        self.load_workers = load_workers
+        self.self_hosts = list(self_hosts)
+        self.flatten_chains = flatten_chains
+        self.not_found_headers = [] if not_found_max_age is None else \
+            [('Cache-Control', 'max-age=%d' % not_found_max_age)]
+        self.redirects = Re_Entry_Dict_new()
+        self.generation = 0
+        self.reload_datetime = DATETIME_START
+        # reloads run in a thread, at most one loading and one pending
+        self._reload_lock = threading.Lock()
+        self._loading = False
+        self._pending = False
+        self.load()
+
+    @classmethod
+    def from_args(cls, argv: typing.Sequence[str]) -> 'RedirectApplication':
+        """
+        RedirectApplication of program command-line options `argv`. Options
+        of the built-in server (network, TLS, load protection) are ignored.
+        A bad option exits, the same as the program.
+        """
+        parser = options_parser()
+        args = parser.parse_args(list(argv))
+        if not (args.redirects_files or args.from_to):
+            parser.error('No redirect information was passed (--redirects or'
+                         ' --from-to)')
+        return cls(
+            args.from_to or [],
+            [pathlib.Path(file_) for file_ in args.redirects_files or []],
+            status_code=http.HTTPStatus(int(args.redirect_code)),
+            status_path=args.status_path,
+            reload_path=args.reload_path,
+            health_path=args.health_path,
+            ready_path=args.ready_path,
+            field_delimiter=Re_Field_Delimiter(args.field_delimiter),
+            load_workers=max(0, int(args.load_workers)),
+            self_hosts=args.self_hosts,
+            flatten_chains=bool(args.flatten_chains),
+            not_found_max_age=args.not_found_max_age,
+        )
+
+    def load(self) -> None:
+        """load the redirects, then swap them in"""
+        redirects = RedirectsLoader.load_redirects(
+            self.from_to,
+            self.redirects_files,
+            self.field_delimiter,
+            self.load_workers,
+            self.self_hosts,
+            self.flatten_chains
+        )
+        self.redirects = redirects
+        self.generation += 1
+        self.reload_datetime = datetime_now()
+        log.info('Loaded %d redirects, generation %d', len(redirects),
+                 self.generation)
+
+    def reload(self) -> int:
+        """
+        Start reloading in a thread, or merge into the pending reload.
+
+        :return: redirects generation that will include this request
+        """
+        with self._reload_lock:
+            if self._loading:
+                self._pending = True
+                return self.generation + 2
+            self._loading = True
+        threading.Thread(name='reload', target=self._reload,
+                         daemon=True).start()
+        return self.generation + 1
+
+    def _reload(self) -> None:
+        """Thread entry point, see `reload`"""
+        while True:
+            try:
+                self.load()
+            except Exception:
+                log.exception('Reload failed, keeping the current redirects')
+            with self._reload_lock:
+                if not self._pending:
+                    self._loading = False
+                    return
+                self._pending = False
+
+    @staticmethod
+    def request_path(environ: WSGI_Environ) -> str:
+        """
+        The request path and query, as RedirectHandler.path. The WSGI
+        PATH_INFO is unquoted and latin-1 decoded so it is quoted back.
+        """
+        ppq = parse.quote(environ.get('PATH_INFO', '').encode('latin-1'),
+                          safe=WSGI_PATH_SAFE) or '/'
+        query = environ.get('QUERY_STRING')
+        if query:
+            ppq += '?' + query
+        return ppq
+
+    def __call__(self, environ: WSGI_Environ, start_response) \
+            -> typing.List[bytes]:
+        method = environ.get('REQUEST_METHOD', 'GET')
+        if method not in ('GET', 'HEAD'):
+            return self.respond(start_response, method,
+                                http.HTTPStatus.NOT_IMPLEMENTED,
+                                [('Allow', 'GET, HEAD')])
+        ppq = self.request_path(environ)
+        if ppq == self.health_path or ppq == self.ready_path:
+            return self.respond(start_response, method, http.HTTPStatus.OK,
+                                [('Cache-Control', 'no-store')])
+        ppqpr = to_ParseResult(ppq)
+        if RedirectHandler.query_match(self.status_path_pr, ppqpr) \
+                or ppqpr.path == self.status_json_path:
+            return self.respond_status(start_response, method)
+        if self.reload_path_pr is not None \
+                and RedirectHandler.query_match(self.reload_path_pr, ppqpr):
+            current = self.generation
+            generation = self.reload()
+            log.info('reload requested, covered by generation %d',
+                     generation)
+            return self.respond(
+                start_response, method, http.HTTPStatus.ACCEPTED,
+                [('Redirect-Server-Reload-Generation', str(generation))],
+                b'Redirects generation %d will include it'
+                b' (current generation %d)\n' % (generation, current))
+
+        entry = RedirectHandler.query_match_finder(ppq, ppqpr,
+                                                   self.redirects)
+        if entry is None:
+            return self.respond(start_response, method,
+                                http.HTTPStatus.NOT_FOUND,
+                                self.not_found_headers)
+        # merge RedirectEntry URI parts with incoming requested URI parts
+        to = RedirectHandler.combine_parseresult(entry.to_pr, ppqpr)
+        status_code = entry.code or self.status_code
+        user = entry.user
+        try:
+            user.encode('latin-1')
+        except UnicodeEncodeError:
+            user = 'Error Encoding User'
+        headers = [
+            RedirectHandler.Header_Server_Host,
+            RedirectHandler.Header_Server_Version,
+            ('Location', to),
+            ('Redirect-Created-By', user),
+            ('Redirect-Created-Date', entry.date.isoformat()),
+            # WSGI requires a Content-Type, even of an empty body
+            ('Content-Type', 'text/plain; charset=utf-8'),
+            ('Content-Length', '0'),
+        ]  # type: WSGI_Headers
+        if entry.max_age is not None:
+            headers.append(('Cache-Control', 'max-age=%d' % entry.max_age))
+        start_response('%d %s' % (status_code, status_code.phrase), headers)
+        count_key = '(%s) → (%s)' % (ppqpr.path, to)
+        redirect_counter[count_key] += 1
+        global redirect_counter_epoch
+        redirect_counter_epoch += 1
+        return []
+
+    @staticmethod
+    def respond(start_response, method: str, code: http.HTTPStatus,
+                headers: WSGI_Headers, body: typing.Optional[bytes] = None,
+                content_type: str = 'text/plain; charset=utf-8') \
+            -> typing.List[bytes]:
+        """start the response, `body` defaults to the status phrase"""
+        if body is None:
+            body = bytes('%d %s\n' % (code, code.phrase), 'utf-8')
+        start_response('%d %s' % (code, code.phrase),
+                       [('Content-Type', content_type),
+                        ('Content-Length', str(len(body)))] + headers)
+        return [body] if method != 'HEAD' else []
+
+    def respond_status(self, start_response, method: str) \
+            -> typing.List[bytes]:
+        """JSON document of redirect counters and process information"""
+        body = RedirectHandler.json_bytes({
+            'program': PROGRAM_NAME,
+            'version': __version__,
+            'pid': os.getpid(),
+            'host': HOSTNAME,
+            'start_datetime': DATETIME_START,
+            'redirect_code': int(self.status_code),
+            'generation': self.generation,
+            'reload_datetime': self.reload_datetime,
+            'entries': len(self.redirects),
+            'files': [str(file_) for file_ in self.redirects_files],
+            'counter_epoch': redirect_counter_epoch,
+            # copy, redirect_counter may change during json.dumps
+            'counters': dict(redirect_counter),
+            'server_counters': dict(server_counter),
+        })
+        return self.respond(start_response, method, http.HTTPStatus.OK,
+                            [('Cache-Control', 'no-cache')], body,
+                            'application/json; charset=utf-8')
+
+
+def options_parser() -> argparse.ArgumentParser:
+    """the command-line options, see `process_options`"""
+
+    rcd = REDIRECT_CODE_DEFAULT  # abbreviate
     parser = argparse.ArgumentParser(
         description=__doc__ + """\
 
@@ -1560,7 +4571,9 @@ process or HTTP requesting the RELOAD_PATH.
                         ' four fields:'
                         ' "from path", "to URL", "added by user", and'
                         ' "added on datetime"'
-                        ' separated by the FIELD_DELIMITER character.',
+                        ' separated by the FIELD_DELIMITER character.'
+                        ' Optional fifth and sixth fields are "status code"'
+                        ' and "max-age".',
                         default=list())
     pgroup.add_argument('--from-to',
                         nargs=2, metavar=('from', 'to'),
@@ -1578,6 +4591,144 @@ process or HTTP requesting the RELOAD_PATH.
                         default=LISTEN_PORT,
                         help='IP port to listen on.'
                              ' Default is %(default)d .')
+    pgroup.add_argument('--listen', action='append', default=list(),
+                        metavar='ADDRESS',
+                        help='Listen on ADDRESS instead of --ip and --port.'
+                             ' ADDRESS is "HOST:PORT" for IPv4, "[HOST]:PORT"'
+                             ' for IPv6, or "unix:PATH" for a Unix domain'
+                             ' socket. "[::]:PORT" also accepts IPv4 clients'
+                             ' unless an IPv4 ADDRESS has the same PORT.'
+                             ' May be passed multiple times; one process'
+                             ' serves every ADDRESS with the same redirects'
+                             ' and counters.')
+    pgroup.add_argument('--unix-socket', action='store', default=None,
+                        metavar='PATH',
+                        help='Listen on a Unix domain socket at PATH instead'
+                             ' of --ip and --port, e.g. behind a reverse proxy'
+                             ' on the same host.')
+    pgroup.add_argument('--unix-socket-mode', action='store', metavar='MODE',
+                        default='%o' % UNIX_SOCKET_MODE_DEFAULT,
+                        help='Octal file permissions of the --unix-socket'
+                             ' and --listen "unix:PATH" sockets.'
+                             ' Default is %(default)s.')
+    pgroup.add_argument('--unix-socket-trust', action='store_true',
+                        default=False,
+                        help='Use the client address in the "X-Forwarded-For"'
+                             ' header of Unix domain socket requests for'
+                             ' logging and --rate-limit. Otherwise all Unix'
+                             ' domain socket requests are one client.')
+    pgroup.add_argument('--backlog', action='store', type=int,
+                        default=SOCKET_LISTEN_BACKLOG, metavar='N',
+                        help='Listen backlog, connections queued by the'
+                             ' system until accepted. A short queue drops'
+                             ' connections of a burst and the clients retry'
+                             ' a second later. The system may cap it, on'
+                             ' Linux to net.core.somaxconn.'
+                             ' Default is %(default)s.')
+    pgroup.add_argument('--no-tcp-nodelay', action='store_false',
+                        default=True, dest='tcp_nodelay',
+                        help='Do not set TCP_NODELAY. By default responses'
+                             ' are sent without Nagle algorithm delay.')
+    pgroup.add_argument('--tcp-defer-accept', action='store', type=int,
+                        default=TCP_DEFER_ACCEPT_DEFAULT, metavar='SECONDS',
+                        help='Linux TCP_DEFER_ACCEPT. The system waits up to'
+                             ' SECONDS for the request before handing over'
+                             ' the connection, so idle connections use no'
+                             ' thread. 0 is off. Default is %(default)s.')
+    pgroup.add_argument('--tcp-fastopen', action='store', type=int,
+                        default=TCP_FASTOPEN_DEFAULT, metavar='QUEUE',
+                        help='TCP_FASTOPEN queue length, clients may send the'
+                             ' request within the connection handshake. The'
+                             ' system must also allow it, on Linux with'
+                             ' net.ipv4.tcp_fastopen. 0 is off.'
+                             ' Default is %(default)s.')
+    pgroup.add_argument('--reuseport', action='store_true', default=False,
+                        help='Set SO_REUSEPORT so several processes may listen'
+                             ' on the same port; the system spreads'
+                             ' connections among them.')
+    pgroup.add_argument('--tls-cert', action='store', default=None,
+                        metavar='FILE',
+                        help='Serve HTTPS with the PEM certificate chain in'
+                             ' FILE. Applies to all TCP listeners, Unix'
+                             ' domain sockets stay plain. Repeat clients'
+                             ' resume their TLS session. The certificate is'
+                             ' loaded again at each reload.')
+    pgroup.add_argument('--tls-key', action='store', default=None,
+                        metavar='FILE',
+                        help='PEM private key of --tls-cert. Default is the'
+                             ' key within the --tls-cert FILE.')
+
+    pgroup = parser.add_argument_group(title='Load Protection')
+    pgroup.add_argument('--rate-limit', action='store', type=float,
+                        default=0, metavar='RATE',
+                        help='Limit each client IP address to RATE requests'
+                             ' per second. Over-limit requests get a 429'
+                             ' Too Many Requests response.'
+                             ' Default 0 is no limit.')
+    pgroup.add_argument('--rate-burst', action='store', type=int,
+                        default=RATE_BURST_DEFAULT, metavar='BURST',
+                        help='With --rate-limit, each client IP address may'
+                             ' make BURST requests at once.'
+                             ' Default is %(default)s.')
+    pgroup.add_argument('--rate-clients', action='store', type=int,
+                        default=RATE_CLIENTS_DEFAULT, metavar='CLIENTS',
+                        help='With --rate-limit, remember at most CLIENTS'
+                             ' client IP addresses. Default is %(default)s.')
+    pgroup.add_argument('--trust-proxy', dest='trusted_proxies',
+                        action='append', default=list(), metavar='ADDRESS',
+                        help='IP address or network, e.g. "10.0.0.0/8", of a'
+                             ' reverse proxy. The client address in the'
+                             ' "X-Forwarded-For" header of requests from'
+                             ' these addresses is used for --rate-limit.'
+                             ' May be passed multiple times.')
+
+    pgroup.add_argument('--max-in-flight', action='store', type=int,
+                        default=0, metavar='N',
+                        help='Handle at most N requests at once. Requests'
+                             ' over the limit are shed, they get an immediate'
+                             ' 503 Service Unavailable response.'
+                             ' Default 0 is no limit.')
+    pgroup.add_argument('--shed-drop', action='store_true', default=False,
+                        help='With --max-in-flight, close shed requests'
+                             ' without a response.')
+    pgroup.add_argument('--shed-retry-after', action='store', type=int,
+                        default=SHED_RETRY_AFTER_DEFAULT, metavar='SECONDS',
+                        help='With --max-in-flight, the "Retry-After" of'
+                             ' shed requests. Default is %(default)s.')
+    pgroup.add_argument('--shed-exempt-status', action='store_true',
+                        default=False,
+                        help='With --max-in-flight, never shed requests for'
+                             ' the status path, --health-path and'
+                             ' --ready-path. Not with --tls-cert, the'
+                             ' request path of a shed request is read before'
+                             ' a TLS handshake.')
+
+    pgroup.add_argument('--request-timeout', action='store', type=float,
+                        default=REQUEST_TIMEOUT_DEFAULT, metavar='SECONDS',
+                        help='Each read or write of a request connection'
+                             ' may block for SECONDS. 0 is no timeout.'
+                             ' Default is %(default)s.')
+    pgroup.add_argument('--head-timeout', action='store', type=float,
+                        default=HEAD_TIMEOUT_DEFAULT, metavar='SECONDS',
+                        help='The request line and headers must be read'
+                             ' within SECONDS, otherwise respond 408 Request'
+                             ' Timeout. Protects from clients that send'
+                             ' slowly. 0 is no limit.'
+                             ' Default is %(default)s.')
+    pgroup.add_argument('--max-request-line', action='store', type=int,
+                        default=MAX_REQUEST_LINE_DEFAULT, metavar='BYTES',
+                        help='Longest request line, longer gets 414 URI Too'
+                             ' Long. Default is %(default)s.')
+    pgroup.add_argument('--max-header-bytes', action='store', type=int,
+                        default=MAX_HEADER_BYTES_DEFAULT, metavar='BYTES',
+                        help='Most bytes of request headers, more gets 431'
+                             ' Request Header Fields Too Large.'
+                             ' Default is %(default)s.')
+    pgroup.add_argument('--max-headers', action='store', type=int,
+                        default=MAX_HEADERS_DEFAULT, metavar='N',
+                        help='Most request header lines, more gets 431'
+                             ' Request Header Fields Too Large.'
+                             ' Default is %(default)s.')
 
     pgroup = parser.add_argument_group(title='Server Options')
     pgroup.add_argument('--status-path', action='store',
@@ -1585,6 +4736,9 @@ process or HTTP requesting the RELOAD_PATH.
                         help=' The status path'
                              ' dumps information about the process and loaded'
                              ' redirects.'
+                             ' JSON documents are under the status path,'
+                             ' "%(default)s/status.json" and'
+                             ' "%(default)s/redirects.json".'
                              ' Default status page path is "%(default)s".')
     pgroup.add_argument('--reload-path', action='store',
                         default=None, type=str,
@@ -1594,7 +4748,39 @@ process or HTTP requesting the RELOAD_PATH.
                              ' The program will always allow reload by'
                              ' process signal.'
                              ' Default is off.')
+    pgroup.add_argument('--reload-interval', action='store', type=float,
+                        default=RELOAD_INTERVAL_DEFAULT, metavar='SECONDS',
+                        help='Least seconds between the starts of two'
+                             ' reloads. Reload requests, by HTTP or by'
+                             ' signal, made while a reload is pending are'
+                             ' merged into it.'
+                             ' Default is %(default)s.')
     rc_302 = http.HTTPStatus.TEMPORARY_REDIRECT
+    pgroup.add_argument('--health-path', action='store', default=None,
+                        type=str,
+                        help='Health check path, always responds 200 OK.'
+                             ' The response is not logged nor counted.'
+                             ' e.g. --health-path "/health".')
+    pgroup.add_argument('--ready-path', action='store', default=None,
+                        type=str,
+                        help='Readiness check path, responds 200 OK once the'
+                             ' redirects are loaded, 503 Service Unavailable'
+                             ' before the first load and while a reload'
+                             ' swaps in the new redirects.'
+                             ' The response is not logged nor counted.')
+    pgroup.add_argument('--favicon', action='store', type=str, default=None,
+                        metavar='FILE', dest='favicon_file',
+                        help='Icon file served at "%s". Without a file the'
+                             ' response is an empty 204 No Content. Either'
+                             ' response has Cache-Control "%s" so browsers'
+                             ' stop asking.'
+                             % (PATH_FAVICON, MICRO_CACHE_CONTROL))
+    pgroup.add_argument('--robots-txt', action='store', type=str,
+                        default=None, metavar='FILE', dest='robots_file',
+                        help='File served at "%s". Without a file the'
+                             ' response is an empty 204 No Content. A'
+                             ' redirect entry from "%s" takes precedence.'
+                             % (PATH_ROBOTS, PATH_ROBOTS))
     pgroup.add_argument('--redirect-code', action='store',
                         default=int(rcd), type=int,
                         help='Set HTTP Redirect Status Code as an'
@@ -1619,6 +4805,49 @@ process or HTTP requesting the RELOAD_PATH.
                         )
     assert len(FIELD_DELIMITER_DEFAULT) == 1,\
         '--help is wrong about default FIELD_DELIMITER'
+    pgroup.add_argument('--load-workers', action='store', type=int,
+                        default=0,
+                        help='Count of worker processes that parse large'
+                             ' --redirects files in chunks during a load or'
+                             ' reload. Files smaller than %d bytes are parsed'
+                             ' in the server process.'
+                             ' Default is %%(default)s (parse all files in the'
+                             ' server process).' % LOAD_WORKERS_FILE_SIZE_MIN)
+    pgroup.add_argument('--reload-subprocess', action='store_true',
+                        default=False,
+                        help='Do each reload in a child process that sends'
+                             ' back the loaded redirects. Parsing large'
+                             ' --redirects files then does not slow requests'
+                             ' handled during the reload.')
+    pgroup.add_argument('--self-host', dest='self_hosts', action='append',
+                        metavar='HOST', default=list(),
+                        help='Host name, or "host:port", that clients use to'
+                             ' reach this server, e.g. "goto". A redirect to'
+                             ' a relative URL or to a self host is a redirect'
+                             ' back to this server. Redirect loops among these'
+                             ' are logged during a load. The host name of this'
+                             ' system is always included.'
+                             ' May be passed multiple times.')
+    pgroup.add_argument('--flatten-chains', action='store_true',
+                        default=False,
+                        help='During a load, rewrite chains of redirects back'
+                             ' to this server, e.g. "/a" to "http://goto/b"'
+                             ' to "http://other/c", so the client is sent the'
+                             ' final URL in one redirect. Only chains that'
+                             ' redirect the same for every request are'
+                             ' rewritten.')
+    pgroup.add_argument('--not-found-minimal', action='store_true',
+                        default=False,
+                        help='Respond to requests for unknown paths with a'
+                             ' minimal 404 Not Found body instead of an HTML'
+                             ' page. Helps when under heavy load from'
+                             ' scanners.')
+    pgroup.add_argument('--not-found-max-age', action='store', type=int,
+                        default=None, metavar='SECONDS',
+                        help='Set "Cache-Control: max-age=SECONDS" on 404'
+                             ' Not Found responses so clients do not'
+                             ' repeat requests for unknown paths.'
+                             ' Default is no Cache-Control header.')
     pgroup.add_argument('--status-note-file', action='store', type=str,
                         help='Status page note: Filesystem path to a file with'
                              ' HTML that will be embedded within a <div>'
@@ -1627,6 +4856,13 @@ process or HTTP requesting the RELOAD_PATH.
                         default=0,
                         help='Shutdown the server after passed seconds.'
                              ' Intended for testing.')
+    pgroup.add_argument('--drain-timeout', action='store', type=float,
+                        default=DRAIN_TIMEOUT_DEFAULT, metavar='SECONDS',
+                        help='At shutdown, by --shutdown or by signal'
+                             ' SIGTERM, stop accepting then wait up to passed'
+                             ' seconds for in-flight requests to finish.'
+                             ' Requests still in-flight are aborted.'
+                             ' Default is %(default)s.')
     pgroup.add_argument('--log', action='store', type=str, default=None,
                         help='Log to file at path LOG.'
                              ' Default logging is to sys.stderr.')
@@ -1660,6 +4896,14 @@ About Redirect Entries:
   The last two fields, "added by user" and "added on datetime", are intended
   for record-keeping within an organization.
 
+  A redirects file entry may have two more optional fields, either may be
+  empty: "status code", a redirect HTTP Status Code (301, 302, 303, 307 or 308)
+  for this entry that overrides --redirect-code, and "max-age", seconds for a
+  "Cache-Control: max-age" response header. For example, a permanent redirect
+  that clients may cache for a day,
+
+    /hr{fd}http://human-resources.megacorp.local/login{fd}bob{fd}2019-09-07 12:00:00{fd}301{fd}86400
+
   A passed redirect should have a leading "/" as this is the URI path given for
   processing.
   For example, the URL "http://host/hr" is processed as URI path "/hr".
@@ -1769,8 +5013,14 @@ About Reloads:
   On this system, the signal is {sig_here} ({sig_hered:d}).
   On Unix, use program `kill`.  On Windows, use program `windows-kill.exe`.
 
+  On Unix, signal {sig_restart} starts a hot restart: a new process of this
+  program is started with the same options and passed the listening socket.
+  Once the new process has loaded the redirects, this process stops accepting,
+  drains in-flight requests and exits. No connection is refused.
+
   A reload of redirect files may also be requested via passed URL path
-  RELOAD_PATH.
+  RELOAD_PATH. Reload requests made while a reload is pending are merged into
+  it, see --reload-interval.
 
 About Paths:
 
@@ -1788,11 +5038,70 @@ About this program:
         fd=FIELD_DELIMITER_DEFAULT,
         sig_unix=SIGNAL_RELOAD_UNIX, sig_win=SIGNAL_RELOAD_WINDOWS,
         sig_here=str(SIGNAL_RELOAD), sig_hered=int(SIGNAL_RELOAD),
+        sig_restart=SIGNAL_RESTART_UNIX,
         ignore=REDIRECT_FILE_IGNORE_LINE,
         query='{query}',
         rand1=str(uuid.uuid4()),
     )
+    return parser
+
+
+# program command-line options, processed, see `process_options`
+Options = NamedTuple(
+    'Options',
+    [
+        ('ip', str),
+        ('port', int),
+        ('listen', typing.List[str]),
+        ('unix_socket_mode', int),
+        ('unix_trust', bool),
+        ('socket_options', Socket_Options),
+        ('tls_cert', str_None),
+        ('tls_key', str_None),
+        ('log_debug', bool),
+        ('log_filename', Path_None),
+        ('status_path', str),
+        ('reload_path', str),
+        ('redirect_code', Redirect_Code_Value),
+        ('shutdown', int),
+        ('drain_timeout', float),
+        ('field_delimiter', Re_Field_Delimiter),
+        ('load_workers', int),
+        ('reload_subprocess', bool),
+        ('self_hosts', typing.List[str]),
+        ('flatten_chains', bool),
+        ('not_found_minimal', bool),
+        ('not_found_max_age', typing.Optional[int]),
+        ('rate_limiter', typing.Optional[RateLimiter]),
+        ('trusted_proxies', typing.List[IP_Network]),
+        ('max_in_flight', int),
+        ('shed_drop', bool),
+        ('shed_retry_after', int),
+        ('shed_exempt_status', bool),
+        ('request_timeout', typing.Optional[float]),
+        ('head_timeout', typing.Optional[float]),
+        ('max_request_line', int),
+        ('max_header_bytes', int),
+        ('max_headers', int),
+        ('health_path', str_None),
+        ('ready_path', str_None),
+        ('favicon_file', str_None),
+        ('robots_file', str_None),
+        ('reload_interval', float),
+        ('status_note_file', Path_None),
+        ('from_to', FromTo_List),
+        ('redirects_files', typing.List[str]),
+    ]
+)
+
+
+def process_options() -> Options:
+    """Process script command-line options."""
+
+    global sys_args
+    sys_args = copy.copy(sys.argv)  # set once
 
+    parser = options_parser()
     args = parser.parse_args()
 
     if not (args.redirects_files or args.from_to):
@@ -1802,12 +5111,104 @@ About this program:
         parser.print_usage()
         sys.exit(1)
 
+    rate_limiter = None
+    if args.rate_limit > 0:
+        if args.rate_burst < 1 or args.rate_clients < 1:
+            print('ERROR: --rate-burst and --rate-clients must be at least 1',
+                  file=sys.stderr)
+            parser.print_usage()
+            sys.exit(1)
+        rate_limiter = RateLimiter(args.rate_limit, args.rate_burst,
+                                   args.rate_clients)
+
+    trusted_proxies = []  # type: typing.List[IP_Network]
+    for proxy in args.trusted_proxies:
+        try:
+            trusted_proxies.append(ipaddress.ip_network(proxy, strict=False))
+        except ValueError as ex:
+            print('ERROR: --trust-proxy %s' % ex, file=sys.stderr)
+            parser.print_usage()
+            sys.exit(1)
+
+    if args.not_found_max_age is not None and args.not_found_max_age < 0:
+        print('ERROR: --not-found-max-age must not be negative',
+              file=sys.stderr)
+        parser.print_usage()
+        sys.exit(1)
+
     if args.status_path == args.reload_path:
         print('ERROR: --status-path and --reload-path must be different paths',
               file=sys.stderr)
         parser.print_usage()
         sys.exit(1)
 
+    paths = [path for path in (args.status_path, args.reload_path,
+                               args.health_path, args.ready_path) if path]
+    try:
+        unix_socket_mode = int(args.unix_socket_mode, 8)
+    except ValueError:
+        print('ERROR: --unix-socket-mode must be octal, e.g. 660',
+              file=sys.stderr)
+        parser.print_usage()
+        sys.exit(1)
+    if args.unix_socket and not hasattr(socket, 'AF_UNIX'):
+        print('ERROR: --unix-socket is not available on this system',
+              file=sys.stderr)
+        parser.print_usage()
+        sys.exit(1)
+    for name, value, least in (('--backlog', args.backlog, 1),
+                               ('--tcp-defer-accept', args.tcp_defer_accept,
+                                0),
+                               ('--tcp-fastopen', args.tcp_fastopen, 0)):
+        if value < least:
+            print('ERROR: %s must be at least %d' % (name, least),
+                  file=sys.stderr)
+            parser.print_usage()
+            sys.exit(1)
+    socket_options = Socket_Options(
+        backlog=args.backlog,
+        nodelay=args.tcp_nodelay,
+        defer_accept=args.tcp_defer_accept,
+        fastopen=args.tcp_fastopen,
+        reuseport=args.reuseport,
+    )
+    if args.tls_key and not args.tls_cert:
+        print('ERROR: --tls-key requires --tls-cert', file=sys.stderr)
+        parser.print_usage()
+        sys.exit(1)
+    if args.tls_cert and args.shed_exempt_status:
+        # a shed request is triaged by peeking at its request line, over TLS
+        # that is the encrypted ClientHello
+        print('ERROR: --shed-exempt-status can not be used with --tls-cert',
+              file=sys.stderr)
+        parser.print_usage()
+        sys.exit(1)
+    if args.tls_cert:
+        try:
+            tls_context(args.tls_cert, args.tls_key)
+        except OSError as err:
+            print('ERROR: bad --tls-cert or --tls-key: %s' % err,
+                  file=sys.stderr)
+            parser.print_usage()
+            sys.exit(1)
+    listen = list(args.listen)  # type: typing.List[str]
+    if args.unix_socket:
+        listen.append(UNIX_PREFIX + args.unix_socket)
+    for address in args.listen:
+        try:
+            parse_listen(address)
+        except ValueError as err:
+            print('ERROR: bad --listen %r: %s' % (address, err),
+                  file=sys.stderr)
+            parser.print_usage()
+            sys.exit(1)
+
+    if len(set(paths)) != len(paths):
+        print('ERROR: --status-path --reload-path --health-path --ready-path'
+              ' must be different paths', file=sys.stderr)
+        parser.print_usage()
+        sys.exit(1)
+
     log_filename = None
     if args.log:
         log_filename = pathlib.Path(args.log)
@@ -1817,79 +5218,132 @@ About this program:
         status_note_file = pathlib.Path(args.status_note_file)
 
     redirects_files = args.redirects_files  # type: typing.List[str]
-    return \
-        str(args.ip), \
-        int(args.port), \
-        bool(args.debug), \
-        log_filename, \
-        str(args.status_path), \
-        str(args.reload_path), \
-        Redirect_Code_Value(args.redirect_code), \
-        int(args.shutdown),\
-        Re_Field_Delimiter(args.field_delimiter), \
-        status_note_file, \
-        args.from_to, \
-        redirects_files
+    return Options(
+        ip=str(args.ip),
+        port=int(args.port),
+        listen=listen,
+        unix_socket_mode=unix_socket_mode,
+        unix_trust=bool(args.unix_socket_trust),
+        socket_options=socket_options,
+        tls_cert=args.tls_cert,
+        tls_key=args.tls_key,
+        log_debug=bool(args.debug),
+        log_filename=log_filename,
+        status_path=str(args.status_path),
+        reload_path=str(args.reload_path),
+        redirect_code=Redirect_Code_Value(args.redirect_code),
+        shutdown=int(args.shutdown),
+        drain_timeout=max(0.0, float(args.drain_timeout)),
+        field_delimiter=Re_Field_Delimiter(args.field_delimiter),
+        load_workers=max(0, int(args.load_workers)),
+        reload_subprocess=bool(args.reload_subprocess),
+        self_hosts=args.self_hosts,
+        flatten_chains=bool(args.flatten_chains),
+        not_found_minimal=bool(args.not_found_minimal),
+        not_found_max_age=args.not_found_max_age,
+        rate_limiter=rate_limiter,
+        trusted_proxies=trusted_proxies,
+        max_in_flight=max(0, int(args.max_in_flight)),
+        shed_drop=bool(args.shed_drop),
+        shed_retry_after=max(0, int(args.shed_retry_after)),
+        shed_exempt_status=bool(args.shed_exempt_status),
+        request_timeout=float(args.request_timeout) or None,
+        head_timeout=float(args.head_timeout) or None,
+        max_request_line=max(1, int(args.max_request_line)),
+        max_header_bytes=max(1, int(args.max_header_bytes)),
+        max_headers=max(1, int(args.max_headers)),
+        health_path=args.health_path,
+        ready_path=args.ready_path,
+        favicon_file=args.favicon_file,
+        robots_file=args.robots_file,
+        reload_interval=max(0.0, float(args.reload_interval)),
+        status_note_file=status_note_file,
+        from_to=args.from_to,
+        redirects_files=redirects_files,
+    )
 
 
 def main() -> None:
-    ip, \
-        port, \
-        log_debug, \
-        log_filename, \
-        status_path, \
-        reload_path, \
-        redirect_code, \
-        shutdown, \
-        field_delimiter, \
-        status_note_file, \
-        from_to, \
-        redirects_files \
-        = process_options()
-
-    logging_init(log_debug, log_filename)
+    options = process_options()
+
+    logging_init(options.log_debug, options.log_filename)
     log.debug('Start %s version %s\nRun command:\n%s %s',
               PROGRAM_NAME, __version__, sys.executable, ' '.join(sys.argv))
 
     # setup field delimiter
-    RedirectServer.field_delimiter = field_delimiter  # set once
+    RedirectServer.field_delimiter = options.field_delimiter  # set once
+    RedirectServer.load_workers = options.load_workers  # set once
+    RedirectServer.reload_subprocess = options.reload_subprocess  # set once
+    RedirectServer.unix_trust = options.unix_trust  # set once
+    RedirectServer.socket_options = options.socket_options  # set once
+    RedirectServer.tls_cert = options.tls_cert  # set once
+    RedirectServer.tls_key = options.tls_key  # set once
+    RedirectServer.self_hosts = options.self_hosts  # set once
+    RedirectServer.flatten_chains = options.flatten_chains  # set once
+    RedirectHandler.not_found_minimal = options.not_found_minimal  # set once
+    RedirectHandler.not_found_max_age = options.not_found_max_age  # set once
+    RedirectServer.rate_limiter = options.rate_limiter  # set once
+    RedirectServer.trusted_proxies = options.trusted_proxies  # set once
+    RedirectServer.max_in_flight = options.max_in_flight  # set once
+    RedirectServer.shed_drop = options.shed_drop  # set once
+    RedirectServer.shed_retry_after = options.shed_retry_after  # set once
+    RedirectHandler.timeout = options.request_timeout  # set once
+    RedirectHandler.head_timeout = options.head_timeout  # set once
+    RedirectHandler.max_request_line = options.max_request_line  # set once
+    RedirectHandler.max_header_bytes = options.max_header_bytes  # set once
+    RedirectHandler.max_headers = options.max_headers  # set once
+    RedirectHandler.health_path = options.health_path  # set once
+    RedirectHandler.ready_path = options.ready_path  # set once
+    RedirectHandler.favicon_file = options.favicon_file  # set once
+    RedirectHandler.robots_file = options.robots_file  # set once
+    reload_control.interval = options.reload_interval  # set once
 
     # process the passed redirects
     global Redirect_FromTo_List
-    Redirect_FromTo_List = from_to  # set once
+    Redirect_FromTo_List = options.from_to  # set once
     global Redirect_Files_List
-    redirects_files_ = [pathlib.Path(x) for x in redirects_files]
+    redirects_files_ = [pathlib.Path(x) for x in options.redirects_files]
     Redirect_Files_List = redirects_files_  # set once
     # load the redirect entries from various sources
     entry_list = RedirectsLoader.load_redirects(
         Redirect_FromTo_List,
         Redirect_Files_List,
-        field_delimiter
+        options.field_delimiter,
+        options.load_workers,
+        options.self_hosts,
+        options.flatten_chains
     )
     global reload_datetime
     reload_datetime = datetime_now()
+    global server_ready
+    server_ready = True
 
     if len(entry_list) < 1:
         log.warning('There are no redirect entries')
 
     global STATUS_PATH
-    STATUS_PATH = status_path
+    STATUS_PATH = options.status_path
     log.debug('status_path (%s)', STATUS_PATH)
+    if options.shed_exempt_status:
+        RedirectServer.shed_exempt_paths = [  # set once
+            path for path in (STATUS_PATH, options.health_path,
+                              options.ready_path) if path
+        ]
 
     global RELOAD_PATH
-    RELOAD_PATH = reload_path
+    RELOAD_PATH = options.reload_path
     log.debug('reload_path (%s)', RELOAD_PATH)
 
-    redirect_code_ = http.HTTPStatus(int(redirect_code))
+    redirect_code_ = http.HTTPStatus(int(options.redirect_code))
     global REDIRECT_CODE
     REDIRECT_CODE = redirect_code_
     log.debug('Successful Redirect Status Code is %s (%s)', int(REDIRECT_CODE),
               REDIRECT_CODE.phrase)
 
     global NOTE_ADMIN
-    if status_note_file:
-        log.debug('reading --status-note-file (%s)', status_note_file)
-        note_s = open(str(status_note_file)).read()
+    if options.status_note_file:
+        log.debug('reading --status-note-file (%s)', options.status_note_file)
+        note_s = open(str(options.status_note_file)).read()
         NOTE_ADMIN = htmls(note_s)
         log.debug('read %d characters from --status-note-file', len(NOTE_ADMIN))
 
@@ -1919,24 +5373,88 @@ def main() -> None:
                                                 STATUS_PATH,
                                                 RELOAD_PATH,
                                                 NOTE_ADMIN)
-    with RedirectServer((ip, port), redirect_handler) as redirect_server:
+    # listening sockets passed by the hot restart of a previous process or by
+    # systemd socket activation
+    listen_fd = os.environ.pop(ENV_LISTEN_FD, None)
+    ready_fd = os.environ.pop(ENV_READY_FD, None)
+    listen_fds = sd_listen_fds()
+    if listen_fd is not None:
+        listen_fds = [int(fd) for fd in listen_fd.split(',')]
+    RedirectServer.watchdog_interval = \
+        sd_watchdog_interval(ready_fd is not None)  # set once
+    if listen_fds:
+        log.info('Using listening sockets of file descriptors %s',
+                 ', '.join(str(fd) for fd in listen_fds))
+        for fd in listen_fds:
+            os.set_inheritable(fd, False)
+        redirect_server_ = RedirectServer.from_socket(
+            socket_from_fd(listen_fds[0]), redirect_handler
+        )
+        for fd in listen_fds[1:]:
+            redirect_server_.add_listener(socket_from_fd(fd))
+    elif options.listen:
+        redirect_server_ = RedirectServer.listen(options.listen,
+                                                 redirect_handler,
+                                                 options.unix_socket_mode)
+    else:
+        redirect_server_ = RedirectServer((options.ip, options.port),
+                                          redirect_handler)
+    with redirect_server_ as redirect_server:
+        if options.tls_cert:
+            redirect_server.tls_load()
+
+        def drain_signal_handler(signum, _) -> None:
+            """Catch signal and stop serving, `main` then drains"""
+            log.info('Signal %s, shutting down', signum)
+            redirect_server.stop()
+
+        signal.signal(signal.SIGTERM, drain_signal_handler)
+
+        restarting = []  # type: typing.List[threading.Thread]
+
+        def restart_signal_handler(signum, _) -> None:
+            """Catch signal and start a hot restart, unless one is running"""
+            log.info('Signal %s, hot restart', signum)
+            if restarting and restarting[0].is_alive():
+                return
+            restarting[:] = [threading.Thread(name='hot_restart',
+                                              target=redirect_server.hot_restart,
+                                              daemon=True)]
+            restarting[0].start()
+
+        if SIGNAL_RESTART is not None:
+            signal.signal(SIGNAL_RESTART, restart_signal_handler)
+        if ready_fd is not None:
+            # tell the previous process this one is ready to serve
+            os.write(int(ready_fd), b'1')
+            os.close(int(ready_fd))
+        # systemd tracks this process, it may be the new process of a hot
+        # restart
+        sd_notify('READY=1\nMAINPID=%d\nSTATUS=%s'
+                  % (os.getpid(), redirect_server.status_text()))
         serve_time = 'forever'
-        if shutdown:
-            serve_time = 'for %s seconds' % shutdown
+        if options.shutdown:
+            serve_time = 'for %s seconds' % options.shutdown
             st = threading.Thread(
                 name='shutdown_thread',
                 target=shutdown_server,
-                args=(redirect_server, shutdown,))
+                args=(redirect_server, options.shutdown,))
             st.start()
-        log.info("Serve %s at %s:%s, Process ID %s", serve_time, ip, port,
-                 os.getpid())
+        log.info("Serve %s at %s, Process ID %s", serve_time,
+                 redirect_server.address_text(), os.getpid())
         try:
             log.debug("Redirect_Server %s (0x%08x)",
                       redirect_server, id(redirect_server))
-            redirect_server.serve_forever(poll_interval=1)  # never returns
+            reload_control.wakeup = redirect_server.wakeup  # set once
+            # returns after shutdown
+            redirect_server.serve_forever()
         except (KeyboardInterrupt, InterruptedError):
             do_shutdown = True
             raise
+        do_shutdown = True
+        if not redirect_server.restarted:
+            sd_notify('STOPPING=1')
+        redirect_server.drain(options.drain_timeout)
 
 
 if __name__ == '__main__':
@@ -9,14 +9,33 @@ __doc__ = \
     """Test the goto_http_redirect_server project using pytest."""
 
 from collections import defaultdict
+import concurrent.futures
+import contextlib
 from datetime import datetime
 import getpass
+import gzip
 import http
 from http import client
+import ipaddress
+import json
+import logging
+import multiprocessing
+import os
+import re
+import shutil
+import signal
+import socket
+import ssl
+import subprocess
+import sys
 import threading
 import time
 import typing
 from urllib.parse import ParseResult
+import wsgiref.simple_server
+import wsgiref.util
+import wsgiref.validate
+import zlib
 
 import pytest
 
@@ -38,9 +57,18 @@ from goto_http_redirect_server.goto_http_redirect_server import (
     fromisoformat,
     to_ParseResult,
     redirect_handler_factory,
+    process_options,
+    RedirectApplication,
     RedirectHandler,
     RedirectServer,
     RedirectsLoader,
+    RateLimiter,
+    ReloadControl,
+    GZIP_DEFLATE_END,
+    GZIP_HEADER,
+    deflate_raw,
+    gzip_bytes,
+    gzip_trailer,
 )
 str_None = typing.Optional[str]
 
@@ -157,6 +185,24 @@ class Test_ClassesSimple(object):
             entry = Re_Entry(*entry_args, **entry_kwargs)
             assert entry == entry_expected
 
+    @pytest.mark.parametrize(
+        'takes, expected',
+        (
+            # (client, time) and expected wait, rate is 2 per second, burst 3
+            pytest.param([('a', 0)] * 3, [0, 0, 0], id='burst'),
+            pytest.param([('a', 0)] * 4, [0, 0, 0, 0.5], id='over burst'),
+            pytest.param([('a', 0)] * 4 + [('a', 0.5)], [0, 0, 0, 0.5, 0], id='refill'),
+            pytest.param([('a', 0)] * 4 + [('b', 0)], [0, 0, 0, 0.5, 0], id='per client'),
+            pytest.param([('a', 0)] * 3 + [('a', 100)] * 3, [0] * 6, id='refill to burst'),
+            # LRU of 2 clients, 'a' is dropped so starts with a full bucket
+            pytest.param([('a', 0)] * 3 + [('b', 0), ('c', 0), ('a', 0)], [0] * 6, id='LRU'),
+        )
+    )
+    def test_RateLimiter(self, takes, expected):
+        limiter = RateLimiter(2, 3, 2)
+        assert [limiter.take(client, now) for client, now in takes] == expected
+        assert len(limiter) <= 2
+
 
 class Test_Functions(object):
 
@@ -592,6 +638,288 @@ class Test_Functions(object):
         actual = RedirectsLoader.clean_redirects(input_)
         assert actual == expected
 
+    @pytest.mark.parametrize(
+        'input_, expected',
+        (
+            pytest.param(
+                {'/a': Re_Entry('/a', 'http://goto/b'), '/b': Re_Entry('/b', 'http://goto/c'), '/c': Re_Entry('/c', 'http://x/c?q=${query}')},
+                {'/a': 'http://x/c?q=${query}', '/b': 'http://x/c?q=${query}', '/c': 'http://x/c?q=${query}'},
+                id='chain'
+            ),
+            pytest.param(
+                {'/a': Re_Entry('/a', '/b'), '/b': Re_Entry('/b', 'http://GOTO:80/c'), '/c': Re_Entry('/c', 'http://x')},
+                {'/a': 'http://x', '/b': 'http://x', '/c': 'http://x'},
+                id='relative and port'
+            ),
+            pytest.param(
+                {'/a': Re_Entry('/a', 'http://other/b'), '/b': Re_Entry('/b', 'http://x')},
+                {'/a': 'http://other/b', '/b': 'http://x'},
+                id='not self'
+            ),
+            pytest.param(
+                {'/a': Re_Entry('/a', 'http://goto/b?q=1'), '/b': Re_Entry('/b', 'http://x')},
+                {'/a': 'http://goto/b?q=1', '/b': 'http://x'},
+                id='query not composable'
+            ),
+            pytest.param(
+                {'/a': Re_Entry('/a', 'http://goto/b'), '/b': Re_Entry('/b', 'http://x'), '/b?': Re_Entry('/b?', 'http://y')},
+                {'/a': 'http://goto/b', '/b': 'http://x', '/b?': 'http://y'},
+                id='target has modifiers'
+            ),
+            pytest.param(
+                {'/a': Re_Entry('/a', 'http://goto/b'), '/b': Re_Entry('/b', 'http://x/${path}')},
+                {'/a': 'http://goto/b', '/b': 'http://x/${path}'},
+                id='target uses path'
+            ),
+            pytest.param(
+                {'/a?': Re_Entry('/a?', 'http://goto/b'), '/b': Re_Entry('/b', 'http://x/${query}')},
+                {'/a?': 'http://x/${query}', '/b': 'http://x/${query}'},
+                id='modifier and template kept'
+            ),
+            pytest.param(
+                {'/a': Re_Entry('/a', '/b'), '/b': Re_Entry('/b', '/a'), '/c': Re_Entry('/c', '/a')},
+                {'/a': '/b', '/b': '/a', '/c': '/a'},
+                id='loop'
+            ),
+            pytest.param(
+                {'/a': Re_Entry('/a', 'http://goto/b', code=http.HTTPStatus.MOVED_PERMANENTLY, max_age=86400),
+                 '/b': Re_Entry('/b', 'http://goto/c', code=http.HTTPStatus.FOUND, max_age=0),
+                 '/c': Re_Entry('/c', 'http://x', code=http.HTTPStatus.FOUND, max_age=0)},
+                {'/a': 'http://goto/b', '/b': 'http://x', '/c': 'http://x'},
+                id='code or max-age differ'
+            ),
+            pytest.param(
+                {'/a': Re_Entry('/a', 'http://goto/b', max_age=60), '/b': Re_Entry('/b', 'http://x')},
+                {'/a': 'http://goto/b', '/b': 'http://x'},
+                id='max-age differs'
+            ),
+        )
+    )
+    def test_flatten_redirects(self,
+                               input_: Re_Entry_Dict,
+                               expected: typing.Dict[str, str]):
+        actual = RedirectsLoader.flatten_redirects(input_, ['goto'], True)
+        assert {key: entry.to for key, entry in actual.items()} == expected
+        for key, entry in actual.items():
+            assert entry.to_pr == topr(entry.to)
+            assert entry.etype == ET.getEntryType_From(key)
+
+    def test_flatten_redirects_loop_logged(self, caplog):
+        input_ = {'/a': Re_Entry('/a', '/b'), '/b': Re_Entry('/b', 'http://goto/a')}
+        RedirectsLoader.flatten_redirects(input_, ['goto'], False)
+        assert 'Redirect loop: /a → /b → /a' in caplog.text
+
+    @pytest.mark.parametrize(
+        'row, code, max_age',
+        (
+            pytest.param(['/a', 'b', 'u', '2019-01-01 00:00:00'], None, None, id='four'),
+            pytest.param(['/a', 'b', 'u', '2019-01-01 00:00:00', '301'], http.HTTPStatus.MOVED_PERMANENTLY, None, id='code'),
+            pytest.param(['/a', 'b', 'u', '2019-01-01 00:00:00', '', '0'], None, 0, id='max-age 0'),
+            pytest.param(['/a', 'b', 'u', '2019-01-01 00:00:00', '302', '600', 'x'], http.HTTPStatus.FOUND, 600, id='both, extra'),
+            pytest.param(['/a', 'b', 'u', '2019-01-01 00:00:00', 'x'], ValueError, None, id='bad code'),
+            pytest.param(['/a', 'b', 'u', '2019-01-01 00:00:00', '999'], ValueError, None, id='unknown code'),
+            pytest.param(['/a', 'b', 'u', '2019-01-01 00:00:00', '200'], ValueError, None, id='code 200'),
+            pytest.param(['/a', 'b', 'u', '2019-01-01 00:00:00', '404'], ValueError, None, id='code 404'),
+            pytest.param(['/a', 'b', 'u', '2019-01-01 00:00:00', '500'], ValueError, None, id='code 500'),
+            pytest.param(['/a', 'b', 'u', '2019-01-01 00:00:00', '303'], http.HTTPStatus.SEE_OTHER, None, id='code 303'),
+            pytest.param(['/a', 'b', 'u', '2019-01-01 00:00:00', '', '-1'], ValueError, None, id='negative max-age'),
+        )
+    )
+    def test_row_to_entry_code_max_age(self,
+                                       row: typing.List[str],
+                                       code: typing.Any,
+                                       max_age: typing.Optional[int]):
+        if code is ValueError:
+            with pytest.raises(ValueError):
+                RedirectsLoader.row_to_entry(row)
+            return
+        entry = RedirectsLoader.row_to_entry(row)
+        assert entry.code == code
+        assert entry.max_age == max_age
+
+    @pytest.mark.parametrize(
+        'data, quoted',
+        (
+            pytest.param(b'', False, id='empty'),
+            pytest.param(b'/a\thttp://a\tbob\t2019-01-01 00:00:00', False, id='no newline'),
+            pytest.param(b'/a\thttp://a\tbob\t2019-01-01 00:00:00\r\n/b\thttp://b\tbob\t2019-01-01 00:00:00\r\n', False, id='CRLF'),
+            pytest.param(b'# c\n\n  \n/a\n/b\thttp://b\tbob\t2019-01-01 00:00:00\t\t\textra\n', False, id='comment, blank, short, extra'),
+            pytest.param(b'/a\thttp://a\tbob\t2019-01-01 00:00:00\t301\t60\n/b\thttp://b\tbob\t2019-01-01 00:00:00\t\t60\n', False, id='code, max-age'),
+            pytest.param(b'/a;?\thttp://a?q=${query}\tbob\t2019-01-01 00:00:00\n/a\thttp://a2\tbob\tBAD\n', False, id='modifier, bad date'),
+            pytest.param('/混沌\thttp://a\t混\t2019-01-01 00:00:00\n'.encode('utf-8'), False, id='UTF-8'),
+            pytest.param(b'/a\t"http://a"\tbob\t2019-01-01 00:00:00\n', True, id='quoted'),
+        )
+    )
+    def test_load_redirects_file_tsv(self,
+                                     data: bytes,
+                                     quoted: bool,
+                                     tmp_path):
+        """streaming TSV loader matches the csv.reader loader"""
+        file1 = tmp_path / 'file1.csv'
+        file1.write_bytes(data)
+        actual = RedirectsLoader.load_redirects_file_tsv(file1)
+        expected = RedirectsLoader.load_redirects_file_csv(file1, '\t')
+        if quoted:
+            assert actual is None
+            assert RedirectsLoader.load_redirects_file(file1, '\t') == expected
+        else:
+            assert actual == expected
+            assert list(actual.keys()) == list(expected.keys())
+
+    @pytest.mark.parametrize(
+        'lines',
+        (
+            pytest.param(
+                ['/a%d\thttp://a%d\tbob\t2019-01-01 00:00:00\n' % (i, i % 7)
+                 for i in range(300)],
+                id='unique'
+            ),
+            pytest.param(
+                ['/a%d\thttp://a%d\tbob\t2019-01-01 00:00:00\n' % (i % 50, i)
+                 for i in range(300)],
+                id='last row wins'
+            ),
+            pytest.param(
+                ['# comment\n', '\n', '/bad\n']
+                + ['/a%d\thttp://a%d\tbob\t2019-01-01 00:00:00\r\n' % (i, i)
+                   for i in range(300)],
+                id='comments, bad rows, CRLF'
+            ),
+            pytest.param(
+                ['/a%d\t"http://a%d"\tbob\t2019-01-01 00:00:00\n' % (i, i)
+                 for i in range(300)],
+                id='quoted fields'
+            ),
+        )
+    )
+    def test_load_redirects_files_workers(self,
+                                          lines: typing.List[str],
+                                          tmp_path,
+                                          monkeypatch):
+        """chunked load in worker processes matches the serial load"""
+        monkeypatch.setattr(goto_http_redirect_server.goto_http_redirect_server,
+                            'LOAD_WORKERS_FILE_SIZE_MIN', 0)
+        monkeypatch.setattr(goto_http_redirect_server.goto_http_redirect_server,
+                            'LOAD_WORKERS_CHUNK_SIZE_MIN', 512)
+        file1 = tmp_path / 'file1.csv'
+        file1.write_bytes(''.join(lines).encode('utf-8'))
+        file2 = tmp_path / 'file2.csv'
+        file2.write_bytes(b'/a1\thttp://file2\tbob\t2019-01-01 00:00:00\n')
+        assert len(RedirectsLoader.file_chunks(file1, 4)) > 1
+        files = [file1, file2]
+        serial = RedirectsLoader.load_redirects_files(files, '\t', 0)
+        chunked = RedirectsLoader.load_redirects_files(files, '\t', 2)
+        assert chunked == serial
+        assert list(chunked.keys()) == list(serial.keys())
+        assert chunked['/a1'].to == 'http://file2'
+
+    @pytest.mark.skipif(sys.version_info < (3, 7), reason='mp_context requires Python 3.7')
+    def test_load_redirects_files_workers_not_forked(self, monkeypatch, tmp_path):
+        """load workers started while server threads run are not forked"""
+        monkeypatch.setattr(goto_http_redirect_server.goto_http_redirect_server,
+                            'LOAD_WORKERS_FILE_SIZE_MIN', 0)
+        monkeypatch.setattr(goto_http_redirect_server.goto_http_redirect_server,
+                            'LOAD_WORKERS_CHUNK_SIZE_MIN', 512)
+        file1 = tmp_path / 'file1.csv'
+        file1.write_bytes(b''.join(
+            b'/a%d\thttp://a%d\tbob\t2019-01-01 00:00:00\n' % (i, i)
+            for i in range(300)
+        ))
+        assert len(RedirectsLoader.file_chunks(file1, 4)) > 1
+        methods = []
+        executor_class = concurrent.futures.ProcessPoolExecutor
+
+        def executor_spy(*args, **kwargs):
+            methods.append(kwargs['mp_context'].get_start_method())
+            return executor_class(*args, **kwargs)
+
+        monkeypatch.setattr(concurrent.futures, 'ProcessPoolExecutor', executor_spy)
+        entrys = RedirectsLoader.load_redirects_files([file1], '\t', 2)
+        assert len(entrys) == 300
+        assert methods and methods[0] in ('forkserver', 'spawn')
+
+    @pytest.mark.parametrize('load_workers', (0, 2))
+    def test_load_redirects_subprocess(self, load_workers: int, tmp_path):
+        """load in a child process matches the load in this process"""
+        file1 = tmp_path / 'file1.csv'
+        file1.write_bytes(b''.join(
+            b'/a%d\thttp://a%d\tbob\t2019-01-01 00:00:00\n' % (i, i)
+            for i in range(300)
+        ))
+        args = ([('/b', 'http://b')], [file1], '\t', load_workers, (), False)
+        here = RedirectsLoader.load_redirects(*args)
+        child = RedirectsLoader.load_redirects_subprocess(*args)
+        # the child is a fresh process without this module's override of
+        # datetime_now, --from-to entries are dated there
+        child['/b'] = child['/b']._replace(date=here['/b'].date)
+        assert child == here
+        assert list(child.keys()) == list(here.keys())
+        assert len(child) == 301
+
+    @pytest.mark.timeout(10)
+    def test_load_redirects_subprocess_timeout(self, monkeypatch):
+        """a stuck child is terminated, the load falls back to this process"""
+        ghrs = goto_http_redirect_server.goto_http_redirect_server
+        monkeypatch.setattr(ghrs, 'RELOAD_SUBPROCESS_TIMEOUT', 0.5)
+        monkeypatch.setattr(ghrs, 'RELOAD_SUBPROCESS_EXIT_TIMEOUT', 1.0)
+
+        monkeypatch.setattr(RedirectsLoader, 'load_redirects_child',
+                            staticmethod(load_redirects_child_sleep))
+        start = time.monotonic()
+        entrys = RedirectsLoader.load_redirects_subprocess([('/b', 'http://b')], [], '\t')
+        assert time.monotonic() - start < 5
+        assert list(entrys.keys()) == ['/b']
+        assert not [p for p in multiprocessing.active_children() if p.name.endswith('-reload')]
+
+    def test_entrys_blob(self):
+        entrys = {
+            '/a': Re_Entry('/a', 'http://a/${path}', 'bob', NOW),
+            '/b?': Re_Entry('/b?', 'http://b', code=http.HTTPStatus.FOUND,
+                            max_age=60),
+        }
+        blob = RedirectsLoader.entrys_to_blob(entrys)
+        assert RedirectsLoader.entrys_from_blob(blob) == entrys
+
+    @pytest.mark.parametrize(
+        'parts',
+        (
+            pytest.param([b''], id='empty'),
+            pytest.param([b'abc'], id='one'),
+            pytest.param([b'abc' * 1000, b'', b'xyz' * 999, bytes(range(256)) * 4], id='many'),
+        )
+    )
+    def test_gzip_bytes(self, parts: typing.List[bytes]):
+        data = b''.join(parts)
+        assert gzip.decompress(gzip_bytes(data, 6)) == data
+        # separately deflated parts form one gzip stream
+        crc = 0
+        for part in parts:
+            crc = zlib.crc32(part, crc)
+        stream = GZIP_HEADER + b''.join(deflate_raw(part, 9) for part in parts) \
+            + GZIP_DEFLATE_END + gzip_trailer(crc, len(data))
+        assert gzip.decompress(stream) == data
+
+    def test_process_options(self, monkeypatch):
+        monkeypatch.setattr(sys, 'argv', ['prog', '--from-to', '/a', 'http://A',
+                                          '--port', '8080', '--max-headers', '0'])
+        options = process_options()
+        assert options.port == 8080
+        assert options.from_to == [['/a', 'http://A']]
+        assert options.redirects_files == []
+        assert options.max_headers == 1
+        assert options.rate_limiter is None
+        assert options.tls_cert is None
+
+    def test_process_options_shed_exempt_tls(self, monkeypatch, capsys):
+        monkeypatch.setattr(sys, 'argv', ['prog', '--from-to', '/a', 'http://A',
+                                          '--tls-cert', 'cert.pem', '--shed-exempt-status'])
+        with pytest.raises(SystemExit) as exc:
+            process_options()
+        assert exc.value.code == 1
+        out, err = capsys.readouterr()
+        assert err.startswith('ERROR: --shed-exempt-status can not be used with --tls-cert')
+        assert out.startswith('usage:')
+
 
 IP = '127.0.0.3'
 PORT = 33797  # an unlikely port to be used
@@ -640,6 +968,11 @@ def shutdown_server_thread(redirect_server: RedirectServer, sleep: float = 4):
     return st
 
 
+def load_redirects_child_sleep(*_args) -> None:
+    """a stuck RedirectsLoader.load_redirects_child, module level to pickle"""
+    time.sleep(60)
+
+
 # XXX: crude way to pass object from a thread back to main thread
 Request_Thread_Return = None
 
@@ -667,6 +1000,41 @@ def request_thread(ip: str, port: int, url: str, method: str, wait: float):
     return rt
 
 
+@contextlib.contextmanager
+def live_server(redirects: Re_Entry_Dict):
+    """
+    RedirectServer serving in a background thread.
+    Yields (RedirectServer, port)
+    """
+    # port 0 binds any unused port
+    with RedirectServer((IP, 0), new_redirect_handler(redirects)) as redirect_server:
+        port_ = redirect_server.server_address[1]
+        st = threading.Thread(name='pytest-serve_forever',
+                              target=redirect_server.serve_forever,
+                              kwargs={'poll_interval': 0.1})
+        st.start()
+        try:
+            yield redirect_server, port_
+        finally:
+            redirect_server.shutdown()
+            st.join(2)
+
+
+def request(port_: int,
+            url: str,
+            method: str = 'GET',
+            headers: typing.Optional[typing.Dict[str, str]] = None) \
+        -> typing.Tuple[client.HTTPResponse, bytes]:
+    """make one request to the live_server, return response and body"""
+    cl = client.HTTPConnection(IP, port=port_, timeout=2)
+    try:
+        cl.request(method, url, headers=headers or {})
+        rr = cl.getresponse()
+        return rr, rr.read()
+    finally:
+        cl.close()
+
+
 class Test_ClassesComplex(object):
 
     def test_RedirectServer_server_activate(self):
@@ -765,3 +1133,1498 @@ class Test_LiveServer(object):
                 assert loe <= rr.code <= hi, "ip=(%s) url=(%s) method=(%s)" % (ip, url, method)
             if header:
                 assert rr.getheader(header[0]) == header[1], "getheaders: %s" % rr.getheaders()
+
+
+class Test_StatusPage(object):
+    """status page rendering of a live server"""
+
+    rd = {'/e%02d' % i: Re_Entry('/e%02d' % i, 'http://E%02d' % i) for i in range(25)}
+
+    @pytest.mark.parametrize(
+        'query, present, absent, caption',
+        (
+            pytest.param('', range(25), (), 'entries 1 to 25 of 25, page 1 of 1', id='default'),
+            pytest.param('?page=2&size=10', range(10, 20), (9, 20), 'entries 11 to 20 of 25, page 2 of 3', id='page 2'),
+            pytest.param('?page=9&size=10', range(20, 25), (19,), 'entries 21 to 25 of 25, page 3 of 3', id='page past end'),
+            pytest.param('?page=X&size=0', range(25), (), 'entries 1 to 25 of 25, page 1 of 1', id='size 0'),
+        )
+    )
+    @pytest.mark.timeout(5)
+    def test_status_page(self,
+                         query: str,
+                         present: typing.Iterable[int],
+                         absent: typing.Iterable[int],
+                         caption: str):
+        with live_server(dict(self.rd)) as (_, port_):
+            for _ in range(2):  # second request is from the cache
+                rr, body = request(port_, '/status' + query)
+                assert rr.code == 200
+                assert rr.getheader('Transfer-Encoding') == 'chunked'
+                text = body.decode('utf-8')
+                assert text.startswith('<!DOCTYPE html>')
+                assert text.endswith('</html>')
+                assert caption in text
+                for i in present:
+                    assert 'http://E%02d' % i in text
+                for i in absent:
+                    assert 'http://E%02d' % i not in text
+
+    @pytest.mark.timeout(5)
+    def test_status_page_counter(self):
+        with live_server(dict(self.rd)) as (_, port_):
+            _, body = request(port_, '/status')
+            assert '(/e01) → (http://E01)'.encode('utf-8') not in body
+            rr, _ = request(port_, '/e01')
+            assert rr.code == int(REDIRECT_CODE_DEFAULT)
+            _, body = request(port_, '/status')
+            assert '(/e01) → (http://E01)&quot;: 1'.encode('utf-8') in body
+
+    @pytest.mark.timeout(5)
+    def test_status_page_size_cache_bounded(self):
+        with live_server(dict(self.rd)) as (_, port_):
+            for size in (25, 26, 100, 10 ** 6, 10 ** 30):
+                rr, body = request(port_, '/status?size=%d' % size)
+                assert rr.code == 200
+                assert b'entries 1 to 25 of 25, page 1 of 1' in body
+                rr, _ = request(port_, '/status/redirects.json?size=%d' % size)
+                assert rr.code == 200
+            keys = [k for k in RedirectHandler.status_cache if k[0] in ('table', 'json')]
+            # every size at or above the entry count is one page of 25
+            assert sorted(k[-1] for k in keys) == [25, 25]
+
+    @pytest.mark.timeout(5)
+    def test_status_page_size_0_large_not_cached(self, monkeypatch):
+        monkeypatch.setattr(goto_http_redirect_server.goto_http_redirect_server, 'STATUS_PAGE_SIZE_MAX', 10)
+        with live_server(dict(self.rd)) as (_, port_):
+            for path in ('/status?size=0', '/status/redirects.json?size=0'):
+                rr, body = request(port_, path)
+                assert rr.code == 200
+                assert b'http://E24' in body
+            assert not [k for k in RedirectHandler.status_cache if k[0] in ('table', 'json')]
+
+    @pytest.mark.parametrize(
+        'query, froms, count, pages',
+        (
+            pytest.param('', ['/e%02d' % i for i in range(25)], 25, 1, id='all'),
+            pytest.param('?size=10&page=3', ['/e%02d' % i for i in range(20, 25)], 25, 3, id='page 3'),
+            pytest.param('?prefix=/e1', ['/e%02d' % i for i in range(10, 20)], 10, 1, id='prefix'),
+            pytest.param('?prefix=/e1&size=4&page=2', ['/e14', '/e15', '/e16', '/e17'], 10, 3, id='prefix page'),
+            pytest.param('?prefix=/X', [], 0, 1, id='prefix none'),
+        )
+    )
+    @pytest.mark.timeout(5)
+    def test_redirects_json(self,
+                            query: str,
+                            froms: typing.List[str],
+                            count: int,
+                            pages: int):
+        with live_server(dict(self.rd)) as (_, port_):
+            rr, body = request(port_, '/status/redirects.json' + query)
+            assert rr.code == 200
+            assert rr.getheader('Content-Type').startswith('application/json')
+            doc = json.loads(body.decode('utf-8'))
+            assert [e['from'] for e in doc['redirects']] == froms
+            assert [e['to'] for e in doc['redirects']] == [f.replace('/e', 'http://E') for f in froms]
+            assert doc['count'] == count
+            assert doc['pages'] == pages
+
+    @pytest.mark.timeout(5)
+    def test_json_etag(self):
+        with live_server(dict(self.rd)) as (_, port_):
+            for path in ('/status/redirects.json', '/status/status.json'):
+                rr, _ = request(port_, path)
+                etag = rr.getheader('ETag')
+                assert etag
+                for inm in (etag, 'W/' + etag, '"other", ' + etag, '*'):
+                    rr, body = request(port_, path, headers={'If-None-Match': inm})
+                    assert rr.code == 304
+                    assert rr.getheader('ETag') == etag
+                    assert body == b''
+                rr, _ = request(port_, path, headers={'If-None-Match': '"other"'})
+                assert rr.code == 200
+            # a redirect changes the counters but not the redirects
+            rr, _ = request(port_, '/status/redirects.json')
+            etag_r = rr.getheader('ETag')
+            rr, body = request(port_, '/status/status.json')
+            etag_s = rr.getheader('ETag')
+            key = '(/e01) → (http://E01)'
+            before = json.loads(body.decode('utf-8'))['counters'].get(key, 0)
+            request(port_, '/e01')
+            rr, _ = request(port_, '/status/redirects.json', headers={'If-None-Match': etag_r})
+            assert rr.code == 304
+            rr, body = request(port_, '/status/status.json', headers={'If-None-Match': etag_s})
+            assert rr.code == 200
+            doc = json.loads(body.decode('utf-8'))
+            assert doc['counters'][key] == before + 1
+            assert doc['entries'] == 25
+
+    @pytest.mark.parametrize('name, ctype', (
+        ('status.css', 'text/css'),
+        ('sorttable.js', 'application/javascript'),
+    ))
+    @pytest.mark.timeout(5)
+    def test_status_assets(self, name: str, ctype: str):
+        with live_server(dict(self.rd)) as (_, port_):
+            _, body = request(port_, '/status')
+            head = body.decode('utf-8').split('</head>')[0]
+            assert 'sorttable={init' not in head  # not inlined
+            url = re.search(r'"(/status/%s\?v=\w+)"' % re.escape(name), head).group(1)
+            rr, body = request(port_, url)
+            assert rr.code == 200
+            assert rr.getheader('Content-Type').startswith(ctype)
+            assert 'max-age=' in rr.getheader('Cache-Control')
+            assert int(rr.getheader('Content-Length')) == len(body) > 0
+            etag = rr.getheader('ETag')
+            assert url.endswith(etag.strip('"'))
+            rr, body = request(port_, url, headers={'If-None-Match': etag})
+            assert rr.code == 304
+            assert body == b''
+
+
+    @pytest.mark.timeout(5)
+    def test_status_page_gzip(self):
+        gz = {'Accept-Encoding': 'deflate, gzip;q=0.5'}
+        with live_server(dict(self.rd)) as (_, port_):
+            _, plain = request(port_, '/status')
+            for _ in range(2):  # second request is from the cache
+                rr, body = request(port_, '/status', headers=gz)
+                assert rr.getheader('Content-Encoding') == 'gzip'
+                assert rr.getheader('Vary') == 'Accept-Encoding'
+                text = gzip.decompress(body)
+                # process information (up time) differs per request
+                sep = b'<h3>Process Information:</h3>'
+                assert text.split(sep)[0] == plain.split(sep)[0]
+                assert text.endswith(b'</html>')
+
+    @pytest.mark.parametrize(
+        'accept, gzipped',
+        (
+            pytest.param(None, False, id='none'),
+            pytest.param('gzip', True, id='gzip'),
+            pytest.param('x-gzip, br', True, id='x-gzip'),
+            pytest.param('*', True, id='*'),
+            pytest.param('gzip;q=0, *', False, id='gzip q=0'),
+            pytest.param('br', False, id='br'),
+        )
+    )
+    @pytest.mark.timeout(5)
+    def test_json_gzip(self, accept: str_None, gzipped: bool):
+        headers = {'Accept-Encoding': accept} if accept else {}
+        with live_server(dict(self.rd)) as (_, port_):
+            _, plain = request(port_, '/status/redirects.json')
+            rr, body = request(port_, '/status/redirects.json', headers=headers)
+            assert rr.getheader('Vary') == 'Accept-Encoding'
+            etag = rr.getheader('ETag')
+            if gzipped:
+                assert rr.getheader('Content-Encoding') == 'gzip'
+                assert etag.endswith('-gzip"')
+                body = gzip.decompress(body)
+            else:
+                assert rr.getheader('Content-Encoding') is None
+            assert body == plain
+            rr, _ = request(port_, '/status/redirects.json', headers={'If-None-Match': etag})
+            assert rr.code == 304
+
+
+class Test_ErrorPages(object):
+    """cached 404 and error pages of a live server"""
+
+    @pytest.mark.parametrize(
+        'url, contains, absent',
+        (
+            pytest.param('/nope', ("Not Found - '/nope'", '<code>/nope</code>'), (), id='plain'),
+            pytest.param('/a?<b>', ('<code>/a?&lt;b&gt;</code>',), ('<b>',), id='escaped'),
+            pytest.param('/' + 'x' * 3000, ('<code>/' + 'x' * 1023 + '</code>',), ('x' * 1024,), id='capped'),
+        )
+    )
+    @pytest.mark.timeout(5)
+    def test_not_found(self,
+                       url: str,
+                       contains: typing.Iterable[str],
+                       absent: typing.Iterable[str]):
+        with live_server({}) as (_, port_):
+            for _ in range(2):  # second request is from the cache
+                rr, body = request(port_, url)
+                assert rr.code == 404
+                assert rr.getheader('Content-Type') == 'text/html; charset=utf-8'
+                assert rr.getheader('Date')
+                assert int(rr.getheader('Content-Length')) == len(body)
+                text = body.decode('utf-8')
+                assert text.startswith('<!DOCTYPE html>')
+                assert text.endswith('</html>')
+                for c in contains:
+                    assert c in text
+                for a in absent:
+                    assert a not in text
+
+    @pytest.mark.timeout(5)
+    def test_not_found_minimal(self, monkeypatch):
+        monkeypatch.setattr(RedirectHandler, 'not_found_minimal', True)
+        with live_server({}) as (_, port_):
+            rr, body = request(port_, '/nope')
+            assert rr.code == 404
+            assert body == b'404 Not Found\n'
+            assert rr.getheader('Content-Type').startswith('text/plain')
+
+    @pytest.mark.parametrize('method', ('POST', 'PUT', 'DELETE'))
+    @pytest.mark.timeout(5)
+    def test_send_error(self, method: str):
+        with live_server({}) as (_, port_):
+            rr, body = request(port_, '/a', method=method)
+            assert rr.code == 501
+            assert rr.getheader('Connection') == 'close'
+            assert int(rr.getheader('Content-Length')) == len(body)
+            text = body.decode('utf-8')
+            assert ('Unsupported method (%r)' % method) in text
+            assert 'Error code: 501' in text
+
+    @pytest.mark.parametrize(
+        'url, gzipped',
+        (
+            pytest.param('/nope', False, id='small'),
+            pytest.param('/' + 'x' * 2000, True, id='large'),
+        )
+    )
+    @pytest.mark.timeout(5)
+    def test_not_found_gzip(self, url: str, gzipped: bool):
+        with live_server({}) as (_, port_):
+            _, plain = request(port_, url)
+            rr, body = request(port_, url, headers={'Accept-Encoding': 'gzip'})
+            assert rr.code == 404
+            assert rr.getheader('Vary') == 'Accept-Encoding'
+            assert int(rr.getheader('Content-Length')) == len(body)
+            if gzipped:
+                assert rr.getheader('Content-Encoding') == 'gzip'
+                body = gzip.decompress(body)
+            else:
+                assert rr.getheader('Content-Encoding') is None
+            assert body == plain
+
+    @pytest.mark.parametrize('max_age', (None, 0, 3600))
+    @pytest.mark.parametrize('minimal', (False, True))
+    @pytest.mark.parametrize('method', ('GET', 'HEAD'))
+    @pytest.mark.timeout(5)
+    def test_not_found_max_age(self, monkeypatch, max_age: typing.Optional[int], minimal: bool, method: str):
+        monkeypatch.setattr(RedirectHandler, 'not_found_max_age', max_age)
+        monkeypatch.setattr(RedirectHandler, 'not_found_minimal', minimal)
+        with live_server({}) as (_, port_):
+            rr, _ = request(port_, '/nope', method=method)
+            assert rr.code == 404
+            if max_age is None:
+                assert rr.getheader('Cache-Control') is None
+            else:
+                assert rr.getheader('Cache-Control') == 'max-age=%d' % max_age
+
+
+class Test_EntryCodeMaxAge(object):
+    """per-entry status code and Cache-Control"""
+
+    @pytest.mark.parametrize(
+        'entry, code, cache_control',
+        (
+            pytest.param(Re_Entry('/a', 'http://A'), int(REDIRECT_CODE_DEFAULT), None, id='defaults'),
+            pytest.param(Re_Entry('/a', 'http://A', code=http.HTTPStatus.MOVED_PERMANENTLY), 301, None, id='code'),
+            pytest.param(Re_Entry('/a', 'http://A', max_age=86400), int(REDIRECT_CODE_DEFAULT), 'max-age=86400', id='max-age'),
+            pytest.param(Re_Entry('/a', 'http://A', code=http.HTTPStatus.FOUND, max_age=0), 302, 'max-age=0', id='both'),
+        )
+    )
+    @pytest.mark.timeout(5)
+    def test_redirect(self, entry: Re_Entry, code: int, cache_control: str_None):
+        with live_server({'/a': entry}) as (_, port_):
+            for method in ('GET', 'HEAD'):
+                rr, _ = request(port_, '/a', method=method)
+                assert rr.code == code
+                assert rr.getheader('Location') == 'http://A'
+                assert rr.getheader('Cache-Control') == cache_control
+            rr, body = request(port_, '/status/redirects.json')
+            doc = json.loads(body.decode('utf-8'))
+            assert doc['redirects'][0]['code'] == (None if entry.code is None else code)
+            assert doc['redirects'][0]['max_age'] == entry.max_age
+
+
+class Test_RateLimit(object):
+    """per-client rate limiting of a live server"""
+
+    @pytest.mark.timeout(5)
+    def test_rate_limit(self, monkeypatch):
+        monkeypatch.setattr(RedirectServer, 'rate_limiter', RateLimiter(0.01, 2, 100))
+        with live_server({'/a': Re_Entry('/a', 'http://A')}) as (_, port_):
+            for _ in range(2):
+                rr, _ = request(port_, '/a')
+                assert rr.code == int(REDIRECT_CODE_DEFAULT)
+            rr, body = request(port_, '/a')
+            assert rr.code == 429
+            assert 99 <= int(rr.getheader('Retry-After')) <= 100
+            assert body == b''
+
+    @pytest.mark.timeout(5)
+    def test_rate_limit_forwarded(self, monkeypatch):
+        monkeypatch.setattr(RedirectServer, 'rate_limiter', RateLimiter(0.01, 1, 100))
+        monkeypatch.setattr(RedirectServer, 'trusted_proxies', [ipaddress.ip_network('127.0.0.0/8')])
+        with live_server({'/a': Re_Entry('/a', 'http://A')}) as (_, port_):
+            # each forwarded client has a bucket, the trusted proxy has none
+            for client in ('192.0.2.1', '192.0.2.2', '127.0.0.9, 192.0.2.3'):
+                rr, _ = request(port_, '/a', headers={'X-Forwarded-For': client})
+                assert rr.code == int(REDIRECT_CODE_DEFAULT)
+            # the right-most untrusted address is the client, not the spoofable left-most
+            rr, _ = request(port_, '/a', headers={'X-Forwarded-For': '198.51.100.1, 192.0.2.1'})
+            assert rr.code == 429
+
+    @pytest.mark.timeout(5)
+    def test_rate_limit_full_head(self, monkeypatch):
+        monkeypatch.setattr(RedirectServer, 'rate_limiter', RateLimiter(0.01, 1, 100))
+        # a head larger than the read buffer, the 429 is written before it is read
+        head = b'GET /a HTTP/1.1\r\nHost: h\r\n' \
+            + b''.join(b'X-Pad-%02d: %s\r\n' % (i, b'p' * 300) for i in range(60)) \
+            + b'\r\n'
+        with live_server({'/a': Re_Entry('/a', 'http://A')}) as (_, port_):
+            assert raw_request(port_, head).split(b' ', 2)[1] == b'%d' % REDIRECT_CODE_DEFAULT
+            for _ in range(3):
+                with socket.create_connection((IP, port_), timeout=3) as sock:
+                    sock.sendall(head)
+                    resp = b''
+                    chunk = sock.recv(65536)
+                    while chunk:
+                        resp += chunk
+                        chunk = sock.recv(65536)
+                    assert resp.split(b' ', 2)[1] == b'429'
+                    # the server closed without a reset, the client may still write
+                    time.sleep(0.05)
+                    sock.send(b'\r\n')
+
+
+class Test_LoadShedding(object):
+    """admission control of a live server"""
+
+    @staticmethod
+    def wait_in_flight(server: RedirectServer, count: int):
+        for _ in range(100):
+            if server.in_flight == count:
+                return
+            time.sleep(0.01)
+        assert server.in_flight == count
+
+    @pytest.mark.parametrize('drop', (False, True))
+    @pytest.mark.timeout(5)
+    def test_shed(self, monkeypatch, drop: bool):
+        monkeypatch.setattr(RedirectServer, 'max_in_flight', 1)
+        monkeypatch.setattr(RedirectServer, 'shed_drop', drop)
+        monkeypatch.setattr(RedirectServer, 'shed_retry_after', 7)
+        monkeypatch.setattr(RedirectServer, 'shed_exempt_paths', ['/status'])
+        with live_server({'/a': Re_Entry('/a', 'http://A')}) as (server, port_):
+            # a slow client holds the only request slot
+            slow = socket.create_connection((IP, port_))
+            try:
+                slow.sendall(b'GET /a HT')
+                self.wait_in_flight(server, 1)
+                if drop:
+                    with pytest.raises((client.RemoteDisconnected, ConnectionError)):
+                        request(port_, '/a')
+                else:
+                    rr, body = request(port_, '/a')
+                    assert rr.code == 503
+                    assert rr.getheader('Retry-After') == '7'
+                    assert body == b''
+                # exempt paths are not shed
+                for path in ('/status', '/status/status.json'):
+                    rr, _ = request(port_, path)
+                    assert rr.code == 200
+                key = 'shed (dropped)' if drop else 'shed (503)'
+                rr, body = request(port_, '/status/status.json')
+                assert json.loads(body.decode('utf-8'))['server_counters'][key] >= 1
+            finally:
+                slow.close()
+            self.wait_in_flight(server, 0)
+            rr, _ = request(port_, '/a')
+            assert rr.code == int(REDIRECT_CODE_DEFAULT)
+
+
+def raw_request(port_: int, data: bytes, trickle: float = 0) -> bytes:
+    """send raw `data` to the live_server, `trickle` seconds between bytes"""
+    sock = socket.create_connection((IP, port_), timeout=3)
+    try:
+        if trickle:
+            try:
+                for i in range(len(data)):
+                    sock.sendall(data[i:i + 1])
+                    time.sleep(trickle)
+            except OSError:
+                pass  # server closed the connection
+        else:
+            sock.sendall(data)
+        resp = b''
+        while True:
+            try:
+                chunk = sock.recv(65536)
+            except ConnectionResetError:
+                break
+            if not chunk:
+                break
+            resp += chunk
+        return resp
+    finally:
+        sock.close()
+
+
+class Test_SlowClients(object):
+    """request head deadline and size limits of a live server"""
+
+    rd = {'/a': Re_Entry('/a', 'http://A')}
+
+    @pytest.mark.parametrize(
+        'data, status',
+        (
+            pytest.param(b'GET /a HTTP/1.1\r\nHost: a\r\n\r\n', b'308', id='ok'),
+            pytest.param(b'GET /a\r\n', b'', id='HTTP/0.9'),
+            pytest.param(b'GET /' + b'a' * 300 + b' HTTP/1.1\r\n\r\n', b'414', id='request line'),
+            pytest.param(b'GET /a HTTP/1.1\r\n' + b'X-A: 1\r\n' * 10 + b'\r\n', b'308', id='header count max'),
+            pytest.param(b'GET /a HTTP/1.1\r\n' + b'X-A: 1\r\n' * 11 + b'\r\n', b'431', id='header count'),
+            pytest.param(b'GET /a HTTP/1.1\r\nX-A: ' + b'a' * 300 + b'\r\n\r\n', b'431', id='header bytes'),
+        )
+    )
+    @pytest.mark.timeout(5)
+    def test_limits(self, monkeypatch, data: bytes, status: bytes):
+        monkeypatch.setattr(RedirectHandler, 'max_request_line', 256)
+        monkeypatch.setattr(RedirectHandler, 'max_headers', 10)
+        monkeypatch.setattr(RedirectHandler, 'max_header_bytes', 256)
+        with live_server(dict(self.rd)) as (_, port_):
+            resp = raw_request(port_, data)
+            if status:
+                assert resp.split(b' ', 2)[1] == status
+            else:  # HTTP/0.9 responses have no status line
+                assert not resp.startswith(b'HTTP/')
+
+    @pytest.mark.parametrize(
+        'count, status',
+        (
+            pytest.param(150, b'308', id='over http.client limit'),
+            pytest.param(200, b'308', id='max'),
+            pytest.param(201, b'431', id='over max'),
+        )
+    )
+    @pytest.mark.timeout(5)
+    def test_max_headers_above_100(self, monkeypatch, count: int, status: bytes):
+        monkeypatch.setattr(RedirectHandler, 'max_headers', 200)
+        head = b'GET /a HTTP/1.1\r\n' \
+            + b''.join(b'X-A%d: 1\r\n' % i for i in range(count - 1)) \
+            + b'Connection: close\r\n\r\n'
+        with live_server(dict(self.rd)) as (_, port_):
+            resp = raw_request(port_, head)
+            assert resp.split(b' ', 2)[1] == status
+
+    @pytest.mark.timeout(5)
+    def test_head_timeout(self, monkeypatch):
+        monkeypatch.setattr(RedirectHandler, 'head_timeout', 0.5)
+        with live_server(dict(self.rd)) as (_, port_):
+            start = time.monotonic()
+            # each byte arrives well within the socket timeout, the whole
+            # head does not arrive within the deadline
+            resp = raw_request(port_, b'GET /a HTTP/1.1\r\n' + b'X-A: 1\r\n' * 20 + b'\r\n', trickle=0.05)
+            assert resp.split(b' ', 2)[1] == b'408'
+            assert time.monotonic() - start < 2.5
+            rr, body = request(port_, '/status/status.json')
+            assert json.loads(body.decode('utf-8'))['server_counters']['request head timeout (408)'] >= 1
+
+    @pytest.mark.timeout(10)
+    def test_slow_clients_do_not_block(self, monkeypatch):
+        monkeypatch.setattr(RedirectHandler, 'head_timeout', 3)
+        with live_server(dict(self.rd)) as (_, port_):
+            slow = []
+            try:
+                for _ in range(20):
+                    sock = socket.create_connection((IP, port_))
+                    sock.sendall(b'GET /a HTTP/1.1\r\nX-Slow: ')
+                    slow.append(sock)
+                start = time.monotonic()
+                for _ in range(20):
+                    rr, _ = request(port_, '/a')
+                    assert rr.code == int(REDIRECT_CODE_DEFAULT)
+                assert time.monotonic() - start < 2
+                # the slow clients are timed out
+                for sock in slow:
+                    sock.settimeout(5)
+                    assert sock.recv(1024).split(b' ', 2)[1] == b'408'
+            finally:
+                for sock in slow:
+                    sock.close()
+
+
+class Test_HealthCheck(object):
+    """health and readiness paths of a live server"""
+
+    @pytest.mark.parametrize(
+        'path, ready, code',
+        (
+            pytest.param('/health', False, 200, id='health'),
+            pytest.param('/health', True, 200, id='health ready'),
+            pytest.param('/ready', False, 503, id='not ready'),
+            pytest.param('/ready', True, 200, id='ready'),
+        )
+    )
+    @pytest.mark.timeout(5)
+    def test_health(self, monkeypatch, caplog, path: str, ready: bool, code: int):
+        ghrs = goto_http_redirect_server.goto_http_redirect_server
+        monkeypatch.setattr(RedirectHandler, 'health_path', '/health')
+        monkeypatch.setattr(RedirectHandler, 'ready_path', '/ready')
+        monkeypatch.setattr(ghrs, 'server_ready', ready)
+        with live_server({}) as (_, port_):
+            caplog.set_level(logging.DEBUG)
+            counters = (dict(ghrs.redirect_counter), dict(ghrs.server_counter))
+            rr, body = request(port_, path)
+            assert rr.code == code
+            assert body == bytes('%s\n' % http.HTTPStatus(code).phrase, 'ascii')
+            assert rr.getheader('Cache-Control') == 'no-store'
+            assert (rr.getheader('Retry-After') is not None) == (code == 503)
+            rr, body = request(port_, path, method='HEAD')
+            assert rr.code == code
+            assert body == b''
+            # not logged nor counted
+            assert path not in caplog.text
+            assert counters == (dict(ghrs.redirect_counter), dict(ghrs.server_counter))
+
+    @pytest.mark.timeout(10)
+    def test_ready_during_reload(self, monkeypatch):
+        ghrs = goto_http_redirect_server.goto_http_redirect_server
+        monkeypatch.setattr(RedirectHandler, 'ready_path', '/ready')
+        monkeypatch.setattr(ghrs, 'server_ready', True)
+        monkeypatch.setattr(ghrs, 'STATUS_PATH', '/status')
+        monkeypatch.setattr(ghrs, 'RELOAD_PATH', '/reload')
+        loading = threading.Event()
+        release = threading.Event()
+
+        def load_slow(*_args) -> Re_Entry_Dict:
+            loading.set()
+            release.wait(5)
+            return {'/b': Re_Entry('/b', 'http://B')}
+
+        monkeypatch.setattr(RedirectsLoader, 'load_redirects', staticmethod(load_slow))
+        with live_server({'/a': Re_Entry('/a', 'http://A')}) as (server_, port_):
+            rt = threading.Thread(target=server_.reload)
+            rt.start()
+            try:
+                assert loading.wait(5)
+                # the current redirects are served while the new ones load
+                rr, _ = request(port_, '/ready')
+                assert rr.code == 200
+                rr, _ = request(port_, '/a')
+                assert rr.code == int(REDIRECT_CODE_DEFAULT)
+            finally:
+                release.set()
+                rt.join(5)
+            rr, _ = request(port_, '/ready')
+            assert rr.code == 200
+            rr, _ = request(port_, '/b')
+            assert rr.code == int(REDIRECT_CODE_DEFAULT)
+
+
+class Test_MicroResponses(object):
+    """built-in favicon and robots.txt responses of a live server"""
+
+    @pytest.mark.parametrize(
+        'path, attr, data, type_',
+        (
+            pytest.param('/favicon.ico', 'favicon_file', b'\x00\x00\x01\x00',
+                         'image/vnd.microsoft.icon', id='favicon'),
+            pytest.param('/robots.txt', 'robots_file',
+                         b'User-agent: *\nDisallow: /\n', 'text/plain',
+                         id='robots'),
+        )
+    )
+    @pytest.mark.timeout(5)
+    def test_file(self, monkeypatch, tmp_path, path: str, attr: str,
+                  data: bytes, type_: str):
+        ghrs = goto_http_redirect_server.goto_http_redirect_server
+        file_ = tmp_path / path.lstrip('/')
+        file_.write_bytes(data)
+        monkeypatch.setattr(RedirectHandler, attr, str(file_))
+        with live_server({}) as (_, port_):
+            counters = dict(ghrs.redirect_counter)
+            rr, body = request(port_, path)
+            assert rr.code == 200
+            assert body == data
+            assert rr.getheader('Content-Type') in (type_, 'image/x-icon')
+            assert rr.getheader('Cache-Control') == ghrs.MICRO_CACHE_CONTROL
+            rr, body = request(port_, path, method='HEAD')
+            assert rr.code == 200
+            assert body == b''
+            assert counters == dict(ghrs.redirect_counter)
+
+    @pytest.mark.parametrize('path', ('/favicon.ico', '/robots.txt'))
+    @pytest.mark.parametrize('attr', (None, 'missing'))
+    @pytest.mark.timeout(5)
+    def test_no_content(self, monkeypatch, tmp_path, path: str, attr):
+        ghrs = goto_http_redirect_server.goto_http_redirect_server
+        if attr:
+            missing = str(tmp_path / 'missing')
+            monkeypatch.setattr(RedirectHandler, 'favicon_file', missing)
+            monkeypatch.setattr(RedirectHandler, 'robots_file', missing)
+        with live_server({}) as (_, port_):
+            for method in ('GET', 'HEAD'):
+                rr, body = request(port_, path, method=method)
+                assert rr.code == 204
+                assert body == b''
+                assert rr.getheader('Cache-Control') == ghrs.MICRO_CACHE_CONTROL
+
+    def test_reserved(self):
+        assert '/favicon.ico' in REDIRECT_PATHS_NOT_ALLOWED
+        entrys = RedirectsLoader.clean_redirects(
+            {'/favicon.ico': Re_Entry('/favicon.ico', 'b'),
+             '/robots.txt': Re_Entry('/robots.txt', 'b')}
+        )
+        assert list(entrys) == ['/robots.txt']
+
+    @pytest.mark.timeout(5)
+    def test_robots_redirect(self, monkeypatch, tmp_path):
+        robots = tmp_path / 'robots.txt'
+        robots.write_bytes(b'User-agent: *\n')
+        monkeypatch.setattr(RedirectHandler, 'robots_file', str(robots))
+        # a redirect entry takes precedence over the built-in response
+        with live_server({'/robots.txt': Re_Entry('/robots.txt', 'http://R/robots.txt')}) as (_, port_):
+            for method in ('GET', 'HEAD'):
+                rr, _ = request(port_, '/robots.txt', method=method)
+                assert rr.code == int(REDIRECT_CODE_DEFAULT)
+                assert rr.getheader('Location') == 'http://R/robots.txt'
+        with live_server({}) as (_, port_):
+            rr, body = request(port_, '/robots.txt')
+            assert rr.code == 200
+            assert body == b'User-agent: *\n'
+
+
+class Test_ReloadControl(object):
+    """coalescing of reload requests"""
+
+    def test_merge(self):
+        ghrs = goto_http_redirect_server.goto_http_redirect_server
+        rc = ReloadControl(10)
+        gen = RedirectHandler.generation
+        merged = ghrs.server_counter['reload merged']
+        assert not rc.start(0)
+        assert rc.request() == gen + 1
+        assert rc.request() == gen + 1
+        assert ghrs.server_counter['reload merged'] == merged + 1
+        assert rc.start(0)
+        # requested while loading, covered by the next reload
+        assert rc.request() == gen + 2
+        assert rc.request() == gen + 2
+        assert ghrs.server_counter['reload merged'] == merged + 2
+        # one reload loading at a time
+        assert rc.due_in(100) is None
+        assert not rc.start(100)
+        rc.done()
+        assert rc.due_in(5) == 5
+        assert rc.pending == gen + 2
+        # least interval between reload starts
+        assert not rc.start(9.9)
+        assert rc.start(10)
+        assert rc.pending is None
+        assert not rc.start(100)
+
+    @pytest.mark.timeout(5)
+    def test_reload_path(self, monkeypatch):
+        ghrs = goto_http_redirect_server.goto_http_redirect_server
+        monkeypatch.setattr(ghrs, 'reload_control', ReloadControl(60))
+        monkeypatch.setattr(ghrs, 'STATUS_PATH', '/status')
+        monkeypatch.setattr(ghrs, 'RELOAD_PATH', '/reload')
+        monkeypatch.setattr(ghrs, 'Redirect_FromTo_List', [('/b', 'http://B')])
+        monkeypatch.setattr(ghrs, 'Redirect_Files_List', [])
+        with live_server({'/a': Re_Entry('/a', 'http://A')}) as (_, port_):
+            gen = RedirectHandler.generation
+            rr, body = request(port_, '/reload')
+            assert rr.code == 202
+            assert rr.getheader('Redirect-Server-Reload-Generation') == str(gen + 1)
+            assert b'generation %d will include it' % (gen + 1) in body
+            while RedirectHandler.generation == gen:
+                time.sleep(0.05)
+            rr, _ = request(port_, '/b')
+            assert rr.code == REDIRECT_CODE_DEFAULT
+            # within the least interval so it stays pending
+            rr, _ = request(port_, '/reload')
+            assert rr.getheader('Redirect-Server-Reload-Generation') == str(gen + 2)
+            time.sleep(0.3)
+            assert RedirectHandler.generation == gen + 1
+            assert ghrs.reload_control.pending == gen + 2
+
+    @pytest.mark.timeout(5)
+    def test_wakeup(self, monkeypatch):
+        """reload and shutdown do not wait for the long poll interval"""
+        ghrs = goto_http_redirect_server.goto_http_redirect_server
+        rc = ReloadControl(0)
+        monkeypatch.setattr(ghrs, 'reload_control', rc)
+        monkeypatch.setattr(ghrs, 'STATUS_PATH', '/status')
+        monkeypatch.setattr(ghrs, 'RELOAD_PATH', None)
+        monkeypatch.setattr(ghrs, 'Redirect_FromTo_List', [])
+        monkeypatch.setattr(ghrs, 'Redirect_Files_List', [])
+        with RedirectServer((IP, 0), new_redirect_handler({})) as redirect_server:
+            rc.wakeup = redirect_server.wakeup
+            st = threading.Thread(target=redirect_server.serve_forever,
+                                  kwargs={'poll_interval': 60})
+            st.start()
+            try:
+                gen = rc.request()
+                while RedirectHandler.generation != gen:
+                    time.sleep(0.01)
+            finally:
+                redirect_server.shutdown()
+                st.join(1)
+            assert not st.is_alive()
+
+
+class Test_Drain(object):
+    """drain of in-flight requests at shutdown"""
+
+    @pytest.mark.parametrize(
+        'sleep, timeout, drained, aborted',
+        (
+            pytest.param(0.5, 5, 1, 0, id='drained'),
+            pytest.param(1, 0.2, 0, 1, id='aborted'),
+        )
+    )
+    @pytest.mark.timeout(10)
+    def test_drain(self, monkeypatch, sleep: float, timeout: float,
+                   drained: int, aborted: int):
+        do_GET = RedirectHandler.do_GET
+
+        def do_GET_slow(self_):
+            time.sleep(sleep)
+            do_GET(self_)
+
+        monkeypatch.setattr(RedirectHandler, 'do_GET', do_GET_slow)
+        with live_server({'/a': Re_Entry('/a', 'http://A')}) as (server_, port_):
+            results = []
+            client_thread = threading.Thread(
+                target=lambda: results.append(raw_request(
+                    port_, b'GET /a HTTP/1.1\r\nHost: a\r\n\r\n')))
+            client_thread.start()
+            while server_.in_flight < 1:
+                time.sleep(0.01)
+            server_.shutdown()
+            start = time.monotonic()
+            assert server_.drain(timeout) == (drained, aborted)
+            assert time.monotonic() - start < min(timeout, sleep) + 0.5
+            client_thread.join(5)
+            # let an aborted handler finish before the test ends
+            while server_.in_flight:
+                time.sleep(0.05)
+        if drained:
+            assert results[0].startswith(b'HTTP/1.1 308 ')
+        else:
+            assert not results or not results[0].startswith(b'HTTP/1.1 308 ')
+
+
+@pytest.mark.skipif(not hasattr(signal, 'SIGUSR2'), reason='Unix only')
+class Test_HotRestart(object):
+    """hot restart of a server process on localhost"""
+
+    @pytest.mark.timeout(60)
+    def test_hot_restart(self, tmp_path):
+        with socket.socket() as sock:
+            sock.bind((IP, 0))
+            port_ = sock.getsockname()[1]
+        script = goto_http_redirect_server.goto_http_redirect_server.__file__
+        log_ = tmp_path / 'log.txt'
+        with open(str(log_), 'w') as log_file:
+            old = subprocess.Popen(
+                [sys.executable, script, '--ip', IP, '--port', str(port_),
+                 '--from-to', '/a', 'http://A', '--drain-timeout', '5'],
+                stdout=log_file, stderr=subprocess.STDOUT
+            )
+        new_pid = None
+        try:
+            # wait for the old process to listen
+            while True:
+                try:
+                    socket.create_connection((IP, port_)).close()
+                    break
+                except ConnectionRefusedError:
+                    assert old.poll() is None
+                    time.sleep(0.05)
+            stop = threading.Event()
+            codes = defaultdict(int)  # type: typing.DefaultDict[typing.Any, int]
+
+            def client_thread():
+                while not stop.is_set():
+                    try:
+                        rr, _ = request(port_, '/a')
+                        codes[rr.code] += 1
+                    except Exception as ex:
+                        codes[repr(ex)] += 1
+
+            clients = [threading.Thread(target=client_thread) for _ in range(2)]
+            for thread in clients:
+                thread.start()
+            time.sleep(0.3)
+            old.send_signal(signal.SIGUSR2)
+            assert old.wait(30) == 0
+            time.sleep(0.3)
+            stop.set()
+            for thread in clients:
+                thread.join(5)
+            log_text = log_.read_text()
+            match = re.search(r'Hot restart: process (\d+) is ready', log_text)
+            assert match, log_text
+            new_pid = int(match.group(1))
+            assert 'Drained ' in log_text
+            # no request failed during the restart
+            assert dict(codes).keys() == {int(REDIRECT_CODE_DEFAULT)}, log_text
+            assert codes[int(REDIRECT_CODE_DEFAULT)] > 10
+            rr, _ = request(port_, '/a')
+            assert rr.code == REDIRECT_CODE_DEFAULT
+        finally:
+            if old.poll() is None:
+                old.kill()
+            if new_pid is not None:
+                os.kill(new_pid, signal.SIGTERM)
+                for _ in range(100):
+                    try:
+                        os.kill(new_pid, 0)
+                    except OSError:
+                        break
+                    time.sleep(0.05)
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='Unix only')
+class Test_Systemd(object):
+    """systemd socket activation and notifications"""
+
+    @staticmethod
+    @contextlib.contextmanager
+    def notify_socket(monkeypatch, tmp_path):
+        """datagram socket at NOTIFY_SOCKET"""
+        path = str(tmp_path / 'notify')
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.bind(path)
+            sock.settimeout(2)
+            monkeypatch.setenv('NOTIFY_SOCKET', path)
+            yield sock
+
+    def test_sd_notify(self, monkeypatch, tmp_path):
+        ghrs = goto_http_redirect_server.goto_http_redirect_server
+        monkeypatch.delenv('NOTIFY_SOCKET', raising=False)
+        assert not ghrs.sd_notify('READY=1')
+        with self.notify_socket(monkeypatch, tmp_path) as sock:
+            assert ghrs.sd_notify('READY=1\nSTATUS=ok')
+            assert sock.recv(1024) == b'READY=1\nSTATUS=ok'
+
+    @pytest.mark.parametrize(
+        'pid, fds, expect',
+        (
+            pytest.param(None, None, [], id='none'),
+            pytest.param('self', '2', [3, 4], id='two'),
+            pytest.param('parent', '1', [3], id='parent process'),
+            pytest.param('1', '1', [], id='other process'),
+            pytest.param('self', 'x', [], id='bad'),
+        )
+    )
+    def test_sd_listen_fds(self, monkeypatch, pid, fds, expect):
+        ghrs = goto_http_redirect_server.goto_http_redirect_server
+        for name, value in (('LISTEN_PID', pid), ('LISTEN_FDS', fds)):
+            if value is None:
+                monkeypatch.delenv(name, raising=False)
+            else:
+                monkeypatch.setenv(name, {'self': str(os.getpid()),
+                                           'parent': str(os.getppid())}.get(value, value))
+        assert ghrs.sd_listen_fds() == expect
+        assert 'LISTEN_FDS' not in os.environ
+
+    @pytest.mark.parametrize(
+        'usec, pid, any_pid, expect',
+        (
+            pytest.param(None, None, False, None, id='none'),
+            pytest.param('1000000', None, False, 0.5, id='no pid'),
+            pytest.param('1000000', 'self', False, 0.5, id='this pid'),
+            pytest.param('1000000', '1', False, None, id='other pid'),
+            pytest.param('1000000', '1', True, 0.5, id='any pid'),
+        )
+    )
+    def test_sd_watchdog_interval(self, monkeypatch, usec, pid, any_pid, expect):
+        ghrs = goto_http_redirect_server.goto_http_redirect_server
+        for name, value in (('WATCHDOG_USEC', usec), ('WATCHDOG_PID', pid)):
+            if value is None:
+                monkeypatch.delenv(name, raising=False)
+            else:
+                monkeypatch.setenv(name, str(os.getpid()) if value == 'self' else value)
+        assert ghrs.sd_watchdog_interval(any_pid) == expect
+
+    @pytest.mark.timeout(5)
+    def test_watchdog(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(RedirectServer, 'watchdog_interval', 0.1)
+        with self.notify_socket(monkeypatch, tmp_path) as sock:
+            with live_server({}):
+                assert sock.recv(1024) == b'WATCHDOG=1'
+                start = time.monotonic()
+                assert sock.recv(1024) == b'WATCHDOG=1'
+                assert time.monotonic() - start > 0.05
+
+    # stand-in for sudo: env_reset keeps only PATH and the --preserve-env
+    # variables, the command runs in a child process
+    FAKE_SUDO = """#!/usr/bin/env bash
+echo "${@}" > "${0}.args"
+preserve=
+while [ ${#} -gt 0 ]; do
+    case ${1} in
+        --preserve-env=*) preserve=${1#*=}; shift;;
+        --close-from=*) shift;;
+        -u) shift; shift;;
+        --) shift; break;;
+        *) break;;
+    esac
+done
+declare -a keep=("PATH=${PATH}")
+IFS=, read -r -a names <<< "${preserve}"
+for name in "${names[@]}"; do
+    if [ -n "${!name+x}" ]; then
+        keep+=("${name}=${!name}")
+    fi
+done
+env -i "${keep[@]}" "${@}" &
+wait ${!}
+"""
+
+    @pytest.mark.skipif(not shutil.which('bash') or not hasattr(socket, 'AF_UNIX'),
+                        reason='requires bash')
+    @pytest.mark.timeout(20)
+    def test_service_wrapper_sudo(self, monkeypatch, tmp_path):
+        """
+        the service wrapper script option -u USER passes socket activation,
+        notifications and the watchdog through sudo to the server, a child
+        process of sudo
+        """
+        wrapper = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               os.pardir, os.pardir, 'service', 'goto_http_redirect_server.sh')
+        script = goto_http_redirect_server.goto_http_redirect_server.__file__
+        bin_ = tmp_path / 'bin'
+        bin_.mkdir()
+        sudo = bin_ / 'sudo'
+        sudo.write_text(self.FAKE_SUDO)
+        sudo.chmod(0o755)
+        conf = tmp_path / 'goto.conf'
+        conf.write_text('GOTO_FILE_SCRIPT="%s %s"\n'
+                        'declare -ag GOTO_ARGV=(--from-to /a http://A)\n' % (sys.executable, script))
+        env = dict(os.environ,
+                   PATH=str(bin_) + os.pathsep + os.environ.get('PATH', ''),
+                   GOTO_CONF=str(conf),
+                   LISTEN_FDS='1',
+                   WATCHDOG_USEC='200000')
+        with self.notify_socket(monkeypatch, tmp_path) as notify, socket.socket() as listener:
+            env['NOTIFY_SOCKET'] = os.environ['NOTIFY_SOCKET']
+            listener.bind((IP, 0))
+            listener.listen(5)
+            fd = listener.fileno()
+            # as systemd, the listening socket is file descriptor 3 and
+            # LISTEN_PID is the main process, here the wrapper then sudo
+            proc = subprocess.Popen(
+                ['bash', '-c', 'exec 3<&%d %d<&-; export LISTEN_PID=${$}; exec bash "${0}" "${@}"' % (fd, fd),
+                 wrapper, '-u', 'nobody'],
+                env=env, pass_fds=(fd,), start_new_session=True,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            try:
+                notify.settimeout(10)
+                messages = [notify.recv(1024)]
+                while not messages[-1].startswith(b'READY=1'):
+                    messages.append(notify.recv(1024))
+                messages.append(notify.recv(1024))
+                assert b'WATCHDOG=1' in messages
+                rr, _ = request(listener.getsockname()[1], '/a')
+                assert rr.code == int(REDIRECT_CODE_DEFAULT)
+                args = (bin_ / 'sudo.args').read_text()
+                assert '-u nobody --close-from=4 --' in args
+            finally:
+                os.killpg(proc.pid, signal.SIGTERM)
+                proc.wait(5)
+
+    @pytest.mark.timeout(5)
+    def test_from_socket(self):
+        ghrs = goto_http_redirect_server.goto_http_redirect_server
+        with socket.socket() as listener:
+            listener.bind((IP, 0))
+            listener.listen(5)
+            sock = ghrs.socket_from_fd(os.dup(listener.fileno()))
+        server_ = RedirectServer.from_socket(
+            sock, new_redirect_handler({'/a': Re_Entry('/a', 'http://A')}))
+        with server_:
+            port_ = server_.server_address[1]
+            st = threading.Thread(target=server_.serve_forever)
+            st.start()
+            try:
+                rr, _ = request(port_, '/a')
+                assert rr.code == REDIRECT_CODE_DEFAULT
+            finally:
+                server_.shutdown()
+                st.join(2)
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='Unix only')
+class Test_UnixSocket(object):
+    """RedirectServer listening on a Unix domain socket"""
+
+    @staticmethod
+    @contextlib.contextmanager
+    def unix_server(path: str):
+        redirect_server = RedirectServer.unix(
+            path, new_redirect_handler({'/a': Re_Entry('/a', 'http://A')}), 0o600)
+        with redirect_server:
+            st = threading.Thread(target=redirect_server.serve_forever)
+            st.start()
+            try:
+                yield redirect_server
+            finally:
+                redirect_server.shutdown()
+                st.join(2)
+
+    @staticmethod
+    def unix_request(path: str, data: bytes) -> bytes:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(3)
+            sock.connect(path)
+            sock.sendall(data)
+            resp = b''
+            chunk = sock.recv(65536)
+            while chunk:
+                resp += chunk
+                chunk = sock.recv(65536)
+            return resp
+
+    @pytest.mark.timeout(5)
+    def test_unix(self, tmp_path):
+        path = str(tmp_path / 'goto.sock')
+        # a stale socket file is replaced
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+            stale.bind(path)
+        with self.unix_server(path) as server_:
+            assert os.stat(path).st_mode & 0o777 == 0o600
+            assert server_.address_text() == 'unix:' + path
+            resp = self.unix_request(path, b'GET /a HTTP/1.1\r\nHost: a\r\n\r\n')
+            assert resp.startswith(b'HTTP/1.1 308 ')
+            assert b'\r\nLocation: http://A\r\n' in resp
+        assert not os.path.exists(path)
+
+    @pytest.mark.parametrize('trust', (False, True))
+    @pytest.mark.timeout(5)
+    def test_unix_trust(self, monkeypatch, caplog, tmp_path, trust: bool):
+        monkeypatch.setattr(RedirectServer, 'rate_limiter', RateLimiter(0.01, 1, 100))
+        monkeypatch.setattr(RedirectServer, 'unix_trust', trust)
+        caplog.set_level(logging.DEBUG)
+        path = str(tmp_path / 'goto.sock')
+        with self.unix_server(path):
+            codes = []
+            for client_ in ('192.0.2.1', '192.0.2.2'):
+                resp = self.unix_request(
+                    path,
+                    b'GET /a HTTP/1.1\r\nX-Forwarded-For: %s\r\n\r\n'
+                    % client_.encode())
+                codes.append(resp.split(b' ', 2)[1])
+        if trust:
+            # each forwarded client has its own rate limit
+            assert codes == [b'308', b'308']
+            assert '192.0.2.2:0 ' in caplog.text
+        else:
+            # all requests are one client
+            assert codes == [b'308', b'429']
+
+
+class Test_Listen(object):
+    """RedirectServer listening on several --listen addresses"""
+
+    @pytest.mark.parametrize(
+        'address, family, bind_address',
+        (
+            ('127.0.0.3:80', socket.AF_INET, ('127.0.0.3', 80)),
+            ('0.0.0.0:0', socket.AF_INET, ('0.0.0.0', 0)),
+            ('[::]:8080', socket.AF_INET6, ('::', 8080)),
+            ('[::1]:80', socket.AF_INET6, ('::1', 80)),
+        )
+    )
+    def test_parse_listen(self, address: str, family: int, bind_address):
+        ghrs = goto_http_redirect_server.goto_http_redirect_server
+        assert ghrs.parse_listen(address) == (family, bind_address)
+
+    @pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='Unix only')
+    def test_parse_listen_unix(self):
+        ghrs = goto_http_redirect_server.goto_http_redirect_server
+        assert ghrs.parse_listen('unix:/run/a.sock') == \
+            (socket.AF_UNIX, '/run/a.sock')
+
+    @pytest.mark.parametrize(
+        'address',
+        ('', '80', '127.0.0.3', '127.0.0.3:', '127.0.0.3:http',
+         '127.0.0.3:65536', 'localhost:80', '::1:80', '[127.0.0.3]:80',
+         '[::1]', 'unix:')
+    )
+    def test_parse_listen_bad(self, address: str):
+        ghrs = goto_http_redirect_server.goto_http_redirect_server
+        with pytest.raises(ValueError):
+            ghrs.parse_listen(address)
+
+    @pytest.mark.skipif(not socket.has_ipv6, reason='IPv6 only')
+    @pytest.mark.timeout(5)
+    def test_listen(self, caplog, tmp_path):
+        """one process serves every address with the same counters"""
+        caplog.set_level(logging.DEBUG)
+        ghrs = goto_http_redirect_server.goto_http_redirect_server
+        addresses = [IP + ':0', '[::]:0']
+        if hasattr(socket, 'AF_UNIX'):
+            addresses.append('unix:' + str(tmp_path / 'goto.sock'))
+        redirect_server = RedirectServer.listen(
+            addresses, new_redirect_handler({'/listen': Re_Entry('/listen', 'http://A')}))
+        with redirect_server:
+            st = threading.Thread(target=redirect_server.serve_forever)
+            st.start()
+            try:
+                key = '(/listen) → (http://A)'
+                count = ghrs.redirect_counter[key]
+                texts = redirect_server.listen_addresses()
+                assert len(texts) == len(addresses)
+                assert redirect_server.address_text() == ', '.join(texts)
+                connects = []
+                for sock in redirect_server.listen_sockets():
+                    name = sock.getsockname()
+                    if sock.family == socket.AF_INET:
+                        connects.append((socket.AF_INET, name[:2]))
+                    elif sock.family == socket.AF_INET6:
+                        # dual-stack, IPv4 and IPv6 clients
+                        connects.append((socket.AF_INET6, ('::1', name[1])))
+                        connects.append((socket.AF_INET, (IP, name[1])))
+                    else:
+                        connects.append((sock.family, name))
+                for family, address in connects:
+                    with socket.socket(family, socket.SOCK_STREAM) as sock:
+                        sock.settimeout(3)
+                        sock.connect(address)
+                        sock.sendall(b'GET /listen HTTP/1.0\r\n\r\n')
+                        resp = sock.recv(65536)
+                    assert resp.split(b' ', 2)[1] == b'308'
+                while redirect_server.in_flight:
+                    time.sleep(0.01)
+                assert ghrs.redirect_counter[key] - count == len(connects)
+                # the IPv4 client of the dual-stack socket is logged as IPv4
+                assert '::ffff:' not in caplog.text
+            finally:
+                redirect_server.shutdown()
+                st.join(2)
+        for address in addresses:
+            if address.startswith('unix:'):
+                assert not os.path.exists(address[5:])
+
+    @pytest.mark.skipif(not socket.has_ipv6, reason='no IPv6')
+    @pytest.mark.parametrize('ipv4', ('0.0.0.0', '127.0.0.1'))
+    @pytest.mark.timeout(5)
+    def test_listen_ipv4_ipv6_same_port(self, ipv4):
+        """an IPv4 address and "[::]" on one port, "[::]" is IPv6 only"""
+        with socket.socket(socket.AF_INET6, socket.SOCK_STREAM) as sock:
+            sock.bind(('::', 0))
+            port = sock.getsockname()[1]
+        addresses = ['%s:%d' % (ipv4, port), '[::]:%d' % port]
+        redirect_server = RedirectServer.listen(
+            addresses, new_redirect_handler({'/listen': Re_Entry('/listen', 'http://A')}))
+        with redirect_server:
+            sockets = redirect_server.listen_sockets()
+            assert [sock.family for sock in sockets] == \
+                [socket.AF_INET, socket.AF_INET6]
+            assert sockets[1].getsockopt(socket.IPPROTO_IPV6,
+                                         socket.IPV6_V6ONLY) == 1
+            st = threading.Thread(target=redirect_server.serve_forever)
+            st.start()
+            try:
+                for family, address in ((socket.AF_INET, ('127.0.0.1', port)),
+                                        (socket.AF_INET6, ('::1', port))):
+                    with socket.socket(family, socket.SOCK_STREAM) as sock:
+                        sock.settimeout(3)
+                        sock.connect(address)
+                        sock.sendall(b'GET /listen HTTP/1.0\r\n\r\n')
+                        resp = sock.recv(65536)
+                    assert resp.split(b' ', 2)[1] == b'308'
+            finally:
+                redirect_server.shutdown()
+                st.join(2)
+
+
+class Test_SocketOptions(object):
+    """listening socket options, --backlog --tcp-nodelay etc."""
+
+    @pytest.mark.skipif(not sys.platform.startswith('linux'), reason='Linux only')
+    def test_apply_read(self):
+        ghrs = goto_http_redirect_server.goto_http_redirect_server
+        options = ghrs.Socket_Options(backlog=7, nodelay=True, defer_accept=5,
+                                      fastopen=3, reuseport=True)
+        with socket.socket() as sock:
+            ghrs.socket_options_apply(sock, options)
+            sock.bind((IP, 0))
+            sock.listen(options.backlog)
+            values = ghrs.socket_options_read(sock)
+        assert values['nodelay'] == 1
+        # the system rounds to a count of SYN-ACK retransmits
+        assert values['defer_accept'] >= 5
+        assert values['fastopen'] == 3
+        assert values['reuseport'] == 1
+
+    @pytest.mark.skipif(not sys.platform.startswith('linux'), reason='Linux only')
+    def test_apply_off(self):
+        ghrs = goto_http_redirect_server.goto_http_redirect_server
+        options = ghrs.Socket_Options(backlog=7, nodelay=False, defer_accept=0,
+                                      fastopen=0, reuseport=False)
+        with socket.socket() as sock:
+            ghrs.socket_options_apply(sock, options)
+            values = ghrs.socket_options_read(sock)
+        assert set(values.values()) == {0}
+
+    @pytest.mark.timeout(5)
+    def test_server(self, monkeypatch):
+        ghrs = goto_http_redirect_server.goto_http_redirect_server
+        options = ghrs.SOCKET_OPTIONS_DEFAULT._replace(backlog=7, reuseport=True)
+        monkeypatch.setattr(RedirectServer, 'socket_options', options)
+        with live_server({'/a': Re_Entry('/a', 'http://A')}) as (server_, port_):
+            # the backlog is set before listen
+            assert server_.request_queue_size == 7
+            rr, body = request(port_, '/status/status.json')
+            assert rr.code == http.HTTPStatus.OK
+            effective = json.loads(body.decode('utf-8'))['socket_options']
+            assert list(effective) == ['%s:%d' % (IP, port_)]
+            values = effective['%s:%d' % (IP, port_)]
+            assert values['backlog'] == 7
+            if hasattr(socket, 'SO_REUSEPORT'):
+                assert values['reuseport'] == 1
+            rr, body = request(port_, '/status')
+            assert b'Listen socket options' in body
+
+    @pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='Unix only')
+    def test_read_unix(self, tmp_path):
+        ghrs = goto_http_redirect_server.goto_http_redirect_server
+        with ghrs.listen_socket('unix:' + str(tmp_path / 'goto.sock')) as sock:
+            assert ghrs.socket_options_read(sock) == {}
+
+
+@pytest.mark.skipif(not shutil.which('openssl'), reason='needs openssl')
+class Test_TLS(object):
+    """--tls-cert --tls-key"""
+
+    @staticmethod
+    def self_signed(tmp_path, name: str) -> typing.Tuple[str, str]:
+        """self-signed certificate and key files for CN `name`"""
+        cert = str(tmp_path / ('%s.crt' % name))
+        key = str(tmp_path / ('%s.key' % name))
+        subprocess.run(
+            ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes',
+             '-keyout', key, '-out', cert, '-days', '1', '-subj', '/CN=' + name],
+            check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return cert, key
+
+    @staticmethod
+    @contextlib.contextmanager
+    def tls_server(cert: str, key: str):
+        with live_server({'/a': Re_Entry('/a', 'http://A')}) as (server_, port_):
+            server_.tls_cert = cert
+            server_.tls_key = key
+            server_.tls_load()
+            yield server_, port_
+
+    @staticmethod
+    def client_context() -> ssl.SSLContext:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        return context
+
+    @staticmethod
+    def tls_request(port_: int, context: ssl.SSLContext, session=None):
+        """
+        redirect request over TLS, return response, session reused,
+        session, server certificate
+        """
+        with socket.create_connection((IP, port_), timeout=3) as sock:
+            with context.wrap_socket(sock, session=session) as tls:
+                reused = tls.session_reused
+                peercert = tls.getpeercert(binary_form=True)
+                tls.sendall(b'GET /a HTTP/1.1\r\nHost: a\r\n\r\n')
+                resp = b''
+                chunk = tls.recv(65536)
+                while chunk:
+                    resp += chunk
+                    chunk = tls.recv(65536)
+                # a TLS 1.3 session ticket arrives after the handshake
+                return resp, reused, tls.session, peercert
+
+    @pytest.mark.timeout(10)
+    def test_resumption(self, tmp_path):
+        ghrs = goto_http_redirect_server.goto_http_redirect_server
+        cert, key = self.self_signed(tmp_path, 'goto')
+        with self.tls_server(cert, key) as (server_, port_):
+            handshakes = ghrs.server_counter[ghrs.TLS_HANDSHAKE]
+            resumed = ghrs.server_counter[ghrs.TLS_RESUMED]
+            context = self.client_context()
+            session = None
+            reused = []
+            for _ in range(3):
+                resp, reused_, session, _ = self.tls_request(port_, context,
+                                                             session)
+                assert resp.split(b' ', 2)[1] == b'308'
+                reused.append(reused_)
+            # the first handshake is full, repeats resume
+            assert reused == [False, True, True]
+            assert ghrs.server_counter[ghrs.TLS_HANDSHAKE] - handshakes == 3
+            assert ghrs.server_counter[ghrs.TLS_RESUMED] - resumed == 2
+            stats = server_.tls_stats()
+            assert stats['certificate'] == cert
+            assert 0 < stats['resumption_rate'] < 1
+            assert 'TLS certificate' in server_.tls_text()
+
+    @pytest.mark.timeout(10)
+    def test_plain_client(self, tmp_path):
+        """a plain HTTP client fails the handshake and gets nothing"""
+        ghrs = goto_http_redirect_server.goto_http_redirect_server
+        cert, key = self.self_signed(tmp_path, 'goto')
+        with self.tls_server(cert, key) as (server_, port_):
+            failed = ghrs.server_counter[ghrs.TLS_FAILED]
+            assert raw_request(port_, b'GET /a HTTP/1.1\r\nHost: a\r\n\r\n') == b''
+            while server_.in_flight:
+                time.sleep(0.01)
+            assert ghrs.server_counter[ghrs.TLS_FAILED] - failed == 1
+
+    @pytest.mark.timeout(10)
+    def test_reload(self, monkeypatch, tmp_path):
+        """reload loads the certificate again, a bad file keeps the current"""
+        cert, key = self.self_signed(tmp_path, 'before')
+        with self.tls_server(cert, key) as (server_, port_):
+            # the redirects are not reloaded
+            monkeypatch.setattr(server_, '_reload', lambda: None)
+            context = server_.tls_context
+            with open(cert, 'w') as file_:
+                file_.write('not a certificate')
+            server_.reload()
+            assert server_.tls_context is context
+            cert_after, key_after = self.self_signed(tmp_path, 'after')
+            shutil.copy(cert_after, cert)
+            shutil.copy(key_after, key)
+            server_.reload()
+            assert server_.tls_context is not context
+            resp, _, _, peercert = self.tls_request(port_,
+                                                    self.client_context())
+            assert resp.split(b' ', 2)[1] == b'308'
+            with open(cert_after) as file_:
+                assert peercert == ssl.PEM_cert_to_DER_cert(file_.read())
+
+
+class Test_WSGI(object):
+    """RedirectApplication"""
+
+    @staticmethod
+    def call(app: RedirectApplication, path: str, query: str = '',
+             method: str = 'GET') \
+            -> typing.Tuple[str, typing.Dict[str, str], bytes]:
+        """call `app` checked by wsgiref.validate, return status, headers, body"""
+        environ = {}  # type: typing.Dict[str, typing.Any]
+        wsgiref.util.setup_testing_defaults(environ)
+        environ['PATH_INFO'] = path
+        environ['QUERY_STRING'] = query
+        environ['REQUEST_METHOD'] = method
+        response = {}  # type: typing.Dict[str, typing.Any]
+
+        def start_response(status, headers, exc_info=None):
+            response['status'] = status
+            response['headers'] = dict(headers)
+
+        result = wsgiref.validate.validator(app)(environ, start_response)
+        try:
+            body = b''.join(result)
+        finally:
+            result.close()
+        return response['status'], response['headers'], body
+
+    @staticmethod
+    def app(*args: str) -> RedirectApplication:
+        return RedirectApplication.from_args(
+            ['--from-to', '/b', 'http://bug/search?id=${query}',
+             '--from-to', '/x', 'http://X'] + list(args))
+
+    def test_redirect(self):
+        app = self.app()
+        key = '(/b) → (http://bug/search?id=123)'
+        count = goto_http_redirect_server.goto_http_redirect_server.redirect_counter[key]
+        status, headers, body = self.call(app, '/b', '123')
+        assert status == '308 Permanent Redirect'
+        assert headers['Location'] == 'http://bug/search?id=123'
+        assert headers['Redirect-Created-By']
+        assert body == b''
+        assert goto_http_redirect_server.goto_http_redirect_server.redirect_counter[key] - count == 1
+
+    def test_redirect_code(self):
+        status, headers, body = self.call(self.app('--redirect-code', '302'), '/x', method='HEAD')
+        assert status == '302 Found'
+        assert headers['Location'] == 'http://X'
+
+    def test_not_found(self):
+        status, headers, body = self.call(self.app('--not-found-max-age', '60'), '/nope')
+        assert status == '404 Not Found'
+        assert headers['Cache-Control'] == 'max-age=60'
+        assert body == b'404 Not Found\n'
+        status, _, body = self.call(self.app(), '/nope', method='HEAD')
+        assert status == '404 Not Found'
+        assert body == b''
+
+    def test_not_implemented(self):
+        status, headers, _ = self.call(self.app(), '/b', method='POST')
+        assert status == '501 Not Implemented'
+        assert headers['Allow'] == 'GET, HEAD'
+
+    @pytest.mark.parametrize('path', ('/status', '/status/status.json'))
+    def test_status(self, path: str):
+        status, headers, body = self.call(self.app(), path)
+        assert status == '200 OK'
+        assert headers['Content-Type'].startswith('application/json')
+        doc = json.loads(body.decode('utf-8'))
+        assert doc['entries'] == 2
+        assert doc['generation'] == 1
+
+    def test_health(self):
+        app = self.app('--health-path', '/health', '--ready-path', '/ready')
+        for path in ('/health', '/ready'):
+            status, _, body = self.call(app, path)
+            assert status == '200 OK'
+
+    @pytest.mark.timeout(5)
+    def test_reload(self, tmp_path):
+        file_ = tmp_path / 'redirects.csv'
+        file_.write_text('/a\thttp://A1\tuser\t2019-01-01 00:00:00\n')
+        app = RedirectApplication.from_args(
+            ['--redirects', str(file_), '--reload-path', '/reload'])
+        assert self.call(app, '/a')[1]['Location'] == 'http://A1'
+        file_.write_text('/a\thttp://A2\tuser\t2019-01-01 00:00:00\n')
+        status, headers, body = self.call(app, '/reload')
+        assert status == '202 Accepted'
+        assert headers['Redirect-Server-Reload-Generation'] == '2'
+        while app.generation < 2:
+            time.sleep(0.01)
+        assert self.call(app, '/a')[1]['Location'] == 'http://A2'
+
+    def test_reload_off(self):
+        assert self.call(self.app(), '/reload')[0] == '404 Not Found'
+
+    def test_from_args_no_redirects(self):
+        with pytest.raises(SystemExit):
+            RedirectApplication.from_args(['--status-path', '/s'])
+
+    @pytest.mark.parametrize(
+        'path_info, expect',
+        (
+            ('/b', '/b'),
+            ('/b;p=1', '/b;p=1'),
+            ('/caf\xc3\xa9', '/caf%C3%A9'),
+            ('/a b', '/a%20b'),
+            ('', '/'),
+        )
+    )
+    def test_request_path(self, path_info: str, expect: str):
+        assert RedirectApplication.request_path({'PATH_INFO': path_info}) == expect
+
+    @pytest.mark.timeout(5)
+    def test_wsgiref_server(self):
+        with wsgiref.simple_server.make_server(IP, 0, self.app()) as httpd:
+            st = threading.Thread(target=httpd.serve_forever, kwargs={'poll_interval': 0.1})
+            st.start()
+            try:
+                rr, _ = request(httpd.server_port, '/b?7')
+                assert rr.code == REDIRECT_CODE_DEFAULT
+                assert rr.headers['Location'] == 'http://bug/search?id=7'
+            finally:
+                httpd.shutdown()
+                st.join(2)
@@ -29,9 +29,9 @@ authbind=
 if ${GOTO_AUTHBIND_ENABLE-false} &>/dev/null; then
     authbind='authbind --deep'
 fi
-sudoas=
+sudoas_user=
 if ${GOTO_SUDOAS_ENABLE-false} &>/dev/null; then
-    sudoas="sudo -u ${GOTO_SUDOAS_USER} --"
+    sudoas_user=${GOTO_SUDOAS_USER}
 fi
 nice=
 if ${GOTO_NICE_ENABLE-false} &>/dev/null; then
@@ -46,7 +46,7 @@ while getopts "au:n:p:dh?" opt "${argv[@]:-}"; do
             shift;
             ;;
         u)
-            sudoas="sudo -u ${OPTARG} --"
+            sudoas_user=${OPTARG}
             shift;
             shift;
             ;;
@@ -87,6 +87,19 @@ else
 fi
 GOTO_FILE_SCRIPT=${GOTO_FILE_SCRIPT:-/usr/local/bin/goto_http_redirect_server}
 
+sudoas=
+if [ -n "${sudoas_user}" ]; then
+    # sudo env_reset drops the systemd notification, watchdog and socket
+    # activation variables, keep them (requires sudo 1.8.21)
+    sudoas="sudo --preserve-env=NOTIFY_SOCKET,WATCHDOG_USEC,LISTEN_FDS,LISTEN_PID,LISTEN_FDNAMES -u ${sudoas_user}"
+    # sudo closes the socket activation file descriptors, keep them
+    # (requires "Defaults closefrom_override" in sudoers)
+    if [ -n "${LISTEN_FDS-}" ]; then
+        sudoas+=" --close-from=$((3 + LISTEN_FDS))"
+    fi
+    sudoas+=" --"
+fi
+
 set -x
 exec \
     ${nice} \
@@ -15,6 +15,8 @@ GOTO_SYSTEMD_SH=/usr/local/bin/goto_http_redirect_server.sh
 GOTO_CONFIG=/etc/goto_http_redirect_server.conf
 GOTO_SERVICE=goto_http_redirect_server.service
 GOTO_FILE_SERVICE=/etc/systemd/user/${GOTO_SERVICE}
+GOTO_SOCKET=goto_http_redirect_server.socket
+GOTO_FILE_SOCKET=/etc/systemd/user/${GOTO_SOCKET}
 
 reload=false
 wipe=false
@@ -69,12 +71,15 @@ set +e            # no `set -e`; attempt to remove as much as possible
 declare -i ret=0  # but signal remove failures in script return code
 
 rm -v -- "${GOTO_SYSTEMD_SH}" "${GOTO_FILE_SERVICE}" || ret=1
+rm -fv -- "${GOTO_FILE_SOCKET}" || ret=1
 
 if ${reload}; then
     (
         set -x
         systemctl stop "${GOTO_SERVICE}"
         systemctl disable "${GOTO_SERVICE}"
+        systemctl stop "${GOTO_SOCKET}" || true
+        systemctl disable "${GOTO_SOCKET}" || true
     )
     rm -v -- "${GOTO_SYSTEMD_SH}" "${GOTO_FILE_SERVICE}" || ret=1
     (
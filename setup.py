@@ -42,6 +42,7 @@ GOTO_SERVICE_FILES = [
     os.path.join(_HERED, 'service', file_) for file_ in (
         'goto_http_redirect_server.conf',
         'goto_http_redirect_server.service',
+        'goto_http_redirect_server.socket',
         'goto_http_redirect_server.sh',
         'service-install.sh',
         'service-uninstall.sh',
@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8 -*-
+#
+# run from the project root, e.g.
+#
+#     python tools/benchmark.py load --rows 2000000 --workers 0 1 2 4 8
+
+"""
+Benchmark scenarios for goto_http_redirect_server.
+
+Each scenario prints one line of results per measured variant.
+"""
+
+import argparse
+import contextlib
+from http import client
+import logging
+import os
+import pathlib
+import selectors
+import socket
+import sys
+import tempfile
+import threading
+import time
+import typing
+
+sys.path.insert(0, str(pathlib.Path(__file__).absolute().parent.parent))
+
+from goto_http_redirect_server import goto_http_redirect_server as ghrs  # NOQA
+
+
+def write_redirects_file(path: pathlib.Path, rows: int) -> None:
+    """write a redirects file with `rows` unique entries"""
+    with open(str(path), 'w', encoding='utf-8') as file_:
+        for i in range(rows):
+            file_.write(
+                '/r%d\thttp://host%d.megacorp.local/path/%d?id=${query}'
+                '\tuser%d\t2019-09-07 12:00:00\n'
+                % (i, i % 97, i, i % 13)
+            )
+
+
+def scenario_load(args: argparse.Namespace) -> None:
+    """time RedirectsLoader.load_redirects_files per --load-workers value"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = pathlib.Path(tmpdir, 'redirects.csv')
+        write_redirects_file(path, args.rows)
+        print('file %s rows %d bytes %d' % (path, args.rows,
+                                              path.stat().st_size))
+        for workers in args.workers:
+            elapsed = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                entrys = ghrs.RedirectsLoader.load_redirects_files(
+                    [path], ghrs.FIELD_DELIMITER_DEFAULT, workers
+                )
+                elapsed.append(time.perf_counter() - start)
+                assert len(entrys) == args.rows
+            best = min(elapsed)
+            print('load-workers %2d: best %7.3fs  %10.0f rows/s'
+                  % (workers, best, args.rows / best))
+
+
+def scenario_tsv(args: argparse.Namespace) -> None:
+    """compare rows per second of the csv.reader and streaming TSV loaders"""
+    loaders = (
+        ('csv.reader', lambda path_: ghrs.RedirectsLoader.
+            load_redirects_file_csv(path_, ghrs.FIELD_DELIMITER_DEFAULT)),
+        ('streaming TSV', ghrs.RedirectsLoader.load_redirects_file_tsv),
+    )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = pathlib.Path(tmpdir, 'redirects.csv')
+        write_redirects_file(path, args.rows)
+        print('file %s rows %d bytes %d' % (path, args.rows,
+                                              path.stat().st_size))
+        for name, loader in loaders:
+            elapsed = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                entrys = loader(path)
+                elapsed.append(time.perf_counter() - start)
+                assert len(entrys) == args.rows
+            best = min(elapsed)
+            print('%-14s: best %7.3fs  %10.0f rows/s'
+                  % (name, best, args.rows / best))
+
+
+@contextlib.contextmanager
+def live_server(redirects: ghrs.Re_Entry_Dict):
+    """
+    RedirectServer serving on an unused localhost port, yields the port.
+    The server gets the listening socket options of
+    ghrs.RedirectServer.socket_options.
+    """
+    handler = ghrs.redirect_handler_factory(redirects,
+                                            ghrs.REDIRECT_CODE_DEFAULT,
+                                            '/status', '/reload',
+                                            ghrs.htmls(''))
+    with ghrs.RedirectServer(('127.0.0.1', 0), handler) as redirect_server:
+        ghrs.reload_control.wakeup = redirect_server.wakeup
+        thread = threading.Thread(target=redirect_server.serve_forever,
+                                  kwargs={'poll_interval': 0.1})
+        thread.start()
+        try:
+            yield redirect_server.server_address[1]
+        finally:
+            redirect_server.shutdown()
+            thread.join()
+
+
+def redirects_per_second(port: int, clients: int, seconds: float) -> float:
+    """redirect requests per second made by `clients` threads"""
+    counts = [0] * clients
+    stop = time.monotonic() + seconds
+
+    def client_thread(index: int) -> None:
+        while time.monotonic() < stop:
+            cl = client.HTTPConnection('127.0.0.1', port, timeout=5)
+            try:
+                cl.request('GET', '/a')
+                cl.getresponse().read()
+                counts[index] += 1
+            except OSError:
+                pass
+            finally:
+                cl.close()
+
+    threads = [threading.Thread(target=client_thread, args=(i,))
+               for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts) / seconds
+
+
+def redirect_latencies(port: int, clients: int, seconds: float) \
+        -> typing.List[float]:
+    """seconds taken by each redirect request made by `clients` threads"""
+    latencies = []  # type: typing.List[float]
+    stop = time.monotonic() + seconds
+
+    def client_thread() -> None:
+        while time.monotonic() < stop:
+            cl = client.HTTPConnection('127.0.0.1', port, timeout=30)
+            try:
+                start = time.perf_counter()
+                cl.request('GET', '/a')
+                cl.getresponse().read()
+                latencies.append(time.perf_counter() - start)
+            except OSError:
+                pass
+            finally:
+                cl.close()
+
+    threads = [threading.Thread(target=client_thread) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def scenario_reload(args: argparse.Namespace) -> None:
+    """redirect latency during back to back reloads, with and without
+    --reload-subprocess"""
+    redirects = {'/a': ghrs.Re_Entry('/a', 'http://A')}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = pathlib.Path(tmpdir, 'redirects.csv')
+        write_redirects_file(path, args.rows)
+        ghrs.Redirect_Files_List = [path]
+        ghrs.Redirect_FromTo_List = [('/a', 'http://A')]
+        ghrs.STATUS_PATH = '/status'
+        ghrs.reload_control.interval = 0
+        for name, reload_, subprocess_ in (('no reload', False, False),
+                                           ('reload', True, False),
+                                           ('reload-subprocess', True, True)):
+            ghrs.RedirectServer.reload_subprocess = subprocess_
+            stop = threading.Event()
+
+            def reloader() -> None:
+                """request a reload whenever none is pending"""
+                while not stop.wait(0.01):
+                    if ghrs.reload_control.pending is None:
+                        ghrs.reload_control.request()
+
+            with live_server(redirects) as port:
+                generation = ghrs.RedirectHandler.generation
+                thread = threading.Thread(target=reloader)
+                if reload_:
+                    thread.start()
+                latencies = sorted(redirect_latencies(port, args.clients,
+                                                      args.seconds))
+                stop.set()
+                if reload_:
+                    thread.join()
+                reloads = ghrs.RedirectHandler.generation - generation
+            print('%-17s: reloads %3d requests %6d  p50 %7.2fms  p99 %7.2fms'
+                  '  max %7.2fms'
+                  % (name, reloads, len(latencies),
+                     latencies[len(latencies) // 2] * 1000,
+                     latencies[int(len(latencies) * 0.99)] * 1000,
+                     latencies[-1] * 1000))
+
+
+def raw_requests(connect: typing.Callable[[], socket.socket], clients: int,
+                 seconds: float) -> typing.List[float]:
+    """
+    seconds taken by each redirect request made by `clients` threads over
+    sockets from `connect`
+    """
+    latencies = []  # type: typing.List[float]
+    stop = time.monotonic() + seconds
+    request = b'GET /a HTTP/1.1\r\nHost: a\r\n\r\n'
+
+    def client_thread() -> None:
+        while time.monotonic() < stop:
+            start = time.perf_counter()
+            try:
+                with connect() as sock:
+                    sock.sendall(request)
+                    while sock.recv(65536):
+                        pass
+            except OSError:
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client_thread) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def scenario_unix(args: argparse.Namespace) -> None:
+    """redirects per second over loopback TCP and a Unix domain socket"""
+    redirects = {'/a': ghrs.Re_Entry('/a', 'http://A')}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'goto.sock')
+        handler = ghrs.redirect_handler_factory(redirects,
+                                                ghrs.REDIRECT_CODE_DEFAULT,
+                                                '/status', '/reload',
+                                                ghrs.htmls(''))
+        with live_server(redirects) as port, \
+                ghrs.RedirectServer.unix(path, handler) as unix_server:
+            thread = threading.Thread(target=unix_server.serve_forever)
+            thread.start()
+            try:
+                for name, connect in (
+                    ('loopback TCP', lambda: socket.create_connection(
+                        ('127.0.0.1', port))),
+                    ('Unix socket', lambda: _unix_connect(path)),
+                ):
+                    latencies = sorted(raw_requests(connect, args.clients,
+                                                    args.seconds))
+                    print('%-12s: %8.0f redirects/s  p50 %6.2fms  p99 %6.2fms'
+                          % (name, len(latencies) / args.seconds,
+                             latencies[len(latencies) // 2] * 1000,
+                             latencies[int(len(latencies) * 0.99)] * 1000))
+            finally:
+                unix_server.shutdown()
+                thread.join()
+
+
+def _unix_connect(path: str) -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def burst(port: int, connections: int, timeout: float) \
+        -> typing.Tuple[typing.List[float], typing.List[float], int]:
+    """
+    open `connections` connections at once, then request a redirect over
+    each.
+
+    :return: seconds to connect, seconds to the end of each response,
+             count of connections that failed or timed out
+    """
+    request = b'GET /a HTTP/1.1\r\nHost: a\r\n\r\n'
+    connect_latencies = []  # type: typing.List[float]
+    latencies = []  # type: typing.List[float]
+    failed = 0
+    with selectors.DefaultSelector() as selector:
+        start = time.perf_counter()
+        for _ in range(connections):
+            sock = socket.socket()
+            sock.setblocking(False)
+            sock.connect_ex(('127.0.0.1', port))
+            selector.register(sock, selectors.EVENT_WRITE)
+        deadline = time.monotonic() + timeout
+        while selector.get_map() and time.monotonic() < deadline:
+            for key, events in selector.select(0.1):
+                sock = key.fileobj
+                if events & selectors.EVENT_WRITE:
+                    if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR):
+                        failed += 1
+                        selector.unregister(sock)
+                        sock.close()
+                        continue
+                    connect_latencies.append(time.perf_counter() - start)
+                    sock.send(request)
+                    selector.modify(sock, selectors.EVENT_READ)
+                    continue
+                try:
+                    data = sock.recv(65536)
+                except OSError:
+                    data = None
+                if data:
+                    continue
+                if data is None:
+                    failed += 1
+                else:
+                    latencies.append(time.perf_counter() - start)
+                selector.unregister(sock)
+                sock.close()
+        for key in list(selector.get_map().values()):
+            failed += 1
+            key.fileobj.close()
+    return connect_latencies, latencies, failed
+
+
+def scenario_burst(args: argparse.Namespace) -> None:
+    """
+    connect latency, response latency and drops during bursts of
+    connections, with the previous listening socket options and with the
+    defaults. A connection that waits a second or more was dropped by the
+    system and retried by the client.
+    """
+    redirects = {'/a': ghrs.Re_Entry('/a', 'http://A')}
+    # before --backlog, listen was called with the socketserver default
+    previous = ghrs.Socket_Options(backlog=5, nodelay=False, defer_accept=0,
+                                   fastopen=0, reuseport=False)
+    variants = (
+        ('previous', previous),
+        ('backlog', previous._replace(backlog=ghrs.SOCKET_LISTEN_BACKLOG)),
+        ('defaults', ghrs.SOCKET_OPTIONS_DEFAULT),
+    )
+    for name, options in variants:
+        ghrs.RedirectServer.socket_options = options
+        connects = []  # type: typing.List[float]
+        latencies = []  # type: typing.List[float]
+        failed = 0
+        with live_server(redirects) as port:
+            for _ in range(args.rounds):
+                connects_, latencies_, failed_ = burst(
+                    port, args.connections, args.timeout)
+                connects += connects_
+                latencies += latencies_
+                failed += failed_
+                time.sleep(0.5)  # let the server finish the burst
+        connects.sort()
+        latencies.sort()
+        retried = sum(1 for latency in latencies if latency >= 1.0)
+        print('%-8s backlog %4d: connect p50 %7.2fms p99 %7.2fms max %7.2fms'
+              '  response p50 %7.2fms p99 %7.2fms  retried %4d  failed %4d'
+              % (name, options.backlog,
+                 connects[len(connects) // 2] * 1000,
+                 connects[int(len(connects) * 0.99)] * 1000,
+                 connects[-1] * 1000,
+                 latencies[len(latencies) // 2] * 1000,
+                 latencies[int(len(latencies) * 0.99)] * 1000,
+                 retried, failed))
+
+
+def scenario_wsgi(args: argparse.Namespace) -> None:
+    """
+    redirects per second of RedirectApplication called in-process, no
+    network nor HTTP parsing
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = pathlib.Path(tmpdir, 'redirects.csv')
+        write_redirects_file(path, args.rows)
+        app = ghrs.RedirectApplication.from_args(['--redirects', str(path)])
+    environs = [
+        {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/r%d' % (i * 7919 % args.rows),
+         'QUERY_STRING': str(i)}
+        for i in range(1000)
+    ]
+
+    def start_response(status, headers, exc_info=None):
+        pass
+
+    count = 0
+    start = time.perf_counter()
+    stop = start + args.seconds
+    while time.perf_counter() < stop:
+        for environ in environs:
+            app(environ, start_response)
+        count += len(environs)
+    elapsed = time.perf_counter() - start
+    print('rows %d: %10.0f redirects/s  %6.2fus per redirect'
+          % (args.rows, count / elapsed, elapsed / count * 1000000))
+
+
+def scenario_slowloris(args: argparse.Namespace) -> None:
+    """redirect throughput with and without clients that send slowly"""
+    ghrs.RedirectHandler.head_timeout = args.head_timeout
+    redirects = {'/a': ghrs.Re_Entry('/a', 'http://A')}
+    with live_server(redirects) as port:
+        for slow_count in (0, args.slow):
+            stop = threading.Event()
+
+            def slow_client() -> None:
+                """send one header byte per second, reconnect when closed"""
+                while not stop.is_set():
+                    try:
+                        with socket.create_connection(('127.0.0.1', port)) \
+                                as sock:
+                            sock.sendall(b'GET /a HTTP/1.1\r\n')
+                            while not stop.wait(1):
+                                sock.sendall(b'X')
+                    except OSError:
+                        pass
+
+            slow = [threading.Thread(target=slow_client, daemon=True)
+                    for _ in range(slow_count)]
+            for thread in slow:
+                thread.start()
+            time.sleep(1)  # let the slow clients connect
+            rate = redirects_per_second(port, args.clients, args.seconds)
+            stop.set()
+            print('slow clients %4d: %8.0f redirects/s' % (slow_count, rate))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--debug', action='store_true', default=False,
+                        help='log at DEBUG level (slows everything)')
+    subparsers = parser.add_subparsers(dest='scenario')
+
+    sp = subparsers.add_parser('load', help=scenario_load.__doc__)
+    sp.add_argument('--rows', type=int, default=1000000)
+    sp.add_argument('--workers', type=int, nargs='+',
+                    default=[0, 1, 2, 4, os.cpu_count() or 1])
+    sp.add_argument('--repeat', type=int, default=3)
+    sp.set_defaults(func=scenario_load)
+
+    sp = subparsers.add_parser('tsv', help=scenario_tsv.__doc__)
+    sp.add_argument('--rows', type=int, default=500000)
+    sp.add_argument('--repeat', type=int, default=3)
+    sp.set_defaults(func=scenario_tsv)
+
+    sp = subparsers.add_parser('reload', help=scenario_reload.__doc__)
+    sp.add_argument('--rows', type=int, default=200000)
+    sp.add_argument('--clients', type=int, default=4)
+    sp.add_argument('--seconds', type=float, default=10)
+    sp.set_defaults(func=scenario_reload)
+
+    sp = subparsers.add_parser('unix', help=scenario_unix.__doc__)
+    sp.add_argument('--clients', type=int, default=4)
+    sp.add_argument('--seconds', type=float, default=10)
+    sp.set_defaults(func=scenario_unix)
+
+    sp = subparsers.add_parser('burst', help=scenario_burst.__doc__)
+    sp.add_argument('--connections', type=int, default=500,
+                    help='connections opened at once per burst')
+    sp.add_argument('--rounds', type=int, default=5)
+    sp.add_argument('--timeout', type=float, default=10,
+                    help='seconds a burst may take, later connections fail')
+    sp.set_defaults(func=scenario_burst)
+
+    sp = subparsers.add_parser('wsgi', help=scenario_wsgi.__doc__)
+    sp.add_argument('--rows', type=int, default=100000)
+    sp.add_argument('--seconds', type=float, default=5)
+    sp.set_defaults(func=scenario_wsgi)
+
+    sp = subparsers.add_parser('slowloris', help=scenario_slowloris.__doc__)
+    sp.add_argument('--slow', type=int, default=200,
+                    help='count of slow clients')
+    sp.add_argument('--clients', type=int, default=4,
+                    help='count of normal clients')
+    sp.add_argument('--seconds', type=float, default=5)
+    sp.add_argument('--head-timeout', type=float,
+                    default=ghrs.HEAD_TIMEOUT_DEFAULT)
+    sp.set_defaults(func=scenario_slowloris)
+
+    args = parser.parse_args()
+    if not getattr(args, 'func', None):
+        parser.print_help()
+        sys.exit(1)
+    ghrs.logging_init(args.debug, None)
+    if not args.debug:
+        ghrs.log.setLevel(logging.WARNING)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()